@@ -7,11 +7,93 @@ The toolbox for works related to ARC project management
 
 import logging
 import os
+import shlex
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
-from arc.exceptions import ServerError
-from arc.job.ssh import SSHClient
+from easy_rmg_model.common import read_yaml_file, regularize_path
 
-from easy_rmg_model.common import read_yaml_file
+
+class LocalCommandClient(object):
+    """
+    A local stand-in of ARC's ``SSHClient``, which provides the same ``_send_command_to_server``,
+    ``list_dir`` and ``remove_dir`` methods under a local root directory instead of the remote
+    home directory. It can be used to test or dry-run the remote operations against a
+    local copy of the files.
+
+    Args:
+        root (str): The local directory regarded as the remote home directory.
+    """
+
+    def __init__(self, root: str = '~'):
+        self.root = regularize_path(root)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def _send_command_to_server(self, command: str, remote_path: str = '') -> tuple:
+        """
+        Run a command in the directory, as ``SSHClient._send_command_to_server``.
+
+        Returns:
+            tuple: The lines of the stdout and the stderr.
+        """
+        cwd = os.path.join(self.root, remote_path)
+        if not os.path.isdir(cwd):
+            return [], [f'cd: {remote_path}: No such file or directory']
+        result = subprocess.run(command,
+                                shell=True,
+                                cwd=cwd,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                universal_newlines=True)
+        return result.stdout.splitlines(), result.stderr.splitlines()
+
+    def list_dir(self, remote_path: str = '') -> list:
+        """
+        List the directory contents by ``ls -alF``, as ``SSHClient.list_dir``.
+        """
+        return self._send_command_to_server('ls -alF', remote_path)[0]
+
+    def remove_dir(self, remote_path: str):
+        """
+        Remove the directory, as ``SSHClient.remove_dir``.
+        """
+        _, stderr = self._send_command_to_server(f'rm -r "{remote_path}"')
+        if stderr:
+            raise ValueError(f'Cannot remove dir for the given path ({remote_path}).\n'
+                             f'Got: {stderr}')
+
+
+def get_remote_calc_paths(local_project_path: str,
+                          only_converged: bool = True,
+                          ) -> dict:
+    """
+    Get the remote directories of the species calculations of an ARC project.
+
+    Args:
+        local_project_path (str): The path to the local project
+        only_converged (bool): Get all species or only converged species.
+                               ``True`` for only converged ones.
+
+    Returns:
+        dict: Keys are species labels, values are the remote paths relative to the home directory.
+    """
+    restart_file_path = os.path.join(local_project_path, 'restart.yml')
+    restart_dict = read_yaml_file(restart_file_path)
+    project_name = restart_dict['project']
+
+    remote_paths = {}
+    for label, output_info in restart_dict['output'].items():
+        if not only_converged or output_info['convergence']:
+            remote_label = label.replace('(', '_').replace(')', '_')
+            remote_paths[label] = os.path.join(
+                'runs', 'ARC_Projects', project_name, remote_label)
+    return remote_paths
 
 
 def remove_remote_calc_files(server_name: str,
@@ -26,20 +108,13 @@ def remove_remote_calc_files(server_name: str,
         only_converged (bool): Remove all calculation files or only converged
                                calculation files. ``True`` for only converged ones.
     """
-    restart_file_path = os.path.join(local_project_path, 'restart.yml')
-    restart_dict = read_yaml_file(restart_file_path)
-    project_name = restart_dict['project']
+    from arc.exceptions import ServerError
+    from arc.job.ssh import SSHClient
 
-    species_to_delete = []
-    for label, output_info in restart_dict['output'].items():
-        if not only_converged or output_info['convergence']:
-            species_to_delete.append(label)
+    remote_paths = get_remote_calc_paths(local_project_path, only_converged)
 
     with SSHClient(server_name) as ssh:
-        for label in species_to_delete:
-            remote_label = label.replace('(', '_').replace(')', '_')
-            remote_path = os.path.join(
-                'runs', 'ARC_Projects', project_name, remote_label)
+        for label, remote_path in remote_paths.items():
             try:
                 ssh.remove_dir(remote_path)
             except ServerError as e:
@@ -51,3 +126,120 @@ def remove_remote_calc_files(server_name: str,
             else:
                 logging.warning(
                     f"{label} dir ({remote_path}) is removed.")
+
+
+def get_remote_dir_sizes(client, remote_paths: list) -> dict:
+    """
+    Get the disk usage of remote directories by a single ``du -sb`` command.
+
+    Args:
+        client: A connected ``SSHClient`` or ``LocalCommandClient``.
+        remote_paths (list): The remote directories.
+
+    Returns:
+        dict: Keys are the remote paths, values are the sizes in bytes. 0 if the directory doesn't exist.
+    """
+    sizes = {remote_path: 0 for remote_path in remote_paths}
+    if not remote_paths:
+        return sizes
+    stdout, _ = client._send_command_to_server(
+        'du -sb ' + ' '.join(shlex.quote(remote_path) for remote_path in remote_paths))
+    for line in stdout:
+        # e.g., 1024\truns/ARC_Projects/project/spc
+        size, _, remote_path = line.partition('\t')
+        if remote_path in sizes:
+            try:
+                sizes[remote_path] = int(size)
+            except ValueError:
+                continue
+    return sizes
+
+
+def get_remote_dir_size(client, remote_path: str) -> int:
+    """
+    Get the disk usage of a remote directory.
+
+    Args:
+        client: A connected ``SSHClient`` or ``LocalCommandClient``.
+        remote_path (str): The remote directory.
+
+    Returns:
+        int: The size in bytes. 0 if the directory doesn't exist.
+    """
+    return get_remote_dir_sizes(client, [remote_path])[remote_path]
+
+
+def _remove_remote_dirs(client,
+                        remote_paths: list,
+                        measure_size: bool = True,
+                        ) -> int:
+    """
+    Remove remote directories through one session, by a single ``rm -rf`` command
+    after a single ``du -sb`` command if the sizes are measured.
+
+    Args:
+        client: A connected ``SSHClient`` or ``LocalCommandClient``.
+        remote_paths (list): The directories to be removed.
+        measure_size (bool): Whether to measure the directories before removing them.
+
+    Returns:
+        int: The number of bytes freed.
+    """
+    if not remote_paths:
+        return 0
+    sizes = get_remote_dir_sizes(client, remote_paths) if measure_size else {}
+    # Directories already removed are skipped silently by -f
+    _, stderr = client._send_command_to_server(
+        'rm -rf ' + ' '.join(shlex.quote(remote_path) for remote_path in remote_paths))
+    failed = set()
+    for line in stderr:
+        failed.update(remote_path for remote_path in remote_paths if remote_path in line)
+        logging.warning(f'Cannot remove dir. Got: {line}. Skip.')
+    return sum(size for remote_path, size in sizes.items() if remote_path not in failed)
+
+
+def batch_remove_remote_calc_files(server_name: str,
+                                   local_project_path: str,
+                                   only_converged: bool = True,
+                                   max_workers: int = 4,
+                                   measure_size: bool = True,
+                                   client_factory: Optional[Callable] = None,
+                                   ) -> int:
+    """
+    Remove calculations from the remote server concurrently. All of the remote directories
+    are resolved first, then they are distributed over at most ``max_workers`` concurrent
+    sessions. Each session removes its directories by a single command.
+
+    Args:
+        server_name (str): The server host the calculations
+        local_project_path (str): The path to the local project
+        only_converged (bool): Remove all calculation files or only converged
+                               calculation files. ``True`` for only converged ones.
+        max_workers (int): The number of concurrent sessions.
+        measure_size (bool): Whether to measure the directories to report the bytes freed,
+                             which costs one more command per session.
+        client_factory (Optional[Callable]): A function takes the server name and returns a client
+                                             used as a context manager. Defaults to ARC's ``SSHClient``.
+                                             ``LocalCommandClient`` can be used for local tests.
+
+    Returns:
+        int: The number of bytes freed. 0 if ``measure_size`` is ``False``.
+    """
+    if client_factory is None:
+        from arc.job.ssh import SSHClient
+        client_factory = SSHClient
+    remote_paths = list(get_remote_calc_paths(local_project_path, only_converged).values())
+    if not remote_paths:
+        return 0
+    max_workers = max(1, min(max_workers, len(remote_paths)))
+
+    def remove_dirs(worker_paths):
+        with client_factory(server_name) as client:
+            return _remove_remote_dirs(client, worker_paths, measure_size)
+
+    # Each worker holds one session and handles every ``max_workers``-th directory
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        freed = sum(executor.map(remove_dirs,
+                                 [remote_paths[i::max_workers] for i in range(max_workers)]))
+    logging.warning(f'{len(remote_paths)} dirs are cleaned up, {freed / 1024 ** 2:.1f} MB freed.')
+    return freed
@@ -1,10 +1,28 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
+import gzip
+import hashlib
+import io
+import json
 import os
 import re
+import shutil
+import sys
+import tempfile
+import threading
 import yaml
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+try:
+    # Use the libyaml bindings if available
+    from yaml import CFullLoader as YAMLLoader, CDumper as _BaseDumper
+except ImportError:
+    from yaml import FullLoader as YAMLLoader, Dumper as _BaseDumper
+
+from easy_rmg_model.instrumentation import count_file_read, timer
 
 
 def regularize_path(path: str) -> str:
@@ -22,75 +40,740 @@ def regularize_path(path: str) -> str:
         return os.path.abspath(os.path.expandvars(path))
 
 
-def get_files_by_regex(path: str, regex: str) -> list:
+def _list_dir(path: str) -> Optional[tuple]:
     """
-    Get all the file paths corresponding the regex given
+    List the sub-directories and files of a directory with a single ``os.scandir``.
 
     Args:
-        path (str): The directory which contains files to be found
-        regex (regex): The regular expression of the search
+        path (str): The directory to be listed.
 
-    Return:
-        file_list (list): A list of file paths
+    Returns:
+        tuple: The names of sub-directories and the names of files. ``None`` if cannot be listed.
     """
-    file_list = list()
-    for root, _, files in os.walk(path):
-        for file_name in files:
-            if re.search(regex, file_name):
-                file_list.append(os.path.join(root, file_name))
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return
+    return dirs, files
+
+
+def _compile_prune(prune: Union[None, str, Iterable, Callable]) -> Optional[Callable]:
+    """
+    Convert the pruning rule to a function takes a directory name and returns
+    whether the directory should be skipped.
+
+    Args:
+        prune: A regular expression, a collection of directory names or a function.
+    """
+    if not prune:
+        return
+    elif callable(prune):
+        return prune
+    elif isinstance(prune, str):
+        pattern = re.compile(prune)
+        return lambda name: pattern.search(name) is not None
+    names = set(prune)
+    return lambda name: name in names
+
+
+class DirectoryIndex(object):
+    """
+    A persisted listing of directories. A directory is only listed again if its
+    modification time changed, which happens when entries are added to, removed from
+    or renamed in it. Unchanged subtrees only cost one ``stat`` per directory.
+
+    Args:
+        path (str): The path to the index file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def list_dir(self, path: str) -> Optional[tuple]:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.entries.pop(path, None)
+            return
+        cached = self.entries.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+        listing = _list_dir(path)
+        if listing is not None:
+            self.entries[path] = [mtime, listing[0], listing[1]]
+        return listing
+
+    def save(self):
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        tmp_path = f'{self.path}.tmp{os.getpid()}'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+
+def walk_dir(path: str,
+             prune: Union[None, str, Iterable, Callable] = None,
+             index: Optional[DirectoryIndex] = None):
+    """
+    Walk through the directory tree top-down like ``os.walk``, but based on ``os.scandir``.
+    As in ``os.walk``, the ``dirs`` list can be modified in place to avoid walking into
+    sub-directories.
+
+    Args:
+        path (str): The directory to walk through.
+        prune: The rule of the sub-directories to be skipped. It can be a regular expression,
+               a collection of directory names or a function takes the directory name.
+        index (Optional[DirectoryIndex]): A directory index to reuse the unchanged listings.
+
+    Yields:
+        tuple: ``(root, dirs, files)`` for each directory.
+    """
+    prune = _compile_prune(prune)
+    list_dir = index.list_dir if index else _list_dir
+    stack = [path]
+    while stack:
+        root = stack.pop()
+        listing = list_dir(root)
+        if listing is None:
+            continue
+        dirs, files = listing
+        if prune:
+            dirs = [name for name in dirs if not prune(name)]
+        else:
+            dirs = list(dirs)
+        yield root, dirs, files
+        stack.extend(os.path.join(root, name) for name in reversed(dirs))
+
+
+def find_files(path: str,
+               regex: Union[None, str, re.Pattern] = None,
+               prune: Union[None, str, Iterable, Callable] = None,
+               max_workers: int = 1,
+               index_path: Optional[str] = None,
+               ) -> list:
+    """
+    Find the files whose names match the regular expression. Top-level sub-directories
+    can be walked through in parallel, which helps on network file systems.
+
+    Args:
+        path (str): The directory which contains files to be found.
+        regex (Union[str, re.Pattern]): The regular expression of the file names. All files if not assigned.
+        prune: The rule of the sub-directories to be skipped. See ``walk_dir``.
+        max_workers (int): The number of top-level sub-directories walked through concurrently.
+        index_path (Optional[str]): The path to a persisted directory index. Only the directories
+                                    changed since the last search are listed again.
+
+    Returns:
+        list: A list of file paths.
+    """
+    pattern = re.compile(regex) if isinstance(regex, str) else regex
+    index = DirectoryIndex(index_path) if index_path else None
+
+    def search(root_path):
+        file_list = []
+        for root, _, files in walk_dir(root_path, prune=prune, index=index):
+            file_list.extend(os.path.join(root, file_name) for file_name in files
+                             if not pattern or pattern.search(file_name))
+        return file_list
+
+    if max_workers > 1:
+        listing = index.list_dir(path) if index else _list_dir(path)
+        if listing is None:
+            return []
+        dirs, files = listing
+        prune_fun = _compile_prune(prune)
+        file_list = [os.path.join(path, file_name) for file_name in files
+                     if not pattern or pattern.search(file_name)]
+        sub_dirs = [os.path.join(path, name) for name in dirs
+                    if not (prune_fun and prune_fun(name))]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for sub_list in executor.map(search, sub_dirs):
+                file_list.extend(sub_list)
+    else:
+        file_list = search(path)
+
+    if index:
+        index.save()
     return file_list
 
 
-def save_yaml_file(path: str,
-                   content: Union[str, dict], overwrite: bool = True):
+def get_files_by_regex(path: str,
+                       regex: str,
+                       prune: Union[None, str, Iterable, Callable] = None,
+                       max_workers: int = 1,
+                       index_path: Optional[str] = None,
+                       ) -> list:
     """
-    Save yaml files with options for overwriting.
+    Get all the file paths corresponding the regex given
 
     Args:
         path (str): The directory which contains files to be found
         regex (regex): The regular expression of the search
+        prune: The rule of the sub-directories to be skipped. See ``walk_dir``.
+        max_workers (int): The number of top-level sub-directories walked through concurrently.
+        index_path (Optional[str]): The path to a persisted directory index.
 
     Return:
         file_list (list): A list of file paths
     """
+    return find_files(path, regex, prune=prune,
+                      max_workers=max_workers, index_path=index_path)
+
+
+def _get_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once, since reading the umask requires setting it
+_UMASK = _get_umask()
+
+
+def _get_free_path(dirname: str, filename: str, suffix: str) -> str:
+    """
+    Get the first path not taken among ``filename{suffix}``, ``filename (1){suffix}``,
+    ``filename (2){suffix}``, ... The directory is only listed once.
+
+    Args:
+        dirname (str): The directory of the file.
+        filename (str): The file name without suffix.
+        suffix (str): The suffix of the file.
+
+    Returns:
+        str: The path not taken.
+    """
+    pattern = re.compile(rf'^{re.escape(filename)}(?: \((\d+)\))?{re.escape(suffix)}$')
+    taken = set()
+    for name in os.listdir(dirname or os.curdir):
+        match = pattern.match(name)
+        if match:
+            taken.add(int(match.group(1)) if match.group(1) else 0)
+    i = 0
+    while i in taken:
+        i += 1
+    index = '' if not i else f' ({i})'
+    return os.path.join(dirname, f'{filename}{index}{suffix}')
+
+
+def _save_file_atomically(path: str,
+                          write: Callable,
+                          overwrite: bool = True) -> str:
+    """
+    Save a yaml file atomically. The content is written to a temporary file in the same
+    directory, which is then renamed (overwriting) or hard linked (not overwriting) to the
+    target path, so that readers never see a partial file and concurrent writers never
+    clobber each other. If not overwriting, an index is appended to the file name,
+    e.g., ``input (1).yml``.
+
+    Args:
+        path (str): The path to save the file.
+        write (Callable): A function takes the file object and writes the content.
+        overwrite (bool): Whether to overwrite the existing file.
+
+    Returns:
+        str: The path of the saved file.
+    """
     if not isinstance(path, str):
         raise ValueError(f'Invalid path ({path}) due to wrong type ({type(path)})')
 
-    yaml.add_representer(str, string_representer)
-    content = yaml.dump(data=content)
-
     dirname = os.path.dirname(path)
     filename = os.path.basename(path)
 
     # Make sure the dir is exists
     if dirname and not os.path.exists(dirname):
-        os.makedirs(dirname)
+        os.makedirs(dirname, exist_ok=True)
 
     # Make sure the suffix is correct
     if filename.endswith('.yml') or filename.endswith('.yaml'):
         suffix = '.' + filename.split('.')[-1]
-        filename = filename.replace(suffix, '')
+        filename = filename[:-len(suffix)]
     else:
         suffix = '.yml'
 
-    # Overwrite handling
-    if not overwrite:
-        i = 0
-        while i < 100000:
-            index = '' if not i else f' ({i})'
-            new_path = os.path.join(dirname, f'{filename}{index}{suffix}')
-            if not os.path.isfile(new_path):
-                break
-            i += 1
-    else:
-        new_path = os.path.join(dirname, f'{filename}{suffix}')
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{filename}.', suffix='.tmp',
+                                    dir=dirname or None)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            write(f)
+        # mkstemp creates the file with 0600, use the default permission instead
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+
+        if overwrite:
+            new_path = os.path.join(dirname, f'{filename}{suffix}')
+            os.replace(tmp_path, new_path)
+            return new_path
+
+        while True:
+            new_path = _get_free_path(dirname, filename, suffix)
+            try:
+                # Linking fails if the path is taken, e.g., by a concurrent writer
+                os.link(tmp_path, new_path)
+            except FileExistsError:
+                continue
+            except OSError:
+                # Hard links are not supported, reserve the path by exclusive creation
+                try:
+                    open(new_path, 'x').close()
+                except FileExistsError:
+                    continue
+                os.replace(tmp_path, new_path)
+            return new_path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# The compression methods supported and the suffixes of the compressed files
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def get_compression(path: str) -> Optional[str]:
+    """
+    Get the compression method of a file from its suffix.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        Optional[str]: ``'gzip'`` or ``'zstd'``. ``None`` if not compressed.
+    """
+    for method, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return method
+
+
+def get_compressed_path(path: str, compress: Union[bool, str] = False) -> str:
+    """
+    Get the path of a file after being compressed.
+
+    Args:
+        path (str): The path to the uncompressed file.
+        compress (Union[bool, str]): The compression method, ``True`` for ``'gzip'``.
+                                     The path is unchanged if ``False``.
 
-    with open(new_path, 'w') as f:
-        f.write(content)
+    Returns:
+        str: The path to the compressed file.
+    """
+    if not compress:
+        return path
+    return path + COMPRESSION_SUFFIXES['gzip' if compress is True else compress]
+
+
+def find_compressed_file(path: str) -> str:
+    """
+    Find the file or its compressed version, e.g., ``output.out`` or ``output.out.gz``.
+
+    Args:
+        path (str): The path to the uncompressed file.
+
+    Returns:
+        str: The path found. The original path if none is found.
+    """
+    if os.path.isfile(path) or get_compression(path):
+        return path
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if os.path.isfile(path + suffix):
+            return path + suffix
+    return path
+
+
+def _open_compressed(path: str,
+                     mode: str = 'rt',
+                     method: Optional[str] = None):
+    """
+    Open a file with the given compression method. ``zstd`` requires the ``zstandard`` package.
+    """
+    if method is None:
+        return open(path, mode)
+    elif method == 'gzip':
+        # A moderate level, since the default (9) is several times slower for little gain
+        return gzip.open(path, mode, compresslevel=6)
+    elif method == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(f'The zstandard package is required to open {path}.')
+        binary = open(path, mode.replace('t', '').rstrip('b') + 'b')
+        if 'r' in mode:
+            stream = zstandard.ZstdDecompressor().stream_reader(binary, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(binary, closefd=True)
+        return stream if 'b' in mode else io.TextIOWrapper(stream)
+    raise ValueError(f'Invalid compression method ({method}), '
+                     f'should be one of {list(COMPRESSION_SUFFIXES)}.')
 
+
+def open_file(path: str, mode: str = 'rt'):
+    """
+    Open a plain or compressed (gzip or zstd) file. The compression is determined by the suffix,
+    and the compressed file is used if the plain one doesn't exist but the compressed one does.
+
+    Args:
+        path (str): The path to the file.
+        mode (str): The mode to open the file.
+
+    Returns:
+        The file object.
+    """
+    if 'r' in mode:
+        path = find_compressed_file(path)
+    return _open_compressed(path, mode, get_compression(path))
+
+
+def read_tail_lines(path: str, num_bytes: int = 1 << 16) -> list:
+    """
+    Read the lines at the end of a plain or compressed file. Plain files are read by seeking
+    to the end; compressed files are streamed with only the tail kept in memory.
+
+    Args:
+        path (str): The path to the file.
+        num_bytes (int): The approximate number of bytes to read.
+
+    Returns:
+        list: The lines.
+    """
+    path = find_compressed_file(path)
+    method = get_compression(path)
+    with _open_compressed(path, 'rb', method) as f:
+        if method is None:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - num_bytes, 0))
+            tail, truncated = f.read(), size > num_bytes
+        else:
+            tail, truncated = b'', False
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                truncated = truncated or len(tail) + len(chunk) > num_bytes
+                tail = (tail + chunk)[-num_bytes:]
+    lines = tail.decode(errors='replace').splitlines(keepends=True)
+    # The first line is likely incomplete
+    return lines[1:] if truncated else lines
+
+
+# The decompressed copies kept by ``keep_decompressed``, keyed by (path, mtime, size)
+_DECOMPRESSED = {'dir': None, 'paths': {}}
+_DECOMPRESSED_LOCK = threading.Lock()
+
+
+@contextmanager
+def keep_decompressed():
+    """
+    A context manager keeps the copies decompressed by ``decompressed_path`` until exit,
+    so that a compressed file handled by several parsers in a call chain (e.g., the
+    convergence check, then the geometry and the scan parsers) is only decompressed once.
+    Nested scopes share the outermost one.
+    """
+    with _DECOMPRESSED_LOCK:
+        outermost = _DECOMPRESSED['dir'] is None
+        if outermost:
+            _DECOMPRESSED['dir'] = tempfile.mkdtemp()
+    if not outermost:
+        yield
+        return
+    try:
+        yield
+    finally:
+        with _DECOMPRESSED_LOCK:
+            tmp_dir = _DECOMPRESSED['dir']
+            _DECOMPRESSED['dir'], _DECOMPRESSED['paths'] = None, {}
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _decompress_to_dir(path: str, method: str, tmp_dir: str) -> str:
+    """
+    Decompress a file to a new folder under ``tmp_dir``, keeping the original file name,
+    since some parsers check it.
+    """
+    tmp_path = os.path.join(tempfile.mkdtemp(dir=tmp_dir),
+                            os.path.basename(path)[:-len(COMPRESSION_SUFFIXES[method])])
+    with _open_compressed(path, 'rb', method) as fsrc, open(tmp_path, 'wb') as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
+    return tmp_path
+
+
+@contextmanager
+def decompressed_path(path: str):
+    """
+    A context manager provides a plain file path to parsers only accepting paths,
+    e.g., the parsers of ARC and Arkane. A compressed file is decompressed to a
+    temporary file, which is removed on exit, or reused until the end of the
+    enclosing ``keep_decompressed`` scope.
+
+    Args:
+        path (str): The path to the plain or compressed file.
+
+    Yields:
+        str: The path to the plain file.
+    """
+    path = find_compressed_file(path)
+    method = get_compression(path)
+    if method is None:
+        yield path
+        return
+
+    with _DECOMPRESSED_LOCK:
+        kept_dir = _DECOMPRESSED['dir']
+    if kept_dir is not None:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with _DECOMPRESSED_LOCK:
+            tmp_path = _DECOMPRESSED['paths'].get(key)
+        if tmp_path is None:
+            tmp_path = _decompress_to_dir(path, method, kept_dir)
+            with _DECOMPRESSED_LOCK:
+                tmp_path = _DECOMPRESSED['paths'].setdefault(key, tmp_path)
+        yield tmp_path
+        return
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        yield _decompress_to_dir(path, method, tmp_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def compress_file(path: str,
+                  method: str = 'gzip',
+                  remove: bool = True) -> str:
+    """
+    Compress a file. The compressed file is saved next to the original one with the suffix
+    of the compression method.
+
+    Args:
+        path (str): The path to the file.
+        method (str): ``'gzip'`` or ``'zstd'``.
+        remove (bool): Whether to remove the original file.
+
+    Returns:
+        str: The path to the compressed file.
+    """
+    new_path = get_compressed_path(path, method)
+    transfer_file(path, path, compress=method)
+    if remove:
+        os.remove(path)
     return new_path
 
 
+# The transfer modes of ``transfer_file``
+TRANSFER_MODES = ('copy', 'hardlink', 'reflink', 'auto')
+
+# The ioctl request of cloning a file on Linux (FICLONE)
+_FICLONE = 0x40049409
+
+
+def _reflink_file(src: str, dst: str):
+    """
+    Clone a file by reflink (copy-on-write), e.g., on Btrfs or XFS.
+    Raise OSError if not supported.
+    """
+    if not sys.platform.startswith('linux'):
+        raise OSError(f'Reflinks are not supported on {sys.platform}.')
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'xb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def get_file_checksum(path: str,
+                      algorithm: str = 'sha256',
+                      chunk_size: int = 1 << 20,
+                      method: Optional[str] = None) -> str:
+    """
+    Get the checksum of a file, read in chunks.
+
+    Args:
+        path (str): The path to the file.
+        algorithm (str): The hash algorithm supported by ``hashlib``.
+        chunk_size (int): The number of bytes read each time.
+        method (Optional[str]): The compression method of the file. The checksum is
+                                of the decompressed content if assigned.
+
+    Returns:
+        str: The hex digest.
+    """
+    checksum = hashlib.new(algorithm)
+    with _open_compressed(path, 'rb', method) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def transfer_file(src: str,
+                  dst: str,
+                  mode: str = 'auto',
+                  verify: bool = True,
+                  compress: Union[bool, str] = False) -> str:
+    """
+    Transfer a file without duplicating the data if possible. Hard links share the data with
+    the source, so the source should not be modified in place afterwards; reflinks are
+    copy-on-write and are safe to modify. Copies are written to a temporary file and renamed
+    after the checksum is verified.
+
+    Args:
+        src (str): The source file.
+        dst (str): The destination file. An existing file is replaced.
+        mode (str): ``'copy'``, ``'hardlink'``, ``'reflink'``, or ``'auto'``, which tries
+                    reflink, hardlink, and copy in turn.
+        verify (bool): Whether to verify the checksum of copies.
+        compress (Union[bool, str]): Save a compressed copy at ``dst`` with the suffix of the
+                                     compression method instead. ``True`` for ``'gzip'``,
+                                     or ``'zstd'``.
+
+    Returns:
+        str: The method used, ``'copy'``, ``'hardlink'``, ``'reflink'``, ``'gzip'`` or ``'zstd'``.
+    """
+    if mode not in TRANSFER_MODES:
+        raise ValueError(f'Invalid transfer mode ({mode}), should be one of {TRANSFER_MODES}.')
+    dirname = os.path.dirname(dst)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    if compress:
+        methods = ['gzip' if compress is True else compress]
+    elif mode == 'auto':
+        methods = ['reflink', 'hardlink', 'copy']
+    else:
+        methods = [mode]
+
+    for method in methods:
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(dst)}.',
+                                        suffix='.tmp', dir=dirname or None)
+        os.close(fd)
+        os.remove(tmp_path)
+        try:
+            if method == 'reflink':
+                _reflink_file(src, tmp_path)
+            elif method == 'hardlink':
+                os.link(src, tmp_path)
+            elif method in COMPRESSION_SUFFIXES:
+                with open(src, 'rb') as fsrc, \
+                        _open_compressed(tmp_path, 'wb', method) as fdst:
+                    shutil.copyfileobj(fsrc, fdst, 1 << 20)
+            else:
+                shutil.copy2(src, tmp_path)
+            if verify and method not in ['hardlink', 'reflink']:
+                method_ = method if method in COMPRESSION_SUFFIXES else None
+                if get_file_checksum(tmp_path, method=method_) != get_file_checksum(src):
+                    raise ValueError(f'Checksum mismatch when copying {src} to {dst}.')
+            os.replace(tmp_path, get_compressed_path(dst, compress))
+        except OSError:
+            # Not supported by the file system or across devices, try the next method
+            if method == methods[-1]:
+                raise
+        else:
+            return method
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def transfer_files(transfers: Iterable,
+                   mode: str = 'auto',
+                   verify: bool = True,
+                   max_workers: int = 4) -> dict:
+    """
+    Transfer files in parallel.
+
+    Args:
+        transfers (Iterable): Tuples of (source, destination) or (source, destination, compress).
+        mode (str): The transfer mode, see ``transfer_file``.
+        verify (bool): Whether to verify the checksums of copies.
+        max_workers (int): The number of threads.
+
+    Returns:
+        dict: Keys are the methods used, values are the numbers of files.
+    """
+    def transfer(args):
+        src, dst, compress = (tuple(args) + (False,))[:3]
+        return transfer_file(src, dst, mode=mode, verify=verify, compress=compress)
+
+    transfers = list(transfers)
+    if max_workers > 1 and len(transfers) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            methods = list(executor.map(transfer, transfers))
+    else:
+        methods = [transfer(args) for args in transfers]
+    counts = {}
+    for method in methods:
+        counts[method] = counts.get(method, 0) + 1
+    return counts
+
+
+def save_yaml_file(path: str,
+                   content: Union[str, dict], overwrite: bool = True):
+    """
+    Save yaml files with options for overwriting. The content is
+    streamed to the file and the file is saved atomically.
+
+    Args:
+        path (str): The path to save the file.
+        content (Union[str, dict]): The content to be saved.
+        overwrite (bool): Whether to overwrite the existing file.
+
+    Return:
+        str: The path of the saved file.
+    """
+    with timer('yaml.save'):
+        return _save_file_atomically(path,
+                                     lambda f: yaml.dump(content, f, Dumper=YAMLDumper),
+                                     overwrite=overwrite)
+
+
+def save_yaml_list(path: str,
+                   items: Iterable,
+                   key: str = 'species',
+                   overwrite: bool = True):
+    """
+    Save a long list (e.g., the species section of an ARC input) as a yaml file
+    ``{key: items}``, one item at a time. ``items`` can be a generator, so the
+    whole list doesn't need to be held in memory.
+
+    Args:
+        path (str): The path to save the file.
+        items (Iterable): The items of the list.
+        key (str): The key of the list.
+        overwrite (bool): Whether to overwrite the existing file.
+
+    Return:
+        str: The path of the saved file.
+    """
+    def write(f):
+        f.write(f'{key}:\n')
+        empty = True
+        for item in items:
+            yaml.dump([item], f, Dumper=YAMLDumper)
+            empty = False
+        if empty:
+            f.seek(0)
+            f.truncate()
+            yaml.dump({key: []}, f, Dumper=YAMLDumper)
+
+    return _save_file_atomically(path, write, overwrite=overwrite)
+
+
 def string_representer(dumper, data):
     """
     Add a custom string representer to use block literals for multiline strings.
@@ -100,6 +783,16 @@ def string_representer(dumper, data):
     return dumper.represent_scalar(tag='tag:yaml.org,2002:str', value=data)
 
 
+class YAMLDumper(_BaseDumper):
+    """
+    The dumper used to save yaml files. The representers are registered to
+    this class only, so that the global ``yaml`` settings are not changed.
+    """
+
+
+YAMLDumper.add_representer(str, string_representer)
+
+
 def read_yaml_file(path: str) -> dict or list:
     """
     Read a YAML file and return the parameters as python variables.
@@ -115,6 +808,82 @@ def read_yaml_file(path: str) -> dict or list:
             f'Invalid path ({path}).')
     if not os.path.isfile(path):
         raise ValueError(f'Given path ({path}) does not exist.')
-    with open(path) as f:
-        content = yaml.load(stream=f, Loader=yaml.FullLoader)
+    with timer('yaml.read'), open(path) as f:
+        content = yaml.load(stream=f, Loader=YAMLLoader)
+    count_file_read(path)
     return content
+
+
+def _get_indent(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+def _iter_yaml_list_chunks(f, key: str) -> Iterator[str]:
+    """
+    Split a top-level block list in a yaml file into the text of each item.
+
+    Raises:
+        ValueError: If the list is not in block style.
+    """
+    for line in f:
+        if line.startswith(f'{key}:'):
+            break
+    else:
+        return
+    if line[len(key) + 1:].split('#')[0].strip():
+        raise ValueError(f'{key} is not a block list.')
+
+    item_indent, chunk = None, []
+    for line in f:
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            indent = _get_indent(line)
+            if item_indent is None:
+                if not stripped.startswith('-'):
+                    raise ValueError(f'{key} is not a block list.')
+                item_indent = indent
+            if indent == item_indent and stripped.startswith('-'):
+                # A new item
+                if chunk:
+                    yield ''.join(chunk)
+                chunk = []
+            elif indent <= item_indent:
+                # The end of the list
+                break
+        if item_indent is not None:
+            chunk.append(line[item_indent:] if len(line) > item_indent else line.lstrip(' '))
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_yaml_list(path: str, key: str = 'species') -> Iterator:
+    """
+    Read the items of a top-level block list (e.g., the species section of an ARC input)
+    one at a time, so that only one item is held in memory. It falls back to reading
+    the whole file if the list cannot be read item by item (e.g., flow style or aliases).
+
+    Args:
+        path (str): The YAML file path to read.
+        key (str): The key of the list.
+
+    Yields:
+        The items of the list.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f'Given path ({path}) does not exist.')
+
+    count_file_read(path)
+    count = 0
+    with open(path) as f:
+        try:
+            for chunk in _iter_yaml_list_chunks(f, key):
+                item = yaml.load(chunk, Loader=YAMLLoader)[0]
+                yield item
+                count += 1
+        except (ValueError, yaml.YAMLError):
+            pass
+        else:
+            return
+    content = read_yaml_file(path)
+    for item in (content.get(key) or [])[count:]:
+        yield item
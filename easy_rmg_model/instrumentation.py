@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+The toolbox for instrumenting the stages of the workflows with timers, counters and gauges.
+Instrumentation is disabled by default, and the hooks cost a flag check when disabled.
+The results can be printed as a summary table or saved as a Chrome trace
+(open it in chrome://tracing or https://ui.perfetto.dev).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+_STATE = {'enabled': False, 'trace': False, 'start': 0.0}
+_LOCK = threading.Lock()
+_TIMERS = {}  # name: [calls, total, max]
+_COUNTERS = {}  # name: value
+_GAUGES = {}  # name: [last, max]
+_EVENTS = []  # Chrome trace events
+
+
+def enable(trace: bool = False):
+    """
+    Enable the instrumentation.
+
+    Args:
+        trace (bool): Whether to record the trace events for ``save_chrome_trace``.
+    """
+    _STATE.update({'enabled': True, 'trace': trace, 'start': time.perf_counter()})
+
+
+def disable():
+    """
+    Disable the instrumentation. The recorded results are kept.
+    """
+    _STATE['enabled'] = False
+
+
+def is_enabled() -> bool:
+    return _STATE['enabled']
+
+
+def reset():
+    """
+    Clear the recorded results.
+    """
+    with _LOCK:
+        _TIMERS.clear()
+        _COUNTERS.clear()
+        _GAUGES.clear()
+        _EVENTS.clear()
+    _STATE['start'] = time.perf_counter()
+
+
+class _NullTimer(object):
+    """
+    The timer used when the instrumentation is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer(object):
+    __slots__ = ('name', 't0')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        t1 = time.perf_counter()
+        elapsed = t1 - self.t0
+        with _LOCK:
+            record = _TIMERS.setdefault(self.name, [0, 0.0, 0.0])
+            record[0] += 1
+            record[1] += elapsed
+            record[2] = max(record[2], elapsed)
+            if _STATE['trace']:
+                _EVENTS.append({'name': self.name, 'ph': 'X', 'pid': os.getpid(),
+                                'tid': threading.get_ident(),
+                                'ts': (self.t0 - _STATE['start']) * 1e6,
+                                'dur': elapsed * 1e6})
+        return False
+
+
+def timer(name: str):
+    """
+    Get a context manager timing the block under ``name``.
+
+    Args:
+        name (str): The name of the stage, e.g., ``'yaml.read'``.
+    """
+    return _Timer(name) if _STATE['enabled'] else _NULL_TIMER
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    A decorator timing the function.
+
+    Args:
+        name (Optional[str]): The name of the stage. Defaults to the function name.
+    """
+    def decorator(func):
+        stage = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _STATE['enabled']:
+                return func(*args, **kwargs)
+            with _Timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: int = 1):
+    """
+    Increase a counter.
+
+    Args:
+        name (str): The name of the counter, e.g., ``'isomorphism.calls'``.
+        value (int): The increment.
+    """
+    if not _STATE['enabled']:
+        return
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + value
+        if _STATE['trace']:
+            _EVENTS.append({'name': name, 'ph': 'C', 'pid': os.getpid(),
+                            'ts': (time.perf_counter() - _STATE['start']) * 1e6,
+                            'args': {name: _COUNTERS[name]}})
+
+
+def gauge(name: str, value: float):
+    """
+    Set a gauge, e.g., the number of species left.
+
+    Args:
+        name (str): The name of the gauge.
+        value (float): The current value.
+    """
+    if not _STATE['enabled']:
+        return
+    with _LOCK:
+        record = _GAUGES.setdefault(name, [value, value])
+        record[0], record[1] = value, max(record[1], value)
+        if _STATE['trace']:
+            _EVENTS.append({'name': name, 'ph': 'C', 'pid': os.getpid(),
+                            'ts': (time.perf_counter() - _STATE['start']) * 1e6,
+                            'args': {name: value}})
+
+
+def count_file_read(path: str, num_bytes: Optional[int] = None):
+    """
+    Count a file parsed and the bytes read.
+
+    Args:
+        path (str): The path to the file.
+        num_bytes (Optional[int]): The number of bytes read. Defaults to the file size.
+    """
+    if not _STATE['enabled']:
+        return
+    if num_bytes is None:
+        try:
+            num_bytes = os.path.getsize(path)
+        except OSError:
+            num_bytes = 0
+    count('files.parsed')
+    count('bytes.read', num_bytes)
+
+
+def get_results() -> dict:
+    """
+    Get the recorded results.
+
+    Returns:
+        dict: The ``timers`` (calls, total, mean and max time in seconds), ``counters`` and ``gauges``.
+    """
+    with _LOCK:
+        return {'timers': {name: {'calls': calls, 'total': total,
+                                  'mean': total / calls, 'max': max_time}
+                           for name, (calls, total, max_time) in _TIMERS.items()},
+                'counters': dict(_COUNTERS),
+                'gauges': {name: {'last': last, 'max': max_value}
+                           for name, (last, max_value) in _GAUGES.items()}}
+
+
+def summary() -> str:
+    """
+    Get the summary table of the recorded results. Timers are sorted by the total time.
+
+    Returns:
+        str: The summary table.
+    """
+    results = get_results()
+    lines = [f'{"Stage":<40s}{"Calls":>10s}{"Total (s)":>12s}{"Mean (ms)":>12s}{"Max (ms)":>12s}']
+    for name, record in sorted(results['timers'].items(), key=lambda item: -item[1]['total']):
+        lines.append(f'{name:<40s}{record["calls"]:>10d}{record["total"]:>12.3f}'
+                     f'{record["mean"] * 1e3:>12.3f}{record["max"] * 1e3:>12.3f}')
+    if results['counters']:
+        lines.append(f'\n{"Counter":<40s}{"Value":>10s}')
+        for name, value in sorted(results['counters'].items()):
+            lines.append(f'{name:<40s}{value:>10d}')
+    if results['gauges']:
+        lines.append(f'\n{"Gauge":<40s}{"Last":>10s}{"Max":>12s}')
+        for name, record in sorted(results['gauges'].items()):
+            lines.append(f'{name:<40s}{record["last"]:>10g}{record["max"]:>12g}')
+    return '\n'.join(lines)
+
+
+def save_chrome_trace(path: str):
+    """
+    Save the trace events in the Chrome trace format. Requires ``enable(trace=True)``.
+
+    Args:
+        path (str): The path to the JSON file.
+    """
+    with _LOCK:
+        events = list(_EVENTS)
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
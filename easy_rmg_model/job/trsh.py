@@ -1,39 +1,243 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
+"""
+The toolbox for determining the status of ESS jobs
+"""
 
-from arkane.ess import ess_factory, GaussianLog, MolproLog, OrcaLog, QChemLog, TeraChemLog
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Optional
 
-from arc.job.trsh import determine_ess_status
+from easy_rmg_model.common import decompressed_path, find_compressed_file, open_file
+from easy_rmg_model.instrumentation import count_file_read, timed
 
-from arc.parser import parse_frequencies
+# Job types whose outputs are checked for imaginary frequencies
+FREQ_JOB_TYPES = ['optfreq', 'freq', 'composite']
 
+# The identifiers of the ESS in the output files, in the order checked by Arkane's ess_factory
+ESS_IDENTIFIERS = [('gaussian, inc', 'gaussian'),
+                   ('molpro', 'molpro'),
+                   ('o   r   c   a', 'orca'),
+                   ('orca', 'orca'),
+                   ('qchem', 'qchem'),
+                   ('terachem', 'terachem')]
 
-def determine_convergence(path, job_type, ts=False):
+# The error keywords of the failed Gaussian links, as classified by ARC's determine_ess_status
+GAUSSIAN_ERROR_LINKS = {'l9999.exe': ['Unconverged', 'GL9999'],
+                        'l101.exe': ['InputError', 'GL101'],
+                        'l103.exe': ['InternalCoordinateError', 'GL103'],
+                        'l108.exe': ['InputError', 'GL108'],
+                        'l202.exe': ['OptOrientation', 'GL202'],
+                        'l301.exe': ['BasisSet', 'GL301'],
+                        'l401.exe': ['BasisSet', 'GL401'],
+                        'l502.exe': ['SCF', 'GL502'],
+                        'l508.exe': ['SCF', 'GL508'],
+                        'l716.exe': ['ZMatrix', 'GL716'],
+                        'l906.exe': ['MP2', 'GL906'],
+                        'l913.exe': ['MaxOptCycles', 'GL913']}
+
+# The messages of common Gaussian errors and their keywords
+GAUSSIAN_ERRORS = {'Convergence failure': 'SCF',
+                   'Number of steps exceeded': 'MaxOptCycles',
+                   'FormBX had a problem': 'FormBX',
+                   'Atoms too close': 'TooClose',
+                   'Erroneous write': 'DiskSpace',
+                   'Bend failed': 'Bend',
+                   'Linear angle in Tors': 'LinearAngle',
+                   'galloc: could not allocate memory': 'Memory',
+                   'Inaccurate quadrature in CalDSu': 'InaccurateQuadrature',
+                   'Problem with the distance matrix': 'DistanceMatrix'}
+
+# The lines starting a (Link1) job step of a Gaussian output. A step separated by
+# --Link1-- in the input is started again from l1.exe with its initial command.
+GAUSSIAN_LINK_STARTS = ('Entering Gaussian System', 'Proceeding to internal job step',
+                        'Initial command:')
+
+
+def identify_software(lines: list) -> Optional[str]:
+    """
+    Identify the ESS software from the lines of an output file.
+
+    Args:
+        lines (list): The lines of the output file.
+
+    Returns:
+        Optional[str]: The software in lower case. ``None`` if not identified.
+    """
+    for line in lines:
+        line = line.lower()
+        for identifier, software in ESS_IDENTIFIERS:
+            if identifier in line:
+                return software
+
+
+def parse_gaussian_status(lines: list) -> dict:
+    """
+    Parse the status and the imaginary frequencies from the lines of a Gaussian output,
+    which is used when ARC is not installed. A job of several (Link1) steps is only done
+    if its last step terminates normally.
+
+    Args:
+        lines (list): The lines of the output file.
+
+    Returns:
+        dict: The ``status`` (``'done'``, ``'errored'`` or ``'unfinished'``), ``keywords``
+              and ``error`` (the error keywords and message as ARC's ``determine_ess_status``),
+              and ``n_imag_freqs`` (``None`` if no frequencies are found, e.g., of single atoms).
+    """
+    status, keywords, error = 'unfinished', [], ''
+    for i in range(len(lines) - 1, -1, -1):
+        if any(start in lines[i] for start in GAUSSIAN_LINK_STARTS):
+            # The last step hasn't terminated
+            break
+        elif 'Normal termination' in lines[i]:
+            status = 'done'
+            break
+        elif 'Error termination' in lines[i]:
+            status = 'errored'
+            error = lines[i].strip()
+            link = next((link for link in GAUSSIAN_ERROR_LINKS if link in lines[i]), None)
+            if link:
+                keywords = list(GAUSSIAN_ERROR_LINKS[link])
+            for line in lines[max(i - 20, 0): i]:
+                message = next((msg for msg in GAUSSIAN_ERRORS if msg in line), None)
+                if message:
+                    if GAUSSIAN_ERRORS[message] not in keywords:
+                        keywords.insert(0, GAUSSIAN_ERRORS[message])
+                    error = f'{message}; {error}'
+                    break
+            break
+
+    # Only keep the frequencies of the last frequency calculation
+    freqs = None
+    for line in lines:
+        if 'Harmonic frequencies' in line:
+            freqs = []
+        elif line.startswith(' Frequencies --') and freqs is not None:
+            freqs.extend(float(value) for value in line.split()[2:])
+    return {'status': status,
+            'keywords': keywords,
+            'error': error,
+            'n_imag_freqs': sum(freq < 0 for freq in freqs) if freqs else None}
+
+
+def _parse_status_by_arc(path: str, job_type: str, software: str) -> dict:
+    """
+    Parse the status and the imaginary frequencies by the ARC parsers.
+    """
+    from arc.job.trsh import determine_ess_status
+    from arc.parser import parse_frequencies
+
+    with decompressed_path(path) as plain_path:
+        status, keywords, error, _ = determine_ess_status(plain_path,
+                                                          species_label='',
+                                                          job_type=job_type,
+                                                          software=software)
+        n_imag_freqs = None
+        if status == 'done' and job_type in FREQ_JOB_TYPES:
+            freqs = parse_frequencies(path=plain_path, software=software)
+            n_imag_freqs = sum(freq < 0 for freq in freqs) if len(freqs) else None
+    return {'status': 'done' if status == 'done' else 'errored',
+            'keywords': keywords,
+            'error': error or ', '.join(keywords),
+            'n_imag_freqs': n_imag_freqs}
+
+
+@timed('job.classify')
+def classify_job_output(path: str,
+                        job_type: str,
+                        ts: bool = False,
+                        ) -> dict:
+    """
+    Classify a job output. The file (plain or compressed) is read once to identify the software,
+    then parsed by ARC, which is the source of truth. Gaussian outputs are parsed natively
+    only if ARC is not installed.
+
+    Args:
+        path (str): The path to the output file.
+        job_type (str): The job type, e.g., ``'composite'``, ``'freq'``, ``'scan'``.
+        ts (bool): Whether the species is a TS, which should have one imaginary frequency.
+
+    Returns:
+        dict: The result has ``path``, ``job_type``, ``converged``, ``status`` (``'done'``,
+              ``'errored'``, ``'unfinished'`` or ``'unreadable'``), ``software``,
+              ``n_imag_freqs``, ``keywords`` (the error keywords used by ARC's troubleshooting)
+              and ``error`` (the reason if not converged).
+    """
+    result = {'path': path, 'job_type': job_type, 'converged': False, 'status': 'unreadable',
+              'software': None, 'n_imag_freqs': None, 'keywords': [], 'error': ''}
+    path = find_compressed_file(path)
     try:
-        log = ess_factory(path)
-    except:
-        return False
-    else:
-        for log_type in [GaussianLog, MolproLog, OrcaLog, QChemLog, TeraChemLog]:
-            if isinstance(log, log_type):
-                software = log_type.__name__.replace('Log', '').lower()
-                break
+        with open_file(path) as f:
+            lines = f.readlines()
+    except (OSError, UnicodeDecodeError, ValueError, EOFError) as e:
+        result['error'] = f'Cannot read the file: {e}'
+        return result
+    count_file_read(path)
+
+    result['software'] = identify_software(lines)
+    if result['software'] is None:
+        result['error'] = 'Cannot identify the ESS software.'
+        return result
     try:
-        done = determine_ess_status(path,
-                                    species_label='',
-                                    job_type=job_type,
-                                    software=software,
-                                    )[0] == 'done'
-    except:
-        return False
+        try:
+            result.update(_parse_status_by_arc(path, job_type, result['software']))
+        except ImportError:
+            if result['software'] != 'gaussian':
+                raise
+            result.update(parse_gaussian_status(lines))
+    except Exception as e:
+        result['status'], result['error'] = 'unreadable', f'Cannot parse the file: {e!r}'
+        return result
+
+    if result['status'] != 'done':
+        result['error'] = result['error'] or f'The job is {result["status"]}.'
+    elif job_type in FREQ_JOB_TYPES and result['n_imag_freqs'] is not None \
+            and result['n_imag_freqs'] != int(ts):
+        # Single atoms don't have frequencies
+        result['error'] = f'Found {result["n_imag_freqs"]} imaginary frequencies.'
+    else:
+        result['converged'] = True
+    return result
+
 
-    if done and job_type in ['optfreq', 'freq', 'composite']:
-        freqs = parse_frequencies(path=path, software=software)
-        if not len(freqs):
-            # Single atom without freq
-            return done
-        neg_freqs = [freq for freq in freqs if freq < 0]
-        if not ts:
-            return done and not len(neg_freqs)
-        return done and len(neg_freqs) == 1
+def _classify_job_output(args):
+    """
+    A picklable wrapper of ``classify_job_output`` for worker processes.
+    """
+    return classify_job_output(*args)
+
+
+def classify_job_outputs(jobs: Iterable,
+                         max_workers: int = 1,
+                         use_processes: bool = False,
+                         ) -> list:
+    """
+    Classify many job outputs concurrently.
+
+    Args:
+        jobs (Iterable): Tuples of (path, job_type) or (path, job_type, ts).
+        max_workers (int): The number of workers.
+        use_processes (bool): Use a process pool instead of a thread pool, which is faster
+                              if parsing rather than reading the files is the bottleneck.
+
+    Returns:
+        list: The results of ``classify_job_output`` in the same order as ``jobs``.
+    """
+    jobs = [tuple(job) for job in jobs]
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [_classify_job_output(job) for job in jobs]
+    executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor(max_workers=max_workers) as pool:
+        return list(pool.map(_classify_job_output, jobs,
+                             chunksize=max(1, len(jobs) // (4 * max_workers))))
+
+
+def determine_convergence(path, job_type, ts=False):
+    """
+    Determine whether a job is converged. See ``classify_job_output`` for the details.
+    """
+    if not path or not os.path.isfile(find_compressed_file(path)):
+        return False
+    return classify_job_output(path, job_type, ts)['converged']
@@ -5,11 +5,12 @@ import datetime
 import os
 import re
 
-from arkane.ess import ess_factory, GaussianLog
-
-from arc.common import read_yaml_file
-from arc.species.species import ARCSpecies
-from easy_rmg_model.species.converter import xyz_to_mol
+from easy_rmg_model.common import (find_compressed_file,
+                                   open_file,
+                                   read_tail_lines,
+                                   read_yaml_file)
+from easy_rmg_model.instrumentation import count_file_read
+from easy_rmg_model.job.trsh import identify_software
 
 
 def _get_lines_from_file(path) -> list:
@@ -17,7 +18,7 @@ def _get_lines_from_file(path) -> list:
     A helper function for getting a list of lines from a file.
 
     Args:
-        path (str): The file path.
+        path (str): The file path. The file can be gzip or zstd compressed.
 
     Returns:
         list: Entries are lines from the file.
@@ -25,35 +26,69 @@ def _get_lines_from_file(path) -> list:
     Raises:
         InputError: If the file could not be read.
     """
+    path = find_compressed_file(path)
     if os.path.isfile(path):
-        with open(path, 'r') as f:
+        with open_file(path) as f:
             lines = f.readlines()
+        count_file_read(path)
     else:
         raise ValueError(f'Could not find file {path}')
     return lines
 
 
-def parse_termination_time(path):
+def get_ess_software(path) -> str:
     """
-    Parse the termination time from the output log file.
+    Get the ESS software of an output file. The file (gzip or zstd compressed is also supported)
+    is read line by line until the software is identified.
+
+    Args:
+        path (str): The path to the output file.
+
+    Returns:
+        str: The software in lower case, e.g., ``'gaussian'``.
+
+    Raises:
+        ValueError: If the software cannot be identified.
     """
-    log = ess_factory(fullpath=path)
+    path = find_compressed_file(path)
+    if not os.path.isfile(path):
+        raise ValueError(f'Could not find file {path}')
+    with open_file(path) as f:
+        software = identify_software(f)
+    if software:
+        return software
+    raise ValueError(f'Could not identify the ESS software of {path}')
 
-    if isinstance(log, GaussianLog):
+
+def parse_termination_time(path):
+    """
+    Parse the termination time from the output log file. Only the end of the file
+    is read if the termination line can be found there.
+    """
+    if get_ess_software(path) == 'gaussian':
         regex = r'[a-zA-Z]+\s+\d+\s+\d{2}\:\d{2}\:\d{2}\s+\d{4}'
-        lines = _get_lines_from_file(path)
-        for line in lines[::-1]:
-            if 'termination' in line:
-                time_str = re.search(regex, line).group()
-                return datetime.datetime.strptime(time_str, '%b %d %H:%M:%S %Y')
+        for lines in (read_tail_lines(path), _get_lines_from_file(path)):
+            for line in lines[::-1]:
+                if 'termination' in line:
+                    time_str = re.search(regex, line).group()
+                    return datetime.datetime.strptime(time_str, '%b %d %H:%M:%S %Y')
         return None
     else:
         raise NotImplementedError
 
 
-def parse_species_in_arc_input(input_path: str) -> dict:
+def parse_species_in_arc_input(input_path: str, as_records: bool = False) -> dict:
     """
     A function used to get species scope from the ARC input file.
+
+    Args:
+        input_path (str): The path to the ARC input file.
+        as_records (bool): Return ``SpeciesRecord`` instead of dicts, whose ``ARCSpecies``
+                           are only created when accessed. The records have the same info
+                           as the dicts, e.g., the SMILES derived from the xyz.
+
+    Returns:
+        dict: Keys are labels, values are species info.
     """
     spc_info = {}
     try:
@@ -66,32 +101,33 @@ def parse_species_in_arc_input(input_path: str) -> dict:
         # An input file without species information, weird!
         return spc_info
 
+    from easy_rmg_model.species.converter import xyz_to_mol
+    if as_records:
+        from rmgpy.molecule.molecule import Molecule
+        from easy_rmg_model.species.record import SpeciesRecord
+    else:
+        from arc.species.species import ARCSpecies
+
     for spc in input_file['species']:
         label = spc['label']
-        if 'smiles' in spc:
-            try:
-                spc_info[label] = {'label': label,
-                                   'species': ARCSpecies(label=label,
-                                                         smiles=spc['smiles']),
-                                   'smiles': spc['smiles'],
-                                   'ts': False}
-            except:
-                pass
-        elif 'xyz' in spc:
-            try:
-                mol = xyz_to_mol(spc['xyz'])
-            except:
-                pass
+        # Species without valid smiles or xyz only have the label
+        spc_info[label] = SpeciesRecord(label=label, ts=False) if as_records \
+            else {'label': label, 'ts': False}
+        try:
+            if 'smiles' in spc:
+                smiles = spc['smiles']
+            elif 'xyz' in spc:
+                smiles = xyz_to_mol(spc['xyz'], copy=False).to_smiles()
             else:
-                smiles = mol.to_smiles()
-                spc_info[label] = {'label': label,
-                                   'species': ARCSpecies(label=label,
-                                                         smiles=smiles),
-                                   'smiles': smiles,
-                                   'ts': False}
-        if label not in spc_info:
-            # Cannot get smiles or xyz
-            spc_info[label] = {'label': label, 'ts': False}
+                continue
+            # Records only check the SMILES, and create the ARCSpecies at the first access
+            species = Molecule().from_smiles(smiles) if as_records \
+                else ARCSpecies(label=label, smiles=smiles)
+        except Exception:
+            continue
+        spc_info[label]['smiles'] = smiles
+        if not as_records:
+            spc_info[label]['species'] = species
     return spc_info
 
 
@@ -99,15 +135,14 @@ def parse_charge_and_mult(path):
     """
     Parse the termination time from the output log file.
     """
-    log = ess_factory(fullpath=path)
-
-    if isinstance(log, GaussianLog):
-        lines = _get_lines_from_file(path)
-        for line in lines[::]:
-            if 'charge' in line.lower() and 'multiplicity' in line.lower():
-                items = line.strip().split()
-                charge, mult = items[2], items[5]
-                return charge, mult
+    if get_ess_software(path) == 'gaussian':
+        # Stream the lines, since charge and multiplicity are near the beginning
+        with open_file(path) as f:
+            for line in f:
+                if 'charge' in line.lower() and 'multiplicity' in line.lower():
+                    items = line.strip().split()
+                    charge, mult = items[2], items[5]
+                    return charge, mult
         return
     else:
         raise NotImplementedError
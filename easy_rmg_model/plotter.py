@@ -18,7 +18,8 @@ def compare_thermo(entry_list: Union[list, tuple],
                    T_min: Union[int, float] = 300,
                    T_max: Union[int, float] = 2000,
                    legends: Optional[list] = None,
-                   size: Union[int, float] = 4.):
+                   size: Union[int, float] = 4.,
+                   save_path: Optional[str] = None):
     """
     Plot the Gibbs free energy of a common species from two different library entries
 
@@ -31,6 +32,7 @@ def compare_thermo(entry_list: Union[list, tuple],
         T_max (num): The upper bound of temperature range being plotted.
         legends (list): A list of legends used in the graph.
         size (num): The size of the graph being plotted.
+        save_path (str): The path to save the figure. The figure is shown if not assigned.
     """
     if T_min >= T_max:
         raise ValueError(f'Invalid T_min({T_min}) and T_max({T_max}) arguments')
@@ -112,4 +114,8 @@ def compare_thermo(entry_list: Union[list, tuple],
     legends[reference_entry] += ' (ref)'
     axes[0].legend(legends)
     plt.tight_layout()
-    plt.show()
+    if save_path:
+        fig.savefig(save_path)
+        plt.close(fig)
+    else:
+        plt.show()
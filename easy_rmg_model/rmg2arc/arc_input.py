@@ -6,15 +6,17 @@ The toolbox for works related to ARC input files
 
 from typing import Optional, Union
 
-from arc.common import read_yaml_file
+from easy_rmg_model.common import read_yaml_file
 
-from easy_rmg_model.rmg2arc.species_dict import (expand_spc_info_by_spc_dict,
+from easy_rmg_model.rmg2arc.species_dict import (SpeciesIndex,
+                                                 expand_spc_info_by_spc_dict,
                                                  find_species_from_spc_dict,
                                                  spc_dict_from_spc_info)
 
 
 def combine_spc_infos(*spc_infos: Union[list, tuple],
-                      resonance: bool = True
+                      resonance: bool = True,
+                      lazy_resonance: bool = True,
                       ) -> list:
     """
     Combine species lists used in ARC input files
@@ -22,6 +24,8 @@ def combine_spc_infos(*spc_infos: Union[list, tuple],
     Args:
         spc_infos (list): Many pieces of species info.
         resonance (bool): Generate resonance structures when checking isomorphism.
+        lazy_resonance (bool): Only generate resonance structures for the species with the same
+                               formula and multiplicity as a species that doesn't match directly.
 
     Returns:
         dict: A species info combined from each pieces
@@ -29,14 +33,17 @@ def combine_spc_infos(*spc_infos: Union[list, tuple],
     base_spc_info = spc_infos[0]
     if len(spc_infos) == 1:
         raise ValueError('Only one species info is provided.')
-    spc_dict = spc_dict_from_spc_info(base_spc_info, resonance=resonance)
+    spc_dict = spc_dict_from_spc_info(base_spc_info,
+                                      resonance=resonance,
+                                      lazy_resonance=lazy_resonance)
     base_spc_info = expand_spc_info_by_spc_dict(base_spc_info, spc_dict)
 
     # Compare each spc_list to base list
     for spc_info in spc_infos[1:]:
         base_spc_info = combine_spc_info(base_spc_info,
                                          spc_info,
-                                         spc_dict)
+                                         spc_dict,
+                                         resonance=resonance)
     return base_spc_info
 
 
@@ -44,7 +51,8 @@ def combine_spc_info(spc_info1: dict,
                      spc_info2: dict,
                      spc_dict: Optional[dict] = None,
                      resonance: bool = True,
-                    ) -> dict:
+                     lazy_resonance: bool = True,
+                     ) -> dict:
     """
     Combine two spc_infos. The major challenges are smiles and adjacency list are not unique, though
     comparing them are relatively cheap, while isomorphism comparison is unique but expensive. This module
@@ -55,15 +63,26 @@ def combine_spc_info(spc_info1: dict,
         spc_info1 (dict): The first piece of species info.
         spc_info2 (dict): The second piece of species info.
         spc_dict (Optional[dict]): You can provide a species dictionary to avoid repeated generating
-                                   Species instance.
+                                   Species instance. A ``SpeciesIndex`` is the fastest to search.
         resonance (bool): Generate resonance structures when checking isomorphism.
+        lazy_resonance (bool): Only generate resonance structures when needed. It only takes effect
+                               if ``spc_dict`` is not provided or is a ``SpeciesIndex``, since a plain
+                               dict is searched with the resonance structures generated up front.
 
     Returns:
         dict: The combined species info
     """
 
-    if not spc_dict:
-        spc_dict = spc_dict_from_spc_info(spc_info1)
+    # Species added to a plain dict need the resonance structures up front
+    lazy_resonance = lazy_resonance and (spc_dict is None or isinstance(spc_dict, SpeciesIndex))
+    if spc_dict is None:
+        spc_dict = spc_dict_from_spc_info(spc_info1,
+                                          resonance=resonance,
+                                          lazy_resonance=lazy_resonance)
+    elif not spc_dict:
+        spc_dict.update(spc_dict_from_spc_info(spc_info1,
+                                               resonance=resonance,
+                                               lazy_resonance=lazy_resonance))
     else:
         # spc_info1 should be consistent with spc_dict
         bad_items = {}
@@ -84,7 +103,8 @@ def combine_spc_info(spc_info1: dict,
                     else:
                         # if spc_info1 contains new species, append it
                         spc_dict.update(spc_dict_from_spc_info({label: spc1},
-                                                               resonance=resonance))
+                                                               resonance=resonance,
+                                                               lazy_resonance=lazy_resonance))
         # remove bad_items
         for label_in_info1, label_in_dict in bad_items.items():
             if label_in_dict:
@@ -123,19 +143,23 @@ def combine_spc_info(spc_info1: dict,
         if not dict_label:
             # This is a new species
             combined_spc_info[label] = spc2
-            spc_dict.update(spc_dict_from_spc_info({label: spc2}, resonance=resonance))
+            spc_dict.update(spc_dict_from_spc_info({label: spc2},
+                                                   resonance=resonance,
+                                                   lazy_resonance=lazy_resonance))
 
     return combined_spc_info
 
 
 def combine_arc_species_inputs(*inputs: Union[list, tuple],
-                               resonance: bool = True):
+                               resonance: bool = True,
+                               lazy_resonance: bool = True):
     """
     Combine the ARC species sections.
 
     Args:
         inputs: input files, either path or the actual ``dict``.
         resonance (bool): Generate resonance structures when checking isomorphism.
+        lazy_resonance (bool): Only generate resonance structures when needed.
 
     Returns:
         dict: A dict contains combined species section.
@@ -154,7 +178,9 @@ def combine_arc_species_inputs(*inputs: Union[list, tuple],
         print(f'No.{index} input contains {len(input_file["species"])} species')
         spc_infos.append({spc['label']: spc for spc in input_file['species']})
 
-    combined_spc_info = combine_spc_infos(*spc_infos, resonance=resonance)
+    combined_spc_info = combine_spc_infos(*spc_infos,
+                                          resonance=resonance,
+                                          lazy_resonance=lazy_resonance)
 
     print(f'The combined input contains {len(combined_spc_info)} species')
 
@@ -4,6 +4,11 @@
 The toolbox for works related chemkin files
 """
 
+import re
+
+# The comment of the reaction indices in RMG generated chemkin files
+REACTION_INDEX_PATTERN = re.compile(r'Reaction index: Chemkin #(\d+); RMG #(-?\d+)')
+
 
 def get_species_aliases(chemkin_path: str, key: str = 'rmg'):
     """
@@ -38,3 +43,34 @@ def get_species_aliases(chemkin_path: str, key: str = 'rmg'):
         spc_aliases = {chemkin_name: rmg_name for rmg_name,
                        chemkin_name in spc_aliases.items()}
     return spc_aliases
+
+
+def get_reaction_indices(chemkin_path: str) -> dict:
+    """
+    Get the indices of the reactions from RMG generated (annotated) chemkin file, based
+    on the comments like ``! Reaction index: Chemkin #1; RMG #10``.
+
+    Args:
+        chemkin_path (str): The path to Chemkin file.
+
+    Returns:
+        dict: Keys are Chemkin indices, values are dicts with ``rmg_index`` and ``equation``.
+    """
+    reactions = {}
+    index = None
+
+    with open(chemkin_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('!'):
+                match = REACTION_INDEX_PATTERN.search(line)
+                if match:
+                    index = int(match.group(1))
+                    reactions[index] = {'rmg_index': int(match.group(2)),
+                                        'equation': ''}
+            elif line and index is not None:
+                # The first line after the comments is the reaction and its Arrhenius parameters
+                tokens = line.split('!')[0].split()
+                reactions[index]['equation'] = ' '.join(tokens[:-3]) if len(tokens) > 3 else tokens[0]
+                index = None
+    return reactions
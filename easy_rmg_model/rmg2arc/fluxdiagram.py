@@ -6,10 +6,10 @@ The toolbox for flux diagram related tasks
 
 import os
 
-import pydot
+from easy_rmg_model.common import walk_dir
 
 
-def find_flux_diagrams(path, avoid_repeats=True):
+def find_flux_diagrams(path, avoid_repeats=True, prune=None):
     """
     Find all of the flux diagrams in the given directory. Flux diagrams under 
     the same folder have the same species if generated from RMG or RMS.
@@ -17,6 +17,7 @@ def find_flux_diagrams(path, avoid_repeats=True):
     Args:
         path (str): The path from where to find flux diagrams based on '.dot file
         avoid_repeats (bool): Whether to avoid the repeats. 
+        prune: The sub-directories to be skipped. See ``easy_rmg_model.common.walk_dir``.
 
     Returns:
         list: A list of paths to flux diagram dot files.
@@ -25,7 +26,7 @@ def find_flux_diagrams(path, avoid_repeats=True):
         raise ValueError(f'Not a invalid path ({path}), need to be a dir path.')
 
     flux_diagrams=[]
-    for root, _, files in os.walk(path):
+    for root, _, files in walk_dir(path, prune=prune):
         for file in files:
             if file.endswith('.dot'):
                 if avoid_repeats:
@@ -68,6 +69,8 @@ def get_spc_label_from_fluxdiagram(path):
     Returns:
         label_list (list): A list which contains species labels
     """
+    import pydot
+
     # Read the .dot file to graph
     graph = pydot.graph_from_dot_file(path)
     # Extract the node list
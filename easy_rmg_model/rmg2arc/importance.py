@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+The toolbox for scoring the importance of species across simulation conditions,
+combining sensitivity analyses and flux diagrams. The results of each source are loaded
+as a matrix (conditions x species), normalized per condition and aggregated over the
+conditions, so that species can be selected by a single top-K over the combined score.
+"""
+
+import os
+import re
+from typing import Optional, Union
+
+from easy_rmg_model.rmg2arc.sensitivity import read_sensitivity
+
+# The methods to aggregate the scores over conditions
+AGGREGATIONS = ('max', 'mean', 'weighted')
+
+# The folder names of the conditions, e.g., ``1000.0_10.0_1.0`` for T, P and phi
+CONDITION_PATTERN = re.compile(r'^([-+.\deE]+)_([-+.\deE]+)_([-+.\deE]+)$')
+
+
+def get_condition_from_path(path: str) -> Union[tuple, str]:
+    """
+    Get the condition of a result from its path, based on the ``{T}_{P}_{phi}``
+    folders created by ``runSensAndFlux``.
+
+    Args:
+        path (str): The path to the result file or its folder.
+
+    Returns:
+        Union[tuple, str]: The condition as (T, P, phi). The name of the folder
+                           if the path doesn't contain a condition folder.
+    """
+    path = os.path.abspath(path)
+    parts = path.split(os.sep)
+    for part in reversed(parts):
+        match = CONDITION_PATTERN.match(part)
+        if match:
+            try:
+                return tuple(float(value) for value in match.groups())
+            except ValueError:
+                continue
+    return os.path.basename(os.path.dirname(path))
+
+
+def _build_matrix(results: list, aliases: Optional[dict] = None) -> tuple:
+    """
+    Build the score matrix from the results of the files. The results of the same
+    condition are combined by the maximum.
+
+    Args:
+        results (list): Tuples of (condition, {label: score}).
+        aliases (Optional[dict]): Convert the labels, e.g., from Chemkin labels to RMG labels.
+
+    Returns:
+        tuple: The labels, the conditions and the matrix (conditions x labels).
+    """
+    import numpy as np
+
+    conditions, labels = {}, {}
+    rows, cols, values = [], [], []
+    for condition, scores in results:
+        row = conditions.setdefault(condition, len(conditions))
+        for label, score in scores.items():
+            if aliases:
+                label = aliases.get(label, label)
+            rows.append(row)
+            cols.append(labels.setdefault(label, len(labels)))
+            values.append(score)
+    matrix = np.zeros((len(conditions), len(labels)))
+    # Unbuffered maximum handles the repeated (condition, label) pairs
+    np.maximum.at(matrix, (np.array(rows, dtype=int), np.array(cols, dtype=int)),
+                  np.abs(np.array(values, dtype=float)))
+    return list(labels), list(conditions), matrix
+
+
+def get_spc_flux_weights(file: str) -> dict:
+    """
+    Get the flux weights of the species in a flux diagram. The weight of a species is the
+    largest pen width of its edges, which RMG scales with the log of the flux.
+
+    Args:
+        file (str): The path to the flux diagram dot file.
+
+    Returns:
+        dict: Keys are species labels, values are the weights.
+    """
+    import pydot
+
+    graph = pydot.graph_from_dot_file(file)[0]
+    weights = {label.strip('"'): 0. for label in (node.get_name() for node in graph.get_node_list())
+               if label not in ['node', 'graph']}
+    for edge in graph.get_edge_list():
+        try:
+            width = float(str(edge.get_attributes().get('penwidth', 1.)).strip('"'))
+        except ValueError:
+            width = 1.
+        for label in [edge.get_source(), edge.get_destination()]:
+            label = str(label).strip('"')
+            weights[label] = max(weights.get(label, 0.), width)
+    return weights
+
+
+def load_sensitivity_matrices(files: Union[str, list],
+                              aliases: Optional[dict] = None,
+                              ) -> tuple:
+    """
+    Load the sensitivities of the species and the reactions from many sensitivity
+    analyses. Each file is only read once.
+
+    Args:
+        files (Union[str, list]): The paths to the sensitivity analysis csv files.
+        aliases (Optional[dict]): Convert the species labels, e.g., from Chemkin labels to RMG labels.
+
+    Returns:
+        tuple: The species and the reaction results, each is a tuple of the labels (species labels
+               or reaction indices), the conditions and the matrix (conditions x labels), and
+               the reaction equations in the csv headers keyed by the reaction indices.
+    """
+    files = [files] if isinstance(files, str) else files
+    species, reactions, equations = [], [], {}
+    for file in files:
+        condition, sensitivity = get_condition_from_path(file), read_sensitivity(file)
+        species.append((condition, sensitivity['species']))
+        reactions.append((condition, {index: value for index, (_, value)
+                                      in sensitivity['reactions'].items()}))
+        for index, (equation, _) in sensitivity['reactions'].items():
+            equations.setdefault(index, equation)
+    return _build_matrix(species, aliases), _build_matrix(reactions), equations
+
+
+def load_sensitivity_scores(files: Union[str, list],
+                            aliases: Optional[dict] = None,
+                            ) -> tuple:
+    """
+    Load the thermo sensitivities of the species from many sensitivity analyses.
+
+    Args:
+        files (Union[str, list]): The paths to the sensitivity analysis csv files.
+        aliases (Optional[dict]): Convert the labels, e.g., from Chemkin labels to RMG labels.
+
+    Returns:
+        tuple: The labels, the conditions and the matrix (conditions x labels).
+    """
+    return load_sensitivity_matrices(files, aliases)[0]
+
+
+def load_flux_scores(files: Union[str, list],
+                     aliases: Optional[dict] = None,
+                     ) -> tuple:
+    """
+    Load the flux weights of the species from many flux diagrams.
+
+    Args:
+        files (Union[str, list]): The paths to the flux diagram dot files.
+        aliases (Optional[dict]): Convert the labels.
+
+    Returns:
+        tuple: The labels, the conditions and the matrix (conditions x labels).
+    """
+    files = [files] if isinstance(files, str) else files
+    return _build_matrix([(get_condition_from_path(file), get_spc_flux_weights(file))
+                          for file in files], aliases)
+
+
+def normalize_scores(matrix):
+    """
+    Normalize the scores of each condition by the largest one, so that each condition
+    contributes equally regardless of the magnitude of its sensitivities or fluxes.
+
+    Args:
+        matrix (np.ndarray): The scores (conditions x labels).
+
+    Returns:
+        np.ndarray: The normalized scores between 0 and 1.
+    """
+    import numpy as np
+
+    scale = matrix.max(axis=1, keepdims=True, initial=0.)
+    return np.divide(matrix, scale, out=np.zeros_like(matrix), where=scale > 0)
+
+
+def aggregate_scores(matrix,
+                     method: str = 'max',
+                     weights=None):
+    """
+    Aggregate the scores over the conditions.
+
+    Args:
+        matrix (np.ndarray): The scores (conditions x labels).
+        method (str): ``'max'``, ``'mean'`` or ``'weighted'`` (the weighted mean).
+        weights: The weights of the conditions, required by ``'weighted'``.
+
+    Returns:
+        np.ndarray: The score of each label.
+    """
+    import numpy as np
+
+    if method not in AGGREGATIONS:
+        raise ValueError(f'Invalid aggregation method ({method}), should be one of {AGGREGATIONS}.')
+    if not matrix.shape[0]:
+        return np.zeros(matrix.shape[1])
+    if method == 'max':
+        return matrix.max(axis=0)
+    elif method == 'mean':
+        return matrix.mean(axis=0)
+    if weights is None:
+        raise ValueError('The weights of the conditions are required by the weighted aggregation.')
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (matrix.shape[0],) or weights.sum() <= 0:
+        raise ValueError(f'Invalid weights ({weights.tolist()}) of {matrix.shape[0]} conditions.')
+    return weights @ matrix / weights.sum()
+
+
+def _get_condition_weights(conditions: list, condition_weights: Optional[dict]) -> Optional[list]:
+    """
+    Get the weights in the order of the conditions. Conditions not assigned have zero weight.
+    """
+    if condition_weights is None:
+        return
+    return [condition_weights.get(condition, 0.) for condition in conditions]
+
+
+def get_importance_scores(sensitivity_files: Union[str, list] = (),
+                          flux_files: Union[str, list] = (),
+                          aggregation: str = 'max',
+                          condition_weights: Optional[dict] = None,
+                          sensitivity_weight: float = 0.5,
+                          sensitivity_aliases: Optional[dict] = None,
+                          flux_aliases: Optional[dict] = None,
+                          sensitivity_scores: Optional[tuple] = None,
+                          ) -> dict:
+    """
+    Score the importance of the species across the conditions. The scores of each source are
+    normalized per condition and aggregated over the conditions, then combined by the weights
+    of the sources.
+
+    Args:
+        sensitivity_files (Union[str, list]): The paths to the sensitivity analysis csv files.
+        flux_files (Union[str, list]): The paths to the flux diagram dot files.
+        aggregation (str): The method to aggregate over the conditions. See ``aggregate_scores``.
+        condition_weights (Optional[dict]): Keys are conditions (see ``get_condition_from_path``),
+                                            values are weights, used by ``'weighted'``.
+        sensitivity_weight (float): The weight of the sensitivity score (0 to 1). The flux
+                                    score has the rest of the weight. If only one source is
+                                    provided, it has the full weight.
+        sensitivity_aliases (Optional[dict]): Convert the labels in the sensitivity analyses
+                                              (Chemkin labels) to the labels of the flux diagrams.
+        flux_aliases (Optional[dict]): Convert the labels in the flux diagrams.
+        sensitivity_scores (Optional[tuple]): The species sensitivities already loaded by
+                                              ``load_sensitivity_matrices``, used instead of
+                                              ``sensitivity_files``.
+
+    Returns:
+        dict: Keys are species labels, values are the scores between 0 and 1, in descending order.
+    """
+    import numpy as np
+
+    sources = []
+    if sensitivity_files or sensitivity_scores:
+        sources.append((sensitivity_scores or load_sensitivity_scores(sensitivity_files, sensitivity_aliases),
+                        sensitivity_weight if flux_files else 1.))
+    if flux_files:
+        sources.append((load_flux_scores(flux_files, flux_aliases),
+                        1. - sensitivity_weight if sources else 1.))
+
+    labels = {}
+    for (source_labels, _, _), _ in sources:
+        for label in source_labels:
+            labels.setdefault(label, len(labels))
+    scores = np.zeros(len(labels))
+    for (source_labels, conditions, matrix), weight in sources:
+        aggregated = aggregate_scores(normalize_scores(matrix),
+                                      method=aggregation,
+                                      weights=_get_condition_weights(conditions, condition_weights))
+        scores[[labels[label] for label in source_labels]] += weight * aggregated
+
+    order = np.argsort(-scores, kind='stable')
+    labels = list(labels)
+    return {labels[i]: float(scores[i]) for i in order}
+
+
+def get_reaction_scores(reaction_scores: tuple,
+                        aggregation: str = 'max',
+                        condition_weights: Optional[dict] = None,
+                        ) -> dict:
+    """
+    Score the importance of the reactions across the conditions by their sensitivities,
+    in the same way as ``get_importance_scores``.
+
+    Args:
+        reaction_scores (tuple): The reaction sensitivities loaded by ``load_sensitivity_matrices``.
+        aggregation (str): The method to aggregate over the conditions. See ``aggregate_scores``.
+        condition_weights (Optional[dict]): Keys are conditions, values are weights, used by ``'weighted'``.
+
+    Returns:
+        dict: Keys are reaction (Chemkin) indices, values are the scores between 0 and 1,
+              in descending order.
+    """
+    import numpy as np
+
+    indices, conditions, matrix = reaction_scores
+    scores = aggregate_scores(normalize_scores(matrix),
+                              method=aggregation,
+                              weights=_get_condition_weights(conditions, condition_weights))
+    return {indices[i]: float(scores[i]) for i in np.argsort(-scores, kind='stable')}
+
+
+def select_top_species(scores: dict,
+                       top_k: Optional[int] = None,
+                       min_score: float = 0.,
+                       ) -> list:
+    """
+    Select the most important species.
+
+    Args:
+        scores (dict): Keys are species labels, values are the scores.
+        top_k (Optional[int]): The number of species to select. All if not assigned.
+        min_score (float): Only select the species whose scores are larger than this value.
+
+    Returns:
+        list: The labels of the selected species, from the most important.
+    """
+    import numpy as np
+
+    if top_k is not None and top_k <= 0:
+        return []
+    labels = list(scores)
+    values = np.fromiter(scores.values(), dtype=float, count=len(labels))
+    candidates = np.flatnonzero(values > min_score)
+    if top_k is not None and top_k < candidates.shape[0]:
+        # Only sort the top-K
+        candidates = candidates[np.argpartition(-values[candidates], top_k - 1)[:top_k]]
+    candidates = candidates[np.argsort(-values[candidates], kind='stable')]
+    return [labels[i] for i in candidates]
@@ -5,10 +5,17 @@
 The toolbox for works related to RMG kinetics database
 """
 
+from __future__ import annotations
+
 import os
-from rmgpy.data.kinetics import KineticsDatabase, KineticsLibrary
-from typing import Optional
-from rmgpy import settings as rmg_settings
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from easy_rmg_model.instrumentation import count, timer
+
+# RMG is imported at first use to keep the scripts start fast
+if TYPE_CHECKING:
+    from rmgpy.data.kinetics import KineticsDatabase, KineticsLibrary
+    from rmgpy.reaction import Reaction
 
 def load_kinetics_database(libraries: Optional[list] = None):
     """
@@ -18,12 +25,16 @@ def load_kinetics_database(libraries: Optional[list] = None):
         libraries (Optional[list]): A list of libraries to be imported. All
                                     libraies will be imported if not assigned.
     """
+    from rmgpy import settings as rmg_settings
+    from rmgpy.data.kinetics import KineticsDatabase
+
     kinetics_db_path = os.path.join(rmg_settings['database.directory'], 'kinetics')
     kinetics_db = KineticsDatabase()
     kinetics_db.load(kinetics_db_path, libraries=libraries, families=[])
     kinetics_db.library_order = [(lib, 'Reaction Library') for lib in libraries]
     return kinetics_db
 
+
 def load_kinetics_lib_by_path(path: str,
                             kinetics_db: KineticsDatabase,
                             reload: bool = True):
@@ -36,6 +47,31 @@ def load_kinetics_lib_by_path(path: str,
         kinetics_database (KineticsDatabase): RMG kinetics database object
         reload (bool): Whether to reload the library if this library is in the KineticsDatabase
     """
+    lib = load_kinetics_lib(path)
+    if lib is None:
+        return
+    if path in kinetics_db.library_order and not reload:
+        print(f'The library {path} has already been loaded.')
+        return
+    elif path not in kinetics_db.library_order:
+        kinetics_db.library_order.append(path)
+    kinetics_db.libraries[lib.label] = lib
+    print(f'The kineticsdynamics library {path} is loaded.')
+
+
+def load_kinetics_lib(path: str) -> Optional[KineticsLibrary]:
+    """
+    Load a kinetics library given its path. The species dictionary
+    (``dictionary.txt``) should be in the same directory.
+
+    Args:
+        path (str): Path to kinetics library file (``reactions.py``).
+
+    Returns:
+        Optional[KineticsLibrary]: The library labeled by its path. ``None`` if the file is missing or invalid.
+    """
+    from rmgpy.data.kinetics import KineticsDatabase, KineticsLibrary
+
     lib = KineticsLibrary()
     try:
         lib.load(path,
@@ -43,16 +79,461 @@ def load_kinetics_lib_by_path(path: str,
                  KineticsDatabase().global_context)
     except FileNotFoundError:
         print(f'The library file {path} does not exist.')
+        return
     except (SyntaxError, ImportError):
         print(f'The library file {path} is not valid.')
-    else:
-        if path in kinetics_db.library_order and not reload:
-            print(f'The library {path} has already been loaded.')
-            return
-        elif path not in kinetics_db.library_order:
-            kinetics_db.library_order.append(path)
-        lib.label = path
-        lib.name = path
-        kinetics_db.libraries[lib.label] = lib
-        print(f'The kineticsdynamics library {path} is loaded.')
+        return
+    lib.label = path
+    lib.name = path
+    return lib
+
+
+def save_kinetics_lib(lib: KineticsLibrary, path: str):
+    """
+    Save a kinetics library. The species dictionary is saved in the same directory.
+
+    Args:
+        lib (KineticsLibrary): The kinetics library.
+        path (str): The path to the library file (``reactions.py``).
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    lib.save(path)
+    print(f'The kinetics library is saved to {path}.')
+
+
+
+# The policies to resolve a reaction found in both libraries with different kinetics
+MERGE_POLICIES = ('keep', 'replace', 'faster', 'slower', 'tbd', 'interactive')
+
+# The temperatures (K) used to compare kinetics by default
+DEFAULT_T_LIST = tuple(range(300, 2001, 100))
+
+
+def _get_species_identifier(species) -> tuple:
+    molecule = species.molecule[0] if hasattr(species, 'molecule') else species
+    # SMILES doesn't tell the multiplicity, e.g., of singlet and triplet CH2
+    try:
+        return molecule.to_smiles(), molecule.multiplicity
+    except Exception:
+        return molecule.to_adjacency_list(), molecule.multiplicity
+
+
+def get_reaction_key(reaction: Reaction) -> tuple:
+    """
+    Get the canonical key of a reaction, which is the sorted identifiers of the reactants
+    and the products. The key of the reverse reaction is the two parts swapped.
+
+    Args:
+        reaction (Reaction): The RMG reaction.
+
+    Returns:
+        tuple: The key as (reactant identifiers, product identifiers).
+    """
+    return (tuple(sorted(_get_species_identifier(spc) for spc in reaction.reactants)),
+            tuple(sorted(_get_species_identifier(spc) for spc in reaction.products)))
+
+
+def _get_reaction_bucket(reaction: Reaction) -> tuple:
+    """
+    Get the formulas of the reactants and the products, to bucket the reactions whose
+    keys may differ due to resonance.
+    """
+    def get_formulas(species_list):
+        return tuple(sorted((spc.molecule[0] if hasattr(spc, 'molecule') else spc).get_formula()
+                            for spc in species_list))
+    return get_formulas(reaction.reactants), get_formulas(reaction.products)
+
+
+class KineticsLibraryIndex(object):
+    """
+    An index of the reactions in kinetics libraries. Reactions are hashed by
+    ``get_reaction_key`` in both directions, so that duplicates and reverse duplicates are
+    found by lookups. Reactions not found by the keys are checked by isomorphism with the
+    reactions of the same formulas.
+
+    Args:
+        libraries (Iterable): The kinetics libraries to be indexed.
+    """
+
+    def __init__(self, libraries: Iterable = ()):
+        self._keys = {}  # key: [(library, entry)]
+        self._buckets = {}  # formulas: [(library, entry, reaction)]
+        for library in libraries:
+            self.add_library(library)
+
+    def add_library(self, library, label: Optional[str] = None):
+        """
+        Add the reactions of a library to the index.
+
+        Args:
+            library (KineticsLibrary): The kinetics library.
+            label (Optional[str]): The label of the library. Defaults to ``library.label``.
+        """
+        label = label or library.label
+        for entry_label, entry in library.entries.items():
+            self.add_reaction(label, entry_label, entry.item)
+
+    def add_reaction(self, library: str, entry_label: str, reaction: Reaction):
+        """
+        Add a reaction to the index.
+
+        Args:
+            library (str): The label of the library.
+            entry_label (str): The label of the entry in the library.
+            reaction (Reaction): The reaction.
+        """
+        self._keys.setdefault(get_reaction_key(reaction), []).append((library, entry_label))
+        self._buckets.setdefault(_get_reaction_bucket(reaction), []).append(
+            (library, entry_label, reaction))
+
+    def find(self,
+             reaction: Reaction,
+             isomorphism: bool = True,
+             ) -> list:
+        """
+        Find a reaction in the indexed libraries.
+
+        Args:
+            reaction (Reaction): The reaction.
+            isomorphism (bool): Whether to check the isomorphism if not found by the keys.
+
+        Returns:
+            list: The tuples of (library label, entry label, whether in the reverse direction).
+        """
+        reactants, products = get_reaction_key(reaction)
+        found = [(library, entry, False) for library, entry in self._keys.get((reactants, products), [])]
+        if reactants != products:
+            found += [(library, entry, True) for library, entry in self._keys.get((products, reactants), [])]
+        if found or not isomorphism:
+            return found
+
+        reactants, products = _get_reaction_bucket(reaction)
+        for formulas, reverse in [((reactants, products), False), ((products, reactants), True)]:
+            for library, entry_label, reaction_in_lib in self._buckets.get(formulas, []):
+                with timer('isomorphism'):
+                    if reverse:
+                        isomorphic = reaction.is_isomorphic(reaction_in_lib, either_direction=True) \
+                            and not reaction.is_isomorphic(reaction_in_lib, either_direction=False)
+                    else:
+                        isomorphic = reaction.is_isomorphic(reaction_in_lib, either_direction=False)
+                if isomorphic:
+                    found.append((library, entry_label, reverse))
+            if reactants == products:
+                break
+        return found
+
+
+def evaluate_kinetics(kinetics_list: list,
+                      T_list: Iterable = DEFAULT_T_LIST,
+                      P: float = 1e5,
+                      ):
+    """
+    Evaluate the rate coefficients of many kinetics at the temperatures. Arrhenius
+    kinetics are evaluated in vectorized form, others (e.g., pressure dependent
+    kinetics) one by one.
+
+    Args:
+        kinetics_list (list): The RMG kinetics or entries.
+        T_list (Iterable): The temperatures in K.
+        P (float): The pressure in Pa for the pressure dependent kinetics.
+
+    Returns:
+        np.ndarray: log10 of the rate coefficients (SI units), in the shape of
+                    (number of kinetics, number of temperatures). ``NaN`` if not available.
+    """
+    import numpy as np
+
+    R = 8.314462618  # J/mol/K
+    T = np.asarray(list(T_list), dtype=float)
+    kinetics_list = [getattr(kinetics, 'data', kinetics) for kinetics in kinetics_list]
+    log_k = np.full((len(kinetics_list), T.shape[0]), np.nan)
+
+    arrhenius, others = [], []
+    for i, kinetics in enumerate(kinetics_list):
+        if type(kinetics).__name__ == 'Arrhenius':
+            arrhenius.append(i)
+        elif kinetics is not None:
+            others.append(i)
+
+    if arrhenius:
+        params = np.array([[kinetics_list[i].A.value_si, kinetics_list[i].n.value_si,
+                            kinetics_list[i].Ea.value_si, kinetics_list[i].T0.value_si]
+                           for i in arrhenius])
+        A, n, Ea, T0 = (params[:, j:j + 1] for j in range(4))
+        with np.errstate(all='ignore'):
+            log_k[arrhenius] = (np.log(A) + n * np.log(T / T0) - Ea / (R * T)) / np.log(10)
+
+    for i in others:
+        for j, temperature in enumerate(T):
+            try:
+                k = kinetics_list[i].get_rate_coefficient(temperature, P)
+            except (ValueError, AttributeError, TypeError):
+                continue
+            if k > 0:
+                log_k[i, j] = np.log10(k)
+    return log_k
+
+
+def _sum_log_k(log_k, sizes: list):
+    """
+    Sum the rate coefficients of the consecutive groups of kinetics, e.g., of the reactions
+    flagged as DUPLICATE.
+
+    Args:
+        log_k (np.ndarray): log10 of the rate coefficients by ``evaluate_kinetics``.
+        sizes (list): The number of kinetics in each group.
+
+    Returns:
+        np.ndarray: log10 of the summed rate coefficients, in the shape of
+                    (number of groups, number of temperatures). ``NaN`` if any is not available.
+    """
+    import numpy as np
+
+    if not sizes:
+        return log_k[:0]
+    with np.errstate(divide='ignore'):
+        return np.log10(np.add.reduceat(10 ** log_k, np.cumsum([0] + sizes[:-1]), axis=0))
+
+
+def _unify_species(reaction: Reaction, species_map: dict, labels: dict):
+    """
+    Use the species already in the merged library for the reactants and products, and
+    relabel the new species whose labels are taken by other species.
+
+    Args:
+        reaction (Reaction): The reaction to be added.
+        species_map (dict): Keys are species identifiers, values are the species in the library.
+        labels (dict): Keys are species labels, values are the species identifiers.
+    """
+    for attr in ['reactants', 'products']:
+        species_list = getattr(reaction, attr)
+        for i, spc in enumerate(species_list):
+            identifier = _get_species_identifier(spc)
+            if identifier in species_map:
+                species_list[i] = species_map[identifier]
+                continue
+            label, index = spc.label, 1
+            while labels.get(label, identifier) != identifier:
+                label, index = f'{spc.label}-{index}', index + 1
+            spc.label = label
+            species_map[identifier], labels[label] = spc, identifier
+
+
+# The answers to the interactive decisions and the corresponding policies
+MERGE_DECISIONS = {'a': 'replace', 'add': 'replace',
+                   'r': 'keep', 'reject': 'keep',
+                   't': 'tbd', 'tbd': 'tbd'}
+
+
+def _ask_merge_decision() -> str:
+    while True:
+        decision = input("add?(A)/ reject?(R) / TBD? (T):").strip().lower()
+        if decision in MERGE_DECISIONS:
+            return MERGE_DECISIONS[decision]
+
+
+def merge_kinetics_lib(base_lib: KineticsLibrary,
+                       lib_to_add: KineticsLibrary,
+                       tbd_lib: Optional[KineticsLibrary] = None,
+                       policy: str = 'keep',
+                       tolerance: float = 0.1,
+                       T_list: Iterable = DEFAULT_T_LIST,
+                       P: float = 1e5,
+                       index: Optional[KineticsLibraryIndex] = None,
+                       ) -> list:
+    """
+    Merge one kinetics library (lib_to_add) into the base library. New reactions are added.
+    A reaction already in the base library (in either direction) is skipped if the rate
+    coefficients agree within the tolerance, otherwise the conflict is resolved by the policy.
+    The entries and species of ``lib_to_add`` are moved into the base library instead of copied.
+    Reactions flagged as DUPLICATE are compared by their summed rate coefficients and
+    resolved together with all their matches in the base library.
+
+    Args:
+        base_lib (KineticsLibrary): The library used as the base.
+        lib_to_add (KineticsLibrary): The library to be added to the base library.
+        tbd_lib (Optional[KineticsLibrary]): The library to collect the conflicts to be decided
+                                             later, for the ``'tbd'`` policy.
+        policy (str): How to resolve the conflicts, one of ``MERGE_POLICIES``. ``'keep'`` keeps the
+                      base kinetics, ``'replace'`` uses the new kinetics, ``'faster'`` and ``'slower'``
+                      use the one with the higher and lower mean rate coefficients, ``'tbd'``
+                      moves the new entry to ``tbd_lib`` and ``'interactive'`` asks for decisions.
+                      Reverse duplicates can't be compared without thermo, so they are
+                      only replaced by ``'replace'`` and ``'interactive'``.
+        tolerance (float): The allowed max difference of log10(k) over the temperatures.
+        T_list (Iterable): The temperatures (K) to compare the rate coefficients.
+        P (float): The pressure (Pa) to compare the rate coefficients.
+        index (Optional[KineticsLibraryIndex]): The index of the base library, which can be
+                                                reused when merging many libraries.
+
+    Returns:
+        list: The report of each reaction in ``lib_to_add`` as a dict with ``label``, ``base_label``,
+              ``reverse``, ``dlog10k`` (the max difference of log10(k)) and ``action`` (``'added'``,
+              ``'duplicate'``, ``'kept'``, ``'replaced'`` or ``'tbd'``). ``base_label`` joins
+              the labels of all the matched base entries by commas.
+    """
+    import numpy as np
+
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f'Invalid policy ({policy}), should be one of {MERGE_POLICIES}.')
+    if policy == 'tbd' and tbd_lib is None:
+        raise ValueError('The tbd_lib is required for the "tbd" policy.')
+    index = index or KineticsLibraryIndex([base_lib])
+
+    # Find the duplicates of all reactions before comparing their kinetics together.
+    # Reactions flagged as DUPLICATE have summed kinetics, so they are compared and
+    # resolved as a group against all the matches in the base library.
+    with timer('kinetics.find_duplicates'):
+        new_labels, duplicates, groups = [], [], {}
+        for label, entry in lib_to_add.entries.items():
+            # The index may have the entries replaced in previous merges
+            found = [match for match in index.find(entry.item)
+                     if match[0] == base_lib.label and match[1] in base_lib.entries]
+            if not found:
+                new_labels.append(label)
+                continue
+            reverse = found[0][2]
+            base_labels = sorted({base_label for _, base_label, rev in found if rev == reverse})
+            key = (tuple(base_labels), reverse)
+            if entry.item.duplicate and key in groups:
+                groups[key][0].append(label)
+                continue
+            duplicates.append(([label], base_labels, reverse))
+            if entry.item.duplicate:
+                groups[key] = duplicates[-1]
+        count('kinetics.duplicates', len(duplicates))
+
+    T_list = list(T_list)
+    with timer('kinetics.compare'):
+        log_k_new = _sum_log_k(evaluate_kinetics([lib_to_add.entries[label] for labels, _, _ in duplicates
+                                                  for label in labels], T_list, P),
+                               [len(labels) for labels, _, _ in duplicates])
+        log_k_base = _sum_log_k(evaluate_kinetics([base_lib.entries[label] for _, labels, _ in duplicates
+                                                   for label in labels], T_list, P),
+                                [len(labels) for _, labels, _ in duplicates])
+        diffs = log_k_new - log_k_base
+        valid = ~np.isnan(diffs)
+        # NaN if the kinetics can't be compared at any temperature
+        max_diffs = np.fmax.reduce(np.abs(diffs), axis=1)
+        mean_diffs = np.where(valid.any(axis=1),
+                              np.nansum(diffs, axis=1) / np.maximum(valid.sum(axis=1), 1),
+                              np.nan)
+
+    species_map, species_labels = {}, {}
+    for entry in base_lib.entries.values():
+        _unify_species(entry.item, species_map, species_labels)
+    next_index = max((entry.index for entry in base_lib.entries.values()), default=0) + 1
+
+    def add_entry(lib, entry, next_index):
+        _unify_species(entry.item, species_map, species_labels)
+        entry.index = next_index
+        lib.entries[f'{next_index:d}:{entry.label}'] = entry
+        return next_index + 1
+
+    report = []
+    for label in new_labels:
+        entry = lib_to_add.entries[label]
+        next_index = add_entry(base_lib, entry, next_index)
+        index.add_reaction(base_lib.label, f'{entry.index:d}:{entry.label}', entry.item)
+        report.append({'label': label, 'base_label': None, 'reverse': False,
+                       'dlog10k': np.nan, 'action': 'added'})
+
+    for (labels, base_labels, reverse), max_diff, mean_diff \
+            in zip(duplicates, max_diffs, mean_diffs):
+        if any(base_label not in base_lib.entries for base_label in base_labels):
+            # Replaced by a reaction in the reverse direction earlier in this merge
+            action = 'kept'
+        elif not reverse and max_diff <= tolerance:
+            action = 'duplicate'
+        else:
+            entries = [lib_to_add.entries[label] for label in labels]
+            base_entries = [base_lib.entries[base_label] for base_label in base_labels]
+            decision = policy
+            if policy in ['faster', 'slower']:
+                if reverse or np.isnan(mean_diff):
+                    decision = 'keep'
+                else:
+                    decision = 'replace' if (mean_diff > 0) == (policy == 'faster') else 'keep'
+            elif policy == 'interactive':
+                print(f'{", ".join(entry.label for entry in entries)} ({lib_to_add.label}) vs '
+                      f'{", ".join(entry.label for entry in base_entries)} ({base_lib.label})'
+                      f'{" in the reverse direction" if reverse else ""}: '
+                      f'max difference of log10(k) is {max_diff:.2f}')
+                decision = _ask_merge_decision()
+            if decision == 'replace':
+                if not reverse and len(entries) == len(base_entries) == 1:
+                    base_entries[0].data = entries[0].data
+                else:
+                    # Replace the whole group, reusing the indices of the base entries
+                    indices = sorted(base_entry.index for base_entry in base_entries)
+                    for base_label in base_labels:
+                        del base_lib.entries[base_label]
+                    for entry in entries:
+                        if indices:
+                            add_entry(base_lib, entry, indices.pop(0))
+                        else:
+                            next_index = add_entry(base_lib, entry, next_index)
+                        index.add_reaction(base_lib.label, f'{entry.index:d}:{entry.label}', entry.item)
+                action = 'replaced'
+            elif decision == 'tbd':
+                tbd_index = max((e.index for e in tbd_lib.entries.values()), default=0) + 1
+                for entry in entries:
+                    entry.index = tbd_index
+                    tbd_lib.entries[f'{tbd_index:d}:{entry.label}'] = entry
+                    tbd_index += 1
+                action = 'tbd'
+            else:
+                action = 'kept'
+        for label in labels:
+            report.append({'label': label, 'base_label': ', '.join(base_labels), 'reverse': reverse,
+                           'dlog10k': float(max_diff), 'action': action})
+
+    actions = [item['action'] for item in report]
+    print(f'Merged {lib_to_add.label} into {base_lib.label}: '
+          + ', '.join(f'{actions.count(action)} {action}'
+                      for action in ['added', 'duplicate', 'kept', 'replaced', 'tbd']))
+    return report
+
+
+def merge_kinetics_libs(paths: Iterable,
+                        output: str,
+                        policy: str = 'keep',
+                        tolerance: float = 0.1,
+                        T_list: Iterable = DEFAULT_T_LIST,
+                        P: float = 1e5,
+                        ) -> list:
+    """
+    Merge many kinetics libraries into one in the order of ``paths`` and save it. The conflicts
+    deferred by the ``'tbd'`` policy are saved as a separate library under ``output/tbd``.
+
+    Args:
+        paths (Iterable): The paths to the kinetics library files. The first one is the base.
+        output (str): The directory to save the merged library.
+        policy (str): How to resolve the conflicts. See ``merge_kinetics_lib``.
+        tolerance (float): The allowed max difference of log10(k) over the temperatures.
+        T_list (Iterable): The temperatures (K) to compare the rate coefficients.
+        P (float): The pressure (Pa) to compare the rate coefficients.
+
+    Returns:
+        list: The reports of ``merge_kinetics_lib`` with the ``library`` of each reaction.
+    """
+    from rmgpy.data.kinetics import KineticsLibrary
+
+    libs = [lib for lib in (load_kinetics_lib(path) for path in paths) if lib is not None]
+    if not libs:
+        raise ValueError('No valid kinetics library is provided.')
+    base_lib = libs[0]
+    base_lib.label = base_lib.name = os.path.basename(os.path.abspath(output))
+    tbd_lib = KineticsLibrary(label='tbd', name='tbd')
+
+    index, report = KineticsLibraryIndex([base_lib]), []
+    for lib in libs[1:]:
+        for item in merge_kinetics_lib(base_lib, lib, tbd_lib=tbd_lib, policy=policy,
+                                       tolerance=tolerance, T_list=T_list, P=P, index=index):
+            item['library'] = lib.label
+            report.append(item)
 
+    save_kinetics_lib(base_lib, os.path.join(output, 'reactions.py'))
+    if tbd_lib.entries:
+        save_kinetics_lib(tbd_lib, os.path.join(output, 'tbd', 'reactions.py'))
+    return report
@@ -6,12 +6,14 @@ The toolbox for sensitivity analysis related tasks
 
 
 import os
-from typing import Union
-
-import pandas as pd
+import re
+from typing import Optional, Union
 
 from easy_rmg_model.common import get_files_by_regex
 
+# The headers of reaction sensitivities, e.g., ``dln[OH(4)]/dln[k12]: H(3)+O2(2)<=>O(5)+OH(4)``
+REACTION_HEADER_PATTERN = re.compile(r'/dln\[k(\d+)\]:?\s*(.*)$')
+
 
 def find_sensitivity_results(path: str) -> list:
     """
@@ -33,30 +35,49 @@ def find_sensitivity_results(path: str) -> list:
     return sensitivities
 
 
-def get_spc_label_from_sensitivity(file: str, N: int = 50) -> list:
+def read_sensitivity(file: str) -> dict:
     """
-    Get the list of species contained in multiple sensitivity analysis
+    Read the maximum absolute sensitivities of the species (``dG`` columns) and the
+    reactions (``dln[k...]`` columns) in a sensitivity analysis, in a single pass.
 
     Args:
         file (str): a sensitivity analysis csv file
-        N (int): the upperbound number of species to be extracted
 
     Returns:
-        list: a list contains species labels
+        dict: ``species`` maps species labels to the sensitivities, ``reactions`` maps the
+              reaction indices (Chemkin indices in RMG results) to tuples of
+              (equation, sensitivity). Both are in descending order of the sensitivities.
     """
+    import pandas as pd
+
     # Open the sensitivity result in DataFrame
     df = pd.read_csv(file)
+    # The maximum absolute values of all columns at once
+    max_values = df.abs().max(axis=0, skipna=True).fillna(0.)
+
+    species, reactions = {}, {}
+    for header, value in max_values.items():
+        match = REACTION_HEADER_PATTERN.search(header)
+        if match:
+            reactions[int(match.group(1))] = (match.group(2).strip(), float(value))
+        elif 'dG' in header:
+            species[header.split('dG')[1][1:-1]] = float(value)
+    return {'species': dict(sorted(species.items(), key=lambda item: item[1], reverse=True)),
+            'reactions': dict(sorted(reactions.items(), key=lambda item: item[1][1], reverse=True))}
 
-    # Find the most sensitve species
-    max_sensitivity = []
-    for header in df.columns:
-        if 'dG' in header:
-            label = header.split('dG')[1][1:-1]
-            max_sensitivity.append((label, abs(df[header]).max()))
-    sorted_labels = sorted(max_sensitivity, key=lambda tup: tup[1])
 
-    label_list = [tup[0] for tup in sorted_labels[:min(len(sorted_labels), N)]]
-    return label_list
+def get_spc_label_from_sensitivity(file: str, N: int = 50) -> list:
+    """
+    Get the list of species contained in multiple sensitivity analysis
+
+    Args:
+        file (str): a sensitivity analysis csv file
+        N (int): the upperbound number of species to be extracted
+
+    Returns:
+        list: a list contains species labels, from the most sensitive
+    """
+    return list(read_sensitivity(file)['species'])[:N]
 
 
 def get_spc_info_from_sensitivities(files: Union[str, list],
@@ -82,3 +103,42 @@ def get_spc_info_from_sensitivities(files: Union[str, list],
     # remove duplicates
     label_list = list(set(label_list))
     return {label: {'label': label} for label in label_list}
+
+
+def get_rxn_info_from_sensitivities(files: Union[str, list],
+                                    chemkin_path: Optional[str] = None,
+                                    N: int = 50) -> dict:
+    """
+    Get the most sensitive reactions in multiple sensitivity analysis, e.g., as the
+    candidates of TS calculations.
+
+    Args:
+        files (Union[str, list]): a list contains the paths of sensitivity
+                                  analysis csv files
+        chemkin_path (Optional[str]): The path to the annotated Chemkin file, used to
+                                      map the reactions to the RMG indices.
+        N (int): the upperbound number of reactions to be extracted in each SA
+
+    Returns:
+        dict: Keys are Chemkin indices, values are dicts with ``chemkin_index``, ``rmg_index``
+              (``None`` if not mapped), ``equation`` and ``sensitivity`` (the maximum in all SA),
+              in descending order of the sensitivities.
+    """
+    from easy_rmg_model.rmg2arc.chemkin import get_reaction_indices
+
+    if isinstance(files, str):
+        files = [files]
+    indices = get_reaction_indices(chemkin_path) if chemkin_path else {}
+
+    rxn_info = {}
+    for sa_file in files:
+        reactions = read_sensitivity(sa_file)['reactions']
+        for index, (equation, value) in list(reactions.items())[:N]:
+            if index in rxn_info:
+                rxn_info[index]['sensitivity'] = max(rxn_info[index]['sensitivity'], value)
+                continue
+            rxn_info[index] = {'chemkin_index': index,
+                               'rmg_index': indices.get(index, {}).get('rmg_index'),
+                               'equation': indices.get(index, {}).get('equation') or equation,
+                               'sensitivity': value}
+    return dict(sorted(rxn_info.items(), key=lambda item: item[1]['sensitivity'], reverse=True))
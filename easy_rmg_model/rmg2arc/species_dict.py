@@ -4,14 +4,18 @@
 The toolbox for species dictionary involved operations
 """
 
+from __future__ import annotations
+
 import os
-from typing import Optional, Union
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Optional, Union
 
-from rmgpy.chemkin import load_species_dictionary
-from rmgpy.molecule.molecule import Molecule
-from rmgpy.species import Species
+from easy_rmg_model.instrumentation import timed, timer
 
-from easy_rmg_model.species.converter import xyz_to_mol
+# RMG and the converters are imported at first use to keep the scripts start fast
+if TYPE_CHECKING:
+    from rmgpy.molecule.molecule import Molecule
+    from rmgpy.species import Species
 
 
 def load_spc_dict(spc_dict: Union[dict, str]) -> dict:
@@ -28,6 +32,7 @@ def load_spc_dict(spc_dict: Union[dict, str]) -> dict:
     if isinstance(spc_dict, dict):
         return spc_dict
     elif isinstance(spc_dict, str) and os.path.isfile(spc_dict):
+        from rmgpy.chemkin import load_species_dictionary
         return load_species_dictionary(spc_dict)
     else:
         raise ValueError(f'Invalid species dictionary {spc_dict}')
@@ -93,9 +98,13 @@ def find_species_from_spc_dict(spc: Union[dict, Species, Molecule],
     Returns:
         Optional[Species]: the species stored in the dictionary if match, ``None`` otherwise.
     """
+    from rmgpy.molecule.molecule import Molecule
+    from rmgpy.species import Species
+
     spc_dict = load_spc_dict(spc_dict)
 
-    if isinstance(spc, dict):
+    # Species info can be dicts or SpeciesRecord
+    if isinstance(spc, Mapping):
         if not 'label' in spc:
             raise ValueError('Invalid species info which should at least label info.')
         label = spc['label']
@@ -113,7 +122,7 @@ def find_species_from_spc_dict(spc: Union[dict, Species, Molecule],
             species = species_from_spc_info(spc, resonance=False)
             if not species:
                 raise ValueError('Invalid species info which has no geom info.')
-            if spc_dict[label].is_isomorphic(species):
+            if _is_isomorphic(spc_dict[label], species):
                 return label, spc_dict[label]
         else:
             species = species_from_spc_info(spc, resonance=False)
@@ -121,17 +130,30 @@ def find_species_from_spc_dict(spc: Union[dict, Species, Molecule],
     elif isinstance(spc, (Molecule, Species)):
         if hasattr(spc, 'label') and spc.label in spc_dict:
             if spc.to_smiles() == spc_dict[spc.label].molecule[0].to_smiles():
-                return label, spc_dict[spc.label]
-            if spc_dict[spc.label].is_isomorphic(spc):
-                return label, spc_dict[spc.label]
+                return spc.label, spc_dict[spc.label]
+            if _is_isomorphic(spc_dict[spc.label], spc):
+                return spc.label, spc_dict[spc.label]
         species = spc
 
-    for species_in_dict in spc_dict.values():
-            if species_in_dict.is_isomorphic(species):
-                return label, species_in_dict
+    if isinstance(spc_dict, SpeciesIndex):
+        dict_label = spc_dict.find(species)
+        return (dict_label, spc_dict[dict_label]) if dict_label else (None, None)
+
+    for dict_label, species_in_dict in spc_dict.items():
+        if _is_isomorphic(species_in_dict, species):
+            return dict_label, species_in_dict
     return None, None
 
 
+def _is_isomorphic(species1, species2) -> bool:
+    """
+    Check the isomorphism of two species, timed as ``isomorphism``.
+    """
+    with timer('isomorphism'):
+        return species1.is_isomorphic(species2)
+
+
+@timed('species.construct')
 def species_from_spc_info(spc: dict,
                           resonance: bool = True,
                           ) -> Optional[Species]:
@@ -145,36 +167,178 @@ def species_from_spc_info(spc: dict,
     Returns:
         Species: The Species instance from spc.
     """
+    from rmgpy.species import Species
+
     label = spc['label']
     if 'adjlist' in spc:
         return Species(label=label).from_adjacency_list(spc['adjlist'])
     elif 'smiles' in spc:
         return Species(label=label).from_smiles(spc['smiles'])
     elif 'xyz' in spc:
+        from easy_rmg_model.species.converter import xyz_to_mol
         species = Species(label=label)
-        species.set_structure(xyz_to_mol(spc['xyz']).to_smiles())
+        species.set_structure(xyz_to_mol(spc['xyz'], copy=False).to_smiles())
         return species
     # else: return None
     # TODO: Add warning
 
 
-def spc_dict_from_spc_info(spc_info: dict, resonance: bool = True) -> dict:
+def spc_dict_from_spc_info(spc_info: dict,
+                           resonance: bool = True,
+                           lazy_resonance: bool = False,
+                           ) -> dict:
     """
     Generate a species dictionary from species info.
 
     Args:
         spc_info (dict): Species info contains the label and species geom info.
         resonance (bool): Whether generate resonance geom in the species dictionary.
+        lazy_resonance (bool): Return a ``SpeciesIndex``, which only generates the resonance
+                               structures when needed for finding species.
 
     Returns:
         dict: The species dictionary generated from the spc_info.
     """
-    spc_dict = {}
+    spc_dict = SpeciesIndex(resonance=resonance) if lazy_resonance else {}
     for label, spc in spc_info.items():
         species = species_from_spc_info(spc)
         if not species:
             continue
-        if resonance:
+        if resonance and not lazy_resonance:
             species.generate_resonance_structures()
         spc_dict[label] = species
     return spc_dict
+
+
+class SpeciesIndex(dict):
+    """
+    A species dictionary (label: Species) indexed for finding species. The species are
+    bucketed by formula and multiplicity. A query is compared by the canonical SMILES and
+    the multiplicity first (SMILES doesn't tell, e.g., singlet and triplet CH2 apart), then
+    by isomorphism with the species in the same bucket. The resonance structures of
+    the species in the bucket are only generated if they don't match directly, and then
+    kept for the later queries.
+
+    Args:
+        spc_dict (Optional[dict]): The species to be indexed.
+        resonance (bool): Whether to compare resonance structures.
+    """
+
+    def __init__(self,
+                 spc_dict: Optional[dict] = None,
+                 resonance: bool = True):
+        super().__init__()
+        self.resonance = resonance
+        self._buckets = {}
+        self._identifiers = {}
+        # The identifiers owned by each label, so that deleting a species is cheap
+        self._label_identifiers = {}
+        self._resonance_generated = set()
+        if spc_dict:
+            self.update(spc_dict)
+
+    @staticmethod
+    def _get_bucket_key(species) -> tuple:
+        return species.molecule[0].get_formula(), species.molecule[0].multiplicity
+
+    @staticmethod
+    def _get_identifier(molecule) -> Optional[tuple]:
+        try:
+            return molecule.to_smiles(), molecule.multiplicity
+        except Exception:
+            return
+
+    def _add_identifier(self, identifier: Optional[tuple], label: str):
+        if identifier and identifier not in self._identifiers:
+            self._identifiers[identifier] = label
+            self._label_identifiers.setdefault(label, []).append(identifier)
+
+    def __setitem__(self, label, species):
+        if label in self:
+            del self[label]
+        super().__setitem__(label, species)
+        self._buckets.setdefault(self._get_bucket_key(species), []).append(label)
+        self._add_identifier(self._get_identifier(species.molecule[0]), label)
+        if len(species.molecule) > 1:
+            self._resonance_generated.add(label)
+
+    def __delitem__(self, label):
+        species = self[label]
+        super().__delitem__(label)
+        self._buckets[self._get_bucket_key(species)].remove(label)
+        for identifier in self._label_identifiers.pop(label, []):
+            del self._identifiers[identifier]
+        self._resonance_generated.discard(label)
+
+    def update(self, *args, **kwargs):
+        for label, species in dict(*args, **kwargs).items():
+            self[label] = species
+
+    def setdefault(self, label, species=None):
+        if label not in self:
+            self[label] = species
+        return self[label]
+
+    def pop(self, label, *args):
+        if label not in self:
+            if args:
+                return args[0]
+            raise KeyError(label)
+        species = self[label]
+        del self[label]
+        return species
+
+    def popitem(self):
+        label = next(reversed(self.keys()))
+        return label, self.pop(label)
+
+    def clear(self):
+        super().clear()
+        self._buckets.clear()
+        self._identifiers.clear()
+        self._label_identifiers.clear()
+        self._resonance_generated.clear()
+
+    def _generate_resonance_structures(self, label: str):
+        if label in self._resonance_generated:
+            return
+        with timer('resonance'):
+            try:
+                self[label].generate_resonance_structures()
+            except Exception:
+                pass
+        self._resonance_generated.add(label)
+        # Later queries of any resonance structure match by the identifiers
+        for molecule in self[label].molecule[1:]:
+            self._add_identifier(self._get_identifier(molecule), label)
+
+    def find(self, species) -> Optional[str]:
+        """
+        Find the label of a species in the dictionary.
+
+        Args:
+            species (Union[Species, Molecule]): The species to be found.
+
+        Returns:
+            Optional[str]: The label. ``None`` if not found.
+        """
+        if not hasattr(species, 'molecule'):
+            from rmgpy.species import Species
+            species = Species(molecule=[species])
+        identifier = self._get_identifier(species.molecule[0])
+        if identifier in self._identifiers:
+            return self._identifiers[identifier]
+        bucket = self._buckets.get(self._get_bucket_key(species))
+        if not bucket:
+            return
+        for label in bucket:
+            if _is_isomorphic(self[label], species):
+                return label
+        if not self.resonance:
+            return
+        for label in bucket:
+            if label in self._resonance_generated:
+                continue
+            self._generate_resonance_structures(label)
+            if _is_isomorphic(self[label], species):
+                return label
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+The toolbox for sweeping simulation conditions (T, P, phi)
+"""
+
+import itertools
+from typing import Callable, Optional, Union
+
+
+def get_coarse_indices(num: int, num_coarse: int = 3) -> list:
+    """
+    Get evenly spaced indices of a sorted condition list. Both ends
+    are always included.
+
+    Args:
+        num (int): The length of the condition list.
+        num_coarse (int): The number of indices to keep.
+
+    Returns:
+        list: The indices of the coarse grid.
+    """
+    num_coarse = max(num_coarse, 2)
+    if num <= num_coarse:
+        return list(range(num))
+    return sorted({round(i * (num - 1) / (num_coarse - 1))
+                   for i in range(num_coarse)})
+
+
+def is_ranking_changed(ranking1: list,
+                       ranking2: list,
+                       top_n: Optional[int] = None,
+                       threshold: float = 0.8,
+                       ) -> bool:
+    """
+    Check if the species ranking changes between two conditions. The rankings
+    are compared by the overlap (Jaccard index) of their top ``top_n`` species.
+
+    Args:
+        ranking1 (list): Species labels ranked from the most important.
+        ranking2 (list): Species labels ranked from the most important.
+        top_n (Optional[int]): Only compare the first ``top_n`` species.
+                               The whole ranking is used if not assigned.
+        threshold (float): The rankings are regarded as changed if the overlap
+                           is lower than this value.
+
+    Returns:
+        bool: ``True`` if the ranking changes.
+    """
+    set1, set2 = set(ranking1[:top_n]), set(ranking2[:top_n])
+    if not set1 and not set2:
+        return False
+    return len(set1 & set2) / len(set1 | set2) < threshold
+
+
+def _find_next_neighbor(index: tuple,
+                        axis: int,
+                        evaluated: Union[set, dict],
+                        ) -> Optional[tuple]:
+    """
+    Find the closest evaluated grid point along ``axis`` with a larger index.
+    """
+    neighbors = [other for other in evaluated
+                 if other[axis] > index[axis]
+                 and all(other[i] == index[i] for i in range(len(index)) if i != axis)]
+    if neighbors:
+        return min(neighbors, key=lambda other: other[axis])
+
+
+def refine_condition_grid(rankings: dict,
+                          axis_lengths: Union[list, tuple],
+                          top_n: Optional[int] = None,
+                          threshold: float = 0.8,
+                          ) -> set:
+    """
+    Find the grid points to be added. A midpoint is added between two neighboring
+    evaluated grid points if the species ranking changes between them and there
+    are unevaluated conditions in between.
+
+    Args:
+        rankings (dict): Keys are grid indices (tuple), values are species rankings.
+        axis_lengths (Union[list, tuple]): The number of conditions on each axis.
+        top_n (Optional[int]): Only compare the first ``top_n`` species.
+        threshold (float): The overlap below which the rankings are regarded as changed.
+
+    Returns:
+        set: The grid indices to be evaluated in the next round.
+    """
+    new_indices = set()
+    for index in rankings:
+        for axis in range(len(axis_lengths)):
+            neighbor = _find_next_neighbor(index, axis, rankings)
+            if not neighbor or neighbor[axis] - index[axis] < 2:
+                continue
+            if is_ranking_changed(rankings[index], rankings[neighbor],
+                                  top_n=top_n, threshold=threshold):
+                midpoint = list(index)
+                midpoint[axis] = (index[axis] + neighbor[axis]) // 2
+                new_indices.add(tuple(midpoint))
+    return new_indices - set(rankings)
+
+
+def adaptive_condition_sweep(Ts: list,
+                             Ps: list,
+                             phis: list,
+                             evaluate: Callable,
+                             num_coarse: int = 3,
+                             top_n: Optional[int] = None,
+                             threshold: float = 0.8,
+                             max_rounds: Optional[int] = None,
+                             ) -> dict:
+    """
+    Sweep the conditions adaptively. The sweep starts from a coarse grid of ``Ts``, ``Ps`` and
+    ``phis`` and only adds conditions where the species ranking changes between neighboring
+    conditions, until there is nothing to refine or ``max_rounds`` is reached.
+
+    Args:
+        Ts (list): The candidate temperatures.
+        Ps (list): The candidate pressures.
+        phis (list): The candidate equivalence ratios.
+        evaluate (Callable): A function takes a list of (T, P, phi) and returns a list of
+                             species rankings (lists of labels), one for each condition.
+                             Running the conditions of a round in parallel is up to it.
+        num_coarse (int): The number of values on each axis in the initial grid.
+        top_n (Optional[int]): Only compare the first ``top_n`` species of the rankings.
+        threshold (float): The overlap below which the rankings are regarded as changed.
+        max_rounds (Optional[int]): The maximum number of refinement rounds.
+
+    Returns:
+        dict: Keys are the evaluated conditions (T, P, phi), values are the species rankings.
+    """
+    axes = [sorted(Ts), sorted(Ps), sorted(phis)]
+    axis_lengths = [len(axis) for axis in axes]
+    to_evaluate = set(itertools.product(*[get_coarse_indices(length, num_coarse)
+                                          for length in axis_lengths]))
+    rankings = {}
+    num_round = 0
+    while to_evaluate:
+        indices = sorted(to_evaluate)
+        conditions = [tuple(axes[axis][i] for axis, i in enumerate(index))
+                      for index in indices]
+        print(f'Round {num_round}: evaluating {len(conditions)} conditions...')
+        results = evaluate(conditions)
+        for index, ranking in zip(indices, results):
+            rankings[index] = list(ranking or [])
+        num_round += 1
+        if max_rounds is not None and num_round > max_rounds:
+            break
+        to_evaluate = refine_condition_grid(rankings, axis_lengths,
+                                            top_n=top_n, threshold=threshold)
+
+    print(f'Evaluated {len(rankings)} out of '
+          f'{axis_lengths[0] * axis_lengths[1] * axis_lengths[2]} conditions.')
+    return {tuple(axes[axis][i] for axis, i in enumerate(index)): ranking
+            for index, ranking in rankings.items()}
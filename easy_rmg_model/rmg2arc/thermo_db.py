@@ -4,15 +4,24 @@
 The toolbox for works related to RMG thermo database
 """
 
+from __future__ import annotations
+
 import glob
+import hashlib
 import os
+import pickle
+import tempfile
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from rmgpy import settings as rmg_settings
-from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
+from easy_rmg_model.common import walk_dir
+from easy_rmg_model.instrumentation import count, timer
 
-from easy_rmg_model.plotter import compare_thermo
+# RMG and matplotlib are imported at first use to keep the scripts start fast
+if TYPE_CHECKING:
+    from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
 
 
 def load_thermo_lib_by_path(path: str,
@@ -27,6 +36,25 @@ def load_thermo_lib_by_path(path: str,
         thermo_database (ThermoDatabase): RMG thermo database object
         reload (bool): Whether to reload the library if this library is in the ThermoDatabase
     """
+    # Skip the loaded library before parsing it
+    if path in thermo_db.library_order and not reload:
+        print(f'The library {path} has already been loaded.')
+        return
+    lib = _parse_thermo_lib(path)
+    if lib is None:
+        return
+    if path not in thermo_db.library_order:
+        thermo_db.library_order.append(path)
+    thermo_db.libraries[lib.label] = lib
+    print(f'The thermodynamics library {path} is loaded.')
+
+
+def _parse_thermo_lib(path: str) -> Optional[ThermoLibrary]:
+    """
+    Parse a thermo library file. Returns ``None`` if the file is missing or invalid.
+    """
+    from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
+
     lib = ThermoLibrary()
     try:
         lib.load(path,
@@ -34,18 +62,102 @@ def load_thermo_lib_by_path(path: str,
                  ThermoDatabase().global_context)
     except FileNotFoundError:
         print(f'The library file {path} does not exist.')
+        return
     except (SyntaxError, ImportError):
         print(f'The library file {path} is not valid.')
-    else:
-        if path in thermo_db.library_order and not reload:
-            print(f'The library {path} has already been loaded.')
-            return
-        elif path not in thermo_db.library_order:
-            thermo_db.library_order.append(path)
-        lib.label = path
-        lib.name = path
-        thermo_db.libraries[lib.label] = lib
-        print(f'The thermodynamics library {path} is loaded.')
+        return
+    lib.label = path
+    lib.name = path
+    return lib
+
+
+def _get_thermo_lib_cache_path(path: str, cache_dir: str) -> str:
+    """
+    Get the path of the cached library. The name is the hash of the library path.
+    """
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(cache_dir, f'{key}.pkl')
+
+
+def _read_cached_thermo_lib(path: str, cache_dir: str) -> Optional[ThermoLibrary]:
+    """
+    Read the cached library if the library file is not modified since it was cached.
+    """
+    cache_path = _get_thermo_lib_cache_path(path, cache_dir)
+    try:
+        stat = os.stat(path)
+        with open(cache_path, 'rb') as f:
+            mtime, size, lib = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+        return
+    if (mtime, size) != (stat.st_mtime_ns, stat.st_size):
+        return
+    return lib
+
+
+def _write_cached_thermo_lib(path: str, cache_dir: str, lib: ThermoLibrary):
+    """
+    Cache a library atomically, so that concurrent readers never see a partial file.
+    """
+    try:
+        stat = os.stat(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((stat.st_mtime_ns, stat.st_size, lib), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _get_thermo_lib_cache_path(path, cache_dir))
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        print(f'Cannot cache the library {path}: {e}')
+
+
+def _parse_and_cache_thermo_lib(args) -> Optional[ThermoLibrary]:
+    """
+    A picklable wrapper of ``_parse_thermo_lib`` for worker processes, which
+    also caches the parsed library if ``cache_dir`` is assigned.
+    """
+    path, cache_dir = args
+    lib = _parse_thermo_lib(path)
+    if lib is not None and cache_dir:
+        _write_cached_thermo_lib(path, cache_dir, lib)
+    return lib
+
+
+def load_thermo_libs(paths: Iterable,
+                     n_workers: int = 1,
+                     cache_dir: Optional[str] = None,
+                     ) -> 'ThermoLibraryView':
+    """
+    Load many thermo library files, e.g., the ones found by ``find_thermo_libs``. The files
+    are parsed in a process pool if ``n_workers`` > 1. The parsed libraries can be cached
+    in a binary form, and a library is only parsed again if its file is modified.
+
+    Args:
+        paths (Iterable): The paths to the library files.
+        n_workers (int): The number of worker processes.
+        cache_dir (Optional[str]): The directory to cache the parsed libraries. Not cached if not assigned.
+
+    Returns:
+        ThermoLibraryView: The merged view of the loaded libraries, in the order of ``paths``.
+    """
+    paths = list(dict.fromkeys(paths))
+    libs = {}
+    with timer('thermo.load_libraries'):
+        if cache_dir:
+            for path in paths:
+                lib = _read_cached_thermo_lib(path, cache_dir)
+                if lib is not None:
+                    libs[path] = lib
+            count('thermo.cached_libraries', len(libs))
+        args = [(path, cache_dir) for path in paths if path not in libs]
+        if n_workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(_parse_and_cache_thermo_lib, args))
+        else:
+            results = [_parse_and_cache_thermo_lib(arg) for arg in args]
+        libs.update((path, lib) for (path, _), lib in zip(args, results) if lib is not None)
+    print(f'{len(libs)} of {len(paths)} thermodynamics libraries are loaded.')
+    return ThermoLibraryView(libs[path] for path in paths if path in libs)
 
 
 def load_thermo_database(libraries: Optional[list] = None):
@@ -56,19 +168,24 @@ def load_thermo_database(libraries: Optional[list] = None):
         libraries (Optional[list]): A list of libraries to be imported. All
                                     libraies will be imported if not assigned.
     """
+    from rmgpy import settings as rmg_settings
+    from rmgpy.data.thermo import ThermoDatabase
+
     thermo_db_path = os.path.join(rmg_settings['database.directory'], 'thermo')
     thermo_db = ThermoDatabase()
     thermo_db.load(thermo_db_path, libraries=libraries)
     return thermo_db
 
 
-def find_thermo_libs(path: str):
+def find_thermo_libs(path: str, prune=('calcs', 'log_and_restart_archive')):
     """
     This function search for the thermo library
     based on ``RMG libraries/thermo/*.py``
 
     Args:
         path (str): The path to project directories
+        prune: The sub-directories to be skipped, by default the ARC calculation
+               folders which never contain libraries. See ``easy_rmg_model.common.walk_dir``.
 
     Returns:
         thermo_lib_list (list): Entries of the path to thermo libraries
@@ -76,11 +193,13 @@ def find_thermo_libs(path: str):
     # Initiate the thermo lib list
     thermo_lib_list = list()
     # Walk through the dirs under path
-    for root_p, dirs, _ in os.walk(path):
-        if not dirs:
+    for root_p, dirs, _ in walk_dir(path, prune=prune):
+        if 'RMG libraries' not in dirs:
             continue
         # Use ARC folder organization to check thermo library
         chk_path = os.path.join(root_p, 'RMG libraries', 'thermo')
+        # No need to look into the library folder
+        dirs.remove('RMG libraries')
         if os.path.isdir(chk_path):
             # Find the corresponding thermo lib file
             thermo_lib = glob.glob(os.path.join(chk_path, '*.py'))
@@ -98,6 +217,8 @@ def merge_thermo_lib(base_lib, lib_to_add, tbd_lib):
         base_lib (RMG thermo library): The library used as the base
         lib_to_add (RMG thermo library): The library to be added to the base library
     """
+    from easy_rmg_model.plotter import compare_thermo
+
     for spc_label, spc in lib_to_add.entries.items():
         # Loop through the species in the base library to check duplicates
         spc.item.generate_resonance_structures()
@@ -106,8 +227,9 @@ def merge_thermo_lib(base_lib, lib_to_add, tbd_lib):
             formula_base = base_spc.item.get_formula()
             if formula != formula_base:
                 continue
-            if spc.item.is_isomorphic(base_spc.item):
-                in_base = True
+            with timer('isomorphism'):
+                in_base = spc.item.is_isomorphic(base_spc.item)
+            if in_base:
                 break
         else:
             in_base = False
@@ -141,3 +263,544 @@ def merge_thermo_lib(base_lib, lib_to_add, tbd_lib):
             spc.short_desc += "\nAdded to the base library {}".format(
                 base_lib.label)
             print(f'The thermo of {spc.label} from {lib_to_add.label} is merged.')
+
+
+def _get_molecules(item) -> list:
+    """
+    Get the molecules of a library entry item or a species.
+    """
+    return list(item.molecule) if hasattr(item, 'molecule') else [item]
+
+
+def _get_identifier(molecule) -> Optional[tuple]:
+    # SMILES doesn't tell the multiplicity, e.g., of singlet and triplet CH2
+    try:
+        return molecule.to_smiles(), molecule.multiplicity
+    except Exception:
+        return
+
+
+class ThermoLibraryIndex(object):
+    """
+    A structure index of the entries in thermo libraries, used to check if a species
+    is in the libraries without estimating its thermo by group additivity. The entries are
+    indexed by the SMILES and the multiplicity of their molecules, and bucketed by formula
+    and multiplicity, so that the isomorphism is only checked within the bucket of a species.
+
+    Args:
+        libraries (Iterable): The thermo libraries (or depositories) to be indexed.
+    """
+
+    def __init__(self, libraries: Iterable = ()):
+        self.labels = []
+        self._identifiers = {}  # (SMILES, multiplicity): [(library, entry)]
+        self._buckets = {}  # (formula, multiplicity): [(library, entry, molecules)]
+        for library in libraries:
+            self.add_library(library)
+
+    @classmethod
+    def from_thermo_db(cls,
+                       thermo_db: ThermoDatabase,
+                       include_depository: bool = True,
+                       ) -> 'ThermoLibraryIndex':
+        """
+        Index the libraries of a thermo database in the order of ``library_order``.
+
+        Args:
+            thermo_db (ThermoDatabase): The RMG thermo database.
+            include_depository (bool): Whether to also index the depository entries, which are
+                                       also used by ``ThermoDatabase.get_all_thermo_data``.
+
+        Returns:
+            ThermoLibraryIndex: The index.
+        """
+        index = cls(thermo_db.libraries[label] for label in thermo_db.library_order
+                    if label in thermo_db.libraries)
+        if include_depository:
+            for label, depository in getattr(thermo_db, 'depository', {}).items():
+                index.add_library(depository, label=f'depository/{label}')
+        return index
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def __contains__(self, species):
+        return bool(self.find(species, first=True))
+
+    def add_library(self,
+                    library,
+                    label: Optional[str] = None):
+        """
+        Add the entries of a library to the index.
+
+        Args:
+            library: The RMG thermo library or depository.
+            label (Optional[str]): The label of the library. Defaults to ``library.label``.
+        """
+        label = label or library.label
+        self.labels.append(label)
+        for entry_label, entry in library.entries.items():
+            if entry.data is None or entry.item is None:
+                continue
+            molecules = _get_molecules(entry.item)
+            key = (molecules[0].get_formula(), molecules[0].multiplicity)
+            self._buckets.setdefault(key, []).append((label, entry_label, molecules))
+            for molecule in molecules:
+                identifier = _get_identifier(molecule)
+                if identifier:
+                    self._identifiers.setdefault(identifier, []).append((label, entry_label))
+
+    def find(self,
+             species,
+             first: bool = False,
+             ) -> list:
+        """
+        Find a species in the indexed libraries.
+
+        Args:
+            species (Species): The species. Its resonance structures are compared if generated.
+            first (bool): Whether to return once found in a library.
+
+        Returns:
+            list: The tuples of (library label, entry label) where the species is found.
+        """
+        molecules = _get_molecules(species)
+        found = []
+        for molecule in molecules:
+            for match in self._identifiers.get(_get_identifier(molecule), []):
+                if match not in found:
+                    found.append(match)
+        if found:
+            count('thermo_index.identifier_hits')
+            return found[:1] if first else found
+
+        key = (molecules[0].get_formula(), molecules[0].multiplicity)
+        for library, entry_label, entry_molecules in self._buckets.get(key, []):
+            with timer('isomorphism'):
+                isomorphic = any(molecule.is_isomorphic(entry_molecule)
+                                 for molecule in molecules
+                                 for entry_molecule in entry_molecules)
+            if isomorphic:
+                found.append((library, entry_label))
+                if first:
+                    break
+        return found
+
+
+# The index shared by the worker processes
+_WORKER_INDEX = {}
+
+
+def _init_worker_index(index: ThermoLibraryIndex):
+    _WORKER_INDEX['index'] = index
+
+
+def _find_spc_info_in_index(spc: dict) -> Optional[list]:
+    """
+    Find a species (info) in the index of the worker. Returns ``None`` if the species
+    cannot be generated.
+    """
+    from easy_rmg_model.rmg2arc.species_dict import species_from_spc_info
+    try:
+        species = species_from_spc_info(spc)
+        species.generate_resonance_structures()
+    except Exception:
+        return
+    return sorted({library for library, _ in _WORKER_INDEX['index'].find(species)})
+
+
+def find_species_in_thermo_libraries(spc_info: dict,
+                                     index: ThermoLibraryIndex,
+                                     n_workers: int = 1,
+                                     ) -> dict:
+    """
+    Check which thermo libraries contain each of many species. The species are generated
+    and checked in a process pool if ``n_workers`` > 1.
+
+    Args:
+        spc_info (dict): Keys are labels, values are species info (with ``smiles``,
+                         ``adjlist`` or ``xyz``).
+        index (ThermoLibraryIndex): The index of the thermo libraries.
+        n_workers (int): The number of worker processes.
+
+    Returns:
+        dict: Keys are labels, values are the labels of the libraries containing the species.
+              ``None`` if the species cannot be generated.
+    """
+    labels = list(spc_info)
+    # Only send the picklable geom info to the workers
+    spcs = [{key: spc[key] for key in ['label', 'smiles', 'adjlist', 'xyz', 'multiplicity']
+             if key in spc} for spc in spc_info.values()]
+    with timer('thermo.library_lookup'):
+        if n_workers > 1 and len(spcs) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     initializer=_init_worker_index,
+                                     initargs=(index,)) as executor:
+                results = list(executor.map(_find_spc_info_in_index, spcs,
+                                            chunksize=max(1, len(spcs) // (4 * n_workers))))
+        else:
+            _init_worker_index(index)
+            results = [_find_spc_info_in_index(spc) for spc in spcs]
+            _WORKER_INDEX.clear()
+    return dict(zip(labels, results))
+
+
+class ThermoLibraryView(Mapping):
+    """
+    A read-only merged view of many thermo libraries. Keys are the entry labels. If a label
+    is in many libraries, the entry of the first library is used, and all of them can be
+    got by ``get_all``. The entries are not copied.
+
+    Args:
+        libraries (Iterable): The thermo libraries, in the order of priority.
+    """
+
+    def __init__(self, libraries: Iterable = ()):
+        self.libraries = {}
+        self._labels = {}  # entry label: [library labels]
+        self._index = None
+        for library in libraries:
+            self.add_library(library)
+
+    def add_library(self, library):
+        """
+        Add a library with the lowest priority.
+
+        Args:
+            library (ThermoLibrary): The thermo library.
+        """
+        self.libraries[library.label] = library
+        for label in library.entries:
+            self._labels.setdefault(label, []).append(library.label)
+        if self._index is not None:
+            self._index.add_library(library)
+
+    def __getitem__(self, label):
+        return self.libraries[self._labels[label][0]].entries[label]
+
+    def __iter__(self):
+        return iter(self._labels)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def get_all(self, label: str) -> list:
+        """
+        Get the entries of a label in all libraries.
+
+        Args:
+            label (str): The entry label.
+
+        Returns:
+            list: The tuples of (library label, entry).
+        """
+        return [(library, self.libraries[library].entries[label])
+                for library in self._labels.get(label, [])]
+
+    @property
+    def index(self) -> ThermoLibraryIndex:
+        """
+        The structure index of the libraries, built at the first access.
+        """
+        if self._index is None:
+            self._index = ThermoLibraryIndex(self.libraries.values())
+        return self._index
+
+    def find(self, species) -> list:
+        """
+        Find the entries of a species in the libraries by its structure.
+
+        Args:
+            species (Species): The species.
+
+        Returns:
+            list: The tuples of (library label, entry).
+        """
+        return [(library, self.libraries[library].entries[label])
+                for library, label in self.index.find(species)]
+
+    def add_to_thermo_db(self,
+                         thermo_db: ThermoDatabase,
+                         reload: bool = False):
+        """
+        Add the libraries to a thermo database, as ``load_thermo_lib_by_path`` does.
+
+        Args:
+            thermo_db (ThermoDatabase): RMG thermo database object.
+            reload (bool): Whether to replace the libraries already in the database.
+        """
+        for label, lib in self.libraries.items():
+            if label in thermo_db.library_order and not reload:
+                print(f'The library {label} has already been loaded.')
+                continue
+            elif label not in thermo_db.library_order:
+                thermo_db.library_order.append(label)
+            thermo_db.libraries[label] = lib
+
+
+# The temperatures (K) used to compare thermo by default
+DEFAULT_T_LIST = tuple(range(300, 2001, 100))
+
+
+def _get_nasa_arrays(thermo) -> Optional[tuple]:
+    """
+    Get the coefficients of a NASA model as arrays of (cm2, cm1, c0, ..., c6) and the
+    temperature ranges of its polynomials. Returns ``None`` if not a NASA model.
+    """
+    polynomials = getattr(thermo, 'polynomials', None)
+    if not polynomials:
+        return
+    coeffs = [[getattr(poly, f'c{i}') for i in ['m2', 'm1', 0, 1, 2, 3, 4, 5, 6]]
+              for poly in polynomials]
+    ranges = [(poly.Tmin.value_si, poly.Tmax.value_si) for poly in polynomials]
+    return coeffs, ranges
+
+
+def evaluate_thermo(thermo_list: list,
+                    T_list: Iterable = DEFAULT_T_LIST,
+                    ) -> dict:
+    """
+    Evaluate the thermo of many entries at the temperatures. NASA models are evaluated
+    in vectorized form, other models (e.g., ``ThermoData``, ``Wilhoit``) one by one.
+
+    Args:
+        thermo_list (list): The RMG thermo models or entries.
+        T_list (Iterable): The temperatures in K.
+
+    Returns:
+        dict: ``H`` and ``G`` in kcal/mol, ``S`` and ``Cp`` in cal/mol/K, each is an array of
+              shape (number of entries, number of temperatures). ``NaN`` if out of the valid range.
+    """
+    import numpy as np
+
+    R = 8.314462618  # J/mol/K
+    T = np.asarray(T_list, dtype=float)
+    thermo_list = [getattr(thermo, 'data', thermo) for thermo in thermo_list]
+    results = {key: np.full((len(thermo_list), T.shape[0]), np.nan)
+               for key in ['H', 'S', 'Cp']}
+
+    nasa, others = {}, []
+    for i, thermo in enumerate(thermo_list):
+        arrays = _get_nasa_arrays(thermo)
+        if arrays:
+            nasa.setdefault(len(arrays[0]), []).append((i, arrays))
+        elif thermo is not None:
+            others.append(i)
+
+    lnT = np.log(T)
+    # The terms of Cp/R, H/RT and S/R in the order of (cm2, cm1, c0, ..., c6)
+    cp_terms = np.array([T ** -2, 1 / T, np.ones_like(T), T, T ** 2, T ** 3, T ** 4,
+                         np.zeros_like(T), np.zeros_like(T)])
+    h_terms = np.array([-T ** -2, lnT / T, np.ones_like(T), T / 2, T ** 2 / 3, T ** 3 / 4,
+                        T ** 4 / 5, 1 / T, np.zeros_like(T)])
+    s_terms = np.array([-T ** -2 / 2, -1 / T, lnT, T, T ** 2 / 2, T ** 3 / 3, T ** 4 / 4,
+                        np.zeros_like(T), np.ones_like(T)])
+    # Models with the same number of polynomials are evaluated together
+    for items in nasa.values():
+        indices = [i for i, _ in items]
+        coeffs = np.array([arrays[0] for _, arrays in items])  # (N, P, 9)
+        ranges = np.array([arrays[1] for _, arrays in items])  # (N, P, 2)
+        assigned = np.zeros((len(indices), T.shape[0]), dtype=bool)
+        for key, terms, scale in [('Cp', cp_terms, R), ('H', h_terms, R * T), ('S', s_terms, R)]:
+            values = np.full(assigned.shape, np.nan)
+            assigned[:] = False
+            for p in range(coeffs.shape[1]):
+                # Use the first polynomial covering the temperature, as RMG does
+                in_range = (ranges[:, p, 0:1] <= T) & (T <= ranges[:, p, 1:2]) & ~assigned
+                values = np.where(in_range, coeffs[:, p, :] @ terms * scale, values)
+                assigned |= in_range
+            results[key][indices] = values
+
+    for i in others:
+        for j, temperature in enumerate(T):
+            for key, fun_name in [('H', 'get_enthalpy'), ('S', 'get_entropy'),
+                                  ('Cp', 'get_heat_capacity')]:
+                try:
+                    results[key][i, j] = getattr(thermo_list[i], fun_name)(temperature)
+                except (ValueError, AttributeError):
+                    pass
+
+    results['G'] = results['H'] - T * results['S']
+    for key in ['H', 'G']:
+        results[key] /= 4184.
+    for key in ['S', 'Cp']:
+        results[key] /= 4.184
+    return results
+
+
+def match_thermo_libs(base_lib,
+                      lib_to_compare,
+                      resonance: bool = True,
+                      ) -> list:
+    """
+    Match the entries of two thermo libraries by structure.
+
+    Args:
+        base_lib (ThermoLibrary): The base library.
+        lib_to_compare (ThermoLibrary): The library to be compared.
+        resonance (bool): Whether to generate the resonance structures of the
+                          entries not matched by their structures directly.
+
+    Returns:
+        list: The tuples of (label in the base library, label in the other library).
+    """
+    index = ThermoLibraryIndex([base_lib])
+    matches, unmatched = [], []
+    with timer('thermo.match_entries'):
+        for label, entry in lib_to_compare.entries.items():
+            if entry.data is None or entry.item is None:
+                continue
+            found = index.find(entry.item, first=True)
+            if found:
+                matches.append((found[0][1], label))
+            else:
+                unmatched.append(label)
+        if resonance and unmatched:
+            from rmgpy.species import Species
+            for label in unmatched:
+                item = lib_to_compare.entries[label].item
+                species = item if hasattr(item, 'molecule') else Species(molecule=[item])
+                try:
+                    species = species.copy(deep=True)
+                    species.generate_resonance_structures()
+                except Exception:
+                    continue
+                found = index.find(species, first=True)
+                if found:
+                    matches.append((found[0][1], label))
+    return matches
+
+
+def _nan_abs_max(values):
+    """
+    Get the max absolute value of each row ignoring NaN. NaN if the whole row is NaN.
+    """
+    import numpy as np
+
+    if not values.shape[1]:
+        return np.full(values.shape[0], np.nan)
+    return np.fmax.reduce(np.abs(values), axis=1)
+
+
+def diff_thermo_libs(base_lib,
+                     lib_to_compare,
+                     T_list: Iterable = DEFAULT_T_LIST,
+                     resonance: bool = True,
+                     sort_by: str = 'dG_max',
+                     ):
+    """
+    Compare the thermo of the entries shared by two thermo libraries.
+
+    Args:
+        base_lib (ThermoLibrary): The base library.
+        lib_to_compare (ThermoLibrary): The library to be compared.
+        T_list (Iterable): The temperatures (K) to compare Cp and G.
+        resonance (bool): Whether to use resonance structures to match the entries.
+        sort_by (str): The column to sort the table by its absolute values in descending order,
+                       with the entries that can't be compared (``NaN``) first. The label columns
+                       are sorted alphabetically.
+
+    Returns:
+        pd.DataFrame: The table of the matched entries with the columns ``label``, ``label_to_compare``,
+                      ``H298``, ``H298_to_compare``, ``dH298`` (kcal/mol), ``S298``, ``S298_to_compare``,
+                      ``dS298`` (cal/mol/K), ``dCp_max`` (cal/mol/K), ``dG_max``, ``dG_rms`` (kcal/mol)
+                      and ``n_valid_T`` (the number of temperatures where both entries are evaluated).
+                      The differences are the values of ``lib_to_compare`` minus the base ones.
+                      ``dCp_max``, ``dG_max`` and ``dG_rms`` are ``NaN`` if ``n_valid_T`` is 0.
+    """
+    import numpy as np
+    import pandas as pd
+
+    T_list = list(T_list)
+    matches = match_thermo_libs(base_lib, lib_to_compare, resonance=resonance)
+    T = np.array(sorted(set(T_list) | {298.15}), dtype=float)
+    i298 = int(np.searchsorted(T, 298.15))
+    with timer('thermo.evaluate'):
+        values1 = evaluate_thermo([base_lib.entries[label] for label, _ in matches], T)
+        values2 = evaluate_thermo([lib_to_compare.entries[label] for _, label in matches], T)
+    # Only compare Cp and G on the requested temperatures
+    grid = np.isin(T, np.array(T_list, dtype=float))
+    dG = (values2['G'] - values1['G'])[:, grid]
+    dCp = (values2['Cp'] - values1['Cp'])[:, grid]
+    n_valid = (~np.isnan(dG)).sum(axis=1)
+    with np.errstate(all='ignore'):
+        table = pd.DataFrame({
+            'label': [label for label, _ in matches],
+            'label_to_compare': [label for _, label in matches],
+            'H298': values1['H'][:, i298],
+            'H298_to_compare': values2['H'][:, i298],
+            'dH298': values2['H'][:, i298] - values1['H'][:, i298],
+            'S298': values1['S'][:, i298],
+            'S298_to_compare': values2['S'][:, i298],
+            'dS298': values2['S'][:, i298] - values1['S'][:, i298],
+            # NaN if not evaluated at any temperature, instead of showing no difference
+            'dCp_max': _nan_abs_max(dCp),
+            'dG_max': _nan_abs_max(dG),
+            'dG_rms': np.where(n_valid > 0,
+                               np.sqrt(np.nansum(dG ** 2, axis=1) / np.maximum(n_valid, 1)),
+                               np.nan),
+            'n_valid_T': n_valid,
+        })
+    if not sort_by:
+        return table
+    if sort_by not in table.columns:
+        raise ValueError(f'Invalid column to sort by ({sort_by}), should be one of {list(table.columns)}.')
+    if pd.api.types.is_numeric_dtype(table[sort_by]):
+        return table.sort_values(sort_by, key=abs, ascending=False, na_position='first',
+                                 ignore_index=True)
+    # The labels are sorted alphabetically
+    return table.sort_values(sort_by, ignore_index=True)
+
+
+def _plot_thermo_diff(args):
+    """
+    Plot the comparison of two entries without showing it, for worker processes.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from easy_rmg_model.plotter import compare_thermo
+
+    entries, fig_title, legends, save_path = args
+    compare_thermo(list(entries), fig_title=fig_title, legends=legends, save_path=save_path)
+    return save_path
+
+
+def plot_thermo_diffs(table,
+                      base_lib,
+                      lib_to_compare,
+                      fig_dir: str,
+                      top_k: int = 10,
+                      n_workers: int = 2,
+                      wait: bool = True,
+                      ) -> list:
+    """
+    Plot the free energy of the top-K entries in the table of ``diff_thermo_libs``. The
+    figures are rendered in a process pool.
+
+    Args:
+        table (pd.DataFrame): The table generated by ``diff_thermo_libs``.
+        base_lib (ThermoLibrary): The base library.
+        lib_to_compare (ThermoLibrary): The library compared.
+        fig_dir (str): The directory to save the figures.
+        top_k (int): The number of rows at the top of the table to be plotted.
+        n_workers (int): The number of worker processes.
+        wait (bool): Whether to wait for the figures. If not, the figures are rendered in
+                     the background and the futures can be used to wait for them.
+
+    Returns:
+        list: The futures of the paths to the figures.
+    """
+    os.makedirs(fig_dir, exist_ok=True)
+    legends = [str(base_lib.label), str(lib_to_compare.label)]
+    executor = ProcessPoolExecutor(max_workers=max(n_workers, 1))
+    futures = []
+    for rank, row in enumerate(table.head(top_k).itertuples(index=False)):
+        entries = (base_lib.entries[row.label], lib_to_compare.entries[row.label_to_compare])
+        # Labels may have characters not allowed in file names
+        file_name = ''.join(char if char.isalnum() or char in '-_.()' else '_'
+                            for char in str(row.label))
+        save_path = os.path.join(fig_dir, f'{rank}_{file_name}.png')
+        futures.append(executor.submit(_plot_thermo_diff,
+                                       (entries, str(row.label), list(legends), save_path)))
+    executor.shutdown(wait=wait)
+    return futures
@@ -3,6 +3,9 @@
 
 
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 try:
     # openbabel 3
     from openbabel import pybel
@@ -11,32 +14,262 @@ except ImportError:
     import pybel
 
 from rmgpy.molecule.molecule import Molecule
-from rmgpy.molecule.converter import from_ob_mol
+from rmgpy.molecule.converter import from_ob_mol, from_rdkit_mol
 
 from arc.species.conformers import find_internal_rotors
 from arc.species.converter import xyz_to_xyz_file_format
 from arc.parser import parse_xyz_from_file
 
+from easy_rmg_model.instrumentation import count, timer
 
-def xyz_to_mol(xyz):
+# Backends available to perceive molecules from xyz
+BACKENDS = ('openbabel', 'rdkit')
+
+# LRU cache of perceived molecules, keyed by the backend and the canonical geometry hash
+_MOL_CACHE = OrderedDict()
+_MOL_CACHE_LOCK = threading.Lock()
+_MOL_CACHE_STATS = {'hits': 0, 'misses': 0, 'maxsize': 2048}
+
+
+def _xyz_to_string(xyz):
+    """
+    Convert the xyz input to the xyz file format string used by Open Babel.
+    """
     if isinstance(xyz, dict):
-        string = xyz_to_xyz_file_format(xyz)
+        return xyz_to_xyz_file_format(xyz)
     elif isinstance(xyz, str):
         if not xyz[0].isdigit():
             atom_num = len(xyz.splitlines())
-            string = f'{atom_num}\n\n' + xyz
+            return f'{atom_num}\n\n' + xyz
         else:
-            string = xyz
+            return xyz
     elif os.path.isfile(xyz):
-        string = xyz_to_xyz_file_format(parse_xyz_from_file(xyz))
+        return xyz_to_xyz_file_format(parse_xyz_from_file(xyz))
     else:
         raise ValueError(f'Invalid xyz input, got: {xyz}')
-    molecule = pybel.readstring('xyz', string)
-    mol = Molecule()
-    from_ob_mol(mol, molecule.OBMol)
+
+
+def get_xyz_hash(xyz, decimals: int = 4):
+    """
+    Get a canonical hash of a geometry from its element list and rounded coordinates.
+    Geometries in different formats (ARC xyz dict, xyz string, xyz file format) give
+    the same hash.
+
+    Args:
+        xyz (Union[dict, str]): The geometry.
+        decimals (int): The number of decimals of the coordinates to keep.
+
+    Returns:
+        tuple: The hashable key of the geometry.
+    """
+    if isinstance(xyz, dict):
+        symbols, coords = xyz['symbols'], xyz['coords']
+    else:
+        lines = _xyz_to_string(xyz).splitlines()[2:]
+        symbols, coords = [], []
+        for line in lines:
+            items = line.split()
+            if len(items) < 4:
+                continue
+            symbols.append(items[0])
+            coords.append([float(value) for value in items[1:4]])
+    return (tuple(symbols),
+            tuple(round(float(value), decimals) + 0.0
+                  for coord in coords for value in coord))
+
+
+def _perceive_mol(string: str, backend: str = 'openbabel'):
+    """
+    Perceive a RMG Molecule from the xyz file format string.
+
+    Args:
+        string (str): The xyz file format string.
+        backend (str): ``'openbabel'`` for Open Babel perception, or ``'rdkit'``
+                       for RDKit bond perception (Jensen's xyz2mol through rdmc).
+    """
+    if backend == 'openbabel':
+        molecule = pybel.readstring('xyz', string)
+        mol = Molecule()
+        from_ob_mol(mol, molecule.OBMol)
+    elif backend == 'rdkit':
+        from rdmc.mol import RDKitMol
+        rdkit_mol = RDKitMol.FromXYZ(string, backend='jensen', header=True)
+        mol = from_rdkit_mol(Molecule(), rdkit_mol.ToRWMol())
+    else:
+        raise ValueError(f'Invalid backend ({backend}), should be one of {BACKENDS}.')
+    return mol
+
+
+def _get_cached_mol(key):
+    with _MOL_CACHE_LOCK:
+        mol = _MOL_CACHE.get(key)
+        if mol is not None:
+            _MOL_CACHE.move_to_end(key)
+            _MOL_CACHE_STATS['hits'] += 1
+    count('xyz_to_mol.cache_hits' if mol is not None else 'xyz_to_mol.cache_misses')
     return mol
 
 
+def _cache_mol(key, mol):
+    with _MOL_CACHE_LOCK:
+        _MOL_CACHE_STATS['misses'] += 1
+        _MOL_CACHE[key] = mol
+        while len(_MOL_CACHE) > _MOL_CACHE_STATS['maxsize']:
+            _MOL_CACHE.popitem(last=False)
+
+
+def xyz_to_mol(xyz,
+               copy: bool = True,
+               use_cache: bool = True,
+               backend: str = 'openbabel'):
+    """
+    Convert a geometry to a RMG Molecule by bond perception. The molecules
+    are cached by the canonical geometry hash, so converting the same geometry
+    again is cheap.
+
+    Args:
+        xyz (Union[dict, str]): The geometry as an ARC xyz dict, a xyz string or a path to a xyz file.
+        copy (bool): Return a copy of the cached molecule. Use ``False`` only if the molecule
+                     is not going to be modified.
+        use_cache (bool): Whether to use the cache.
+        backend (str): The perception backend, ``'openbabel'`` or ``'rdkit'``.
+
+    Returns:
+        Molecule: The perceived molecule.
+    """
+    key = (backend, get_xyz_hash(xyz)) if use_cache else None
+    if key is not None:
+        mol = _get_cached_mol(key)
+        if mol is not None:
+            return mol.copy(deep=True) if copy else mol
+
+    with timer('xyz_to_mol.perceive'):
+        mol = _perceive_mol(_xyz_to_string(xyz), backend)
+
+    if key is not None:
+        _cache_mol(key, mol)
+        return mol.copy(deep=True) if copy else mol
+    return mol
+
+
+def _try_perceive_mol(args):
+    """
+    A picklable wrapper of ``_perceive_mol`` for worker processes. Returns ``None`` if fails.
+    """
+    try:
+        return _perceive_mol(*args)
+    except Exception:
+        return
+
+
+def xyzs_to_mols(xyzs: list,
+                 backend: str = 'openbabel',
+                 n_workers: int = 1,
+                 copy: bool = True,
+                 use_cache: bool = True,
+                 ) -> list:
+    """
+    Convert many geometries to RMG Molecules in bulk. The geometries not in the cache
+    are perceived in a process pool if ``n_workers`` > 1.
+
+    Args:
+        xyzs (list): The geometries. Each can be an ARC xyz dict, a xyz string or a path to a xyz file.
+        backend (str): The perception backend, ``'openbabel'`` (default, as ``xyz_to_mol``) or
+                       ``'rdkit'``. The RDKit backend assumes neutral closed-shell perception and
+                       may mis-perceive radicals, so check it by ``check_backend_consistency`` first.
+        n_workers (int): The number of worker processes.
+        copy (bool): Return copies of the cached molecules.
+        use_cache (bool): Whether to use the ``xyz_to_mol`` cache.
+
+    Returns:
+        list: The molecules in the same order as ``xyzs``. ``None`` for the geometries
+              that cannot be converted.
+    """
+    mols, keys, to_perceive = [None] * len(xyzs), [None] * len(xyzs), []
+    for i, xyz in enumerate(xyzs):
+        try:
+            string = _xyz_to_string(xyz)
+            if use_cache:
+                keys[i] = (backend, get_xyz_hash(xyz))
+                mols[i] = _get_cached_mol(keys[i])
+        except (ValueError, TypeError, IndexError, KeyError):
+            continue
+        if mols[i] is None:
+            to_perceive.append((i, string))
+
+    args = [(string, backend) for _, string in to_perceive]
+    if n_workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_try_perceive_mol, args,
+                                        chunksize=max(1, len(args) // (4 * n_workers))))
+    else:
+        results = [_try_perceive_mol(arg) for arg in args]
+
+    for (i, _), mol in zip(to_perceive, results):
+        mols[i] = mol
+        if mol is not None and keys[i] is not None:
+            _cache_mol(keys[i], mol)
+
+    if copy:
+        mols = [mol.copy(deep=True) if mol is not None else None for mol in mols]
+    return mols
+
+
+def check_backend_consistency(xyzs: list,
+                              n_workers: int = 1,
+                              ) -> list:
+    """
+    Check if the RDKit backend perceives the same molecules as the Open Babel backend.
+
+    Args:
+        xyzs (list): The geometries to check.
+        n_workers (int): The number of worker processes.
+
+    Returns:
+        list: The inconsistent entries as tuples of (index, Open Babel SMILES, RDKit SMILES).
+              A SMILES is ``None`` if the backend fails.
+    """
+    ob_mols = xyzs_to_mols(xyzs, backend='openbabel', n_workers=n_workers, copy=False)
+    rd_mols = xyzs_to_mols(xyzs, backend='rdkit', n_workers=n_workers, copy=False)
+    inconsistent = []
+    for i, (ob_mol, rd_mol) in enumerate(zip(ob_mols, rd_mols)):
+        if ob_mol is not None and rd_mol is not None and ob_mol.is_isomorphic(rd_mol):
+            continue
+        inconsistent.append((i,
+                             ob_mol.to_smiles() if ob_mol is not None else None,
+                             rd_mol.to_smiles() if rd_mol is not None else None))
+    return inconsistent
+
+
+def xyz_to_mol_cache_info() -> dict:
+    """
+    Get the statistics of the ``xyz_to_mol`` cache.
+
+    Returns:
+        dict: The numbers of hits and misses, the hit rate, the current size and the max size.
+    """
+    with _MOL_CACHE_LOCK:
+        info = dict(_MOL_CACHE_STATS)
+        info['size'] = len(_MOL_CACHE)
+    total = info['hits'] + info['misses']
+    info['hit_rate'] = info['hits'] / total if total else 0.0
+    return info
+
+
+def clear_xyz_to_mol_cache(maxsize: int = None):
+    """
+    Clear the ``xyz_to_mol`` cache and reset the statistics.
+
+    Args:
+        maxsize (int): The new max size of the cache. Unchanged if not assigned.
+    """
+    with _MOL_CACHE_LOCK:
+        _MOL_CACHE.clear()
+        _MOL_CACHE_STATS.update({'hits': 0, 'misses': 0})
+        if maxsize is not None:
+            _MOL_CACHE_STATS['maxsize'] = maxsize
+
+
 def xyz_to_rotors_dict(xyz):
     try:
         mol = xyz_to_mol(xyz)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+The toolbox for the catalog of the local species database. Species are stored
+in ``database_path/<smiles>/<index>``, and the catalog indexes them by the canonical
+identifier so that lookups don't need to walk through the database tree.
+"""
+
+import os
+import sqlite3
+from typing import Optional
+
+from easy_rmg_model.common import walk_dir
+
+CATALOG_NAME = 'catalog.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS species (
+    id INTEGER PRIMARY KEY,
+    identifier TEXT NOT NULL,
+    conformer_index INTEGER NOT NULL,
+    label TEXT,
+    level_of_theory TEXT,
+    success INTEGER NOT NULL DEFAULT 0,
+    number_of_rotors INTEGER NOT NULL DEFAULT 0,
+    number_of_successful_rotors INTEGER NOT NULL DEFAULT 0,
+    directory TEXT NOT NULL UNIQUE,
+    summary TEXT,
+    UNIQUE (identifier, conformer_index)
+);
+CREATE INDEX IF NOT EXISTS species_identifier ON species (identifier);
+CREATE INDEX IF NOT EXISTS species_success ON species (success, level_of_theory);
+"""
+
+_COLUMNS = ['identifier', 'conformer_index', 'label', 'level_of_theory', 'success',
+            'number_of_rotors', 'number_of_successful_rotors', 'directory', 'summary']
+
+
+def get_identifier(spc: dict) -> Optional[str]:
+    """
+    Get the canonical identifier (RMG canonical SMILES) of a species info. The SMILES is
+    canonicalized if given, otherwise it is generated from the adjacency list or the xyz.
+
+    Args:
+        spc (dict): The species info.
+
+    Returns:
+        Optional[str]: The identifier. ``None`` if cannot be generated.
+    """
+    from rmgpy.molecule.molecule import Molecule
+    try:
+        if spc.get('smiles'):
+            return Molecule().from_smiles(spc['smiles']).to_smiles()
+        elif spc.get('adjlist'):
+            return Molecule().from_adjacency_list(spc['adjlist']).to_smiles()
+        elif spc.get('xyz') or spc.get('geom'):
+            from easy_rmg_model.species.converter import xyz_to_mol
+            return xyz_to_mol(spc.get('xyz') or spc.get('geom'), copy=False).to_smiles()
+    except Exception:
+        return
+
+
+def parse_summary(summary: str) -> dict:
+    """
+    Parse the summary generated by ``generate_summary`` (the content of ``info.txt``).
+
+    Args:
+        summary (str): The summary.
+
+    Returns:
+        dict: The success flag and the rotor counts.
+    """
+    rotors = [line for line in summary.splitlines() if line.startswith('scan_')]
+    return {'success': int('failed' not in summary),
+            'number_of_rotors': len(rotors),
+            'number_of_successful_rotors': sum('succeeded' in line for line in rotors)}
+
+
+class SpeciesCatalog(object):
+    """
+    An SQLite catalog of the species in a local species database.
+
+    Args:
+        database_path (str): The root of the species database.
+        catalog_path (Optional[str]): The path to the catalog file. Defaults to
+                                      ``catalog.sqlite`` under the database root.
+    """
+
+    def __init__(self,
+                 database_path: str,
+                 catalog_path: Optional[str] = None):
+        self.database_path = database_path
+        self.catalog_path = catalog_path or os.path.join(database_path, CATALOG_NAME)
+        os.makedirs(os.path.dirname(os.path.abspath(self.catalog_path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.catalog_path, timeout=60)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM species').fetchone()[0]
+
+    def reserve_directory(self, identifier: str, label: str = '') -> str:
+        """
+        Reserve and create a new directory ``<identifier>/<index>`` for a species. The
+        index is the next one after the cataloged and existing directories. The entry is
+        only listed after the species is added by ``add_species``.
+
+        Args:
+            identifier (str): The canonical identifier of the species, see ``get_identifier``.
+            label (str): The label of the species.
+
+        Returns:
+            str: The path to the new directory.
+        """
+        spc_dir = os.path.join(self.database_path, identifier)
+        existing = [int(name) for name in (os.listdir(spc_dir) if os.path.isdir(spc_dir) else [])
+                    if name.isdigit()]
+        with self.connection:
+            # Lock the catalog, so that concurrent workers get different indices
+            self.connection.execute('BEGIN IMMEDIATE')
+            max_index = self.connection.execute(
+                'SELECT MAX(conformer_index) FROM species WHERE identifier = ?',
+                (identifier,)).fetchone()[0]
+            index = max(existing + [max_index if max_index is not None else -1]) + 1
+            new_dir = os.path.join(spc_dir, str(index))
+            self.connection.execute(
+                'INSERT INTO species (identifier, conformer_index, label, directory) '
+                'VALUES (?, ?, ?, ?)', (identifier, index, label, new_dir))
+        os.makedirs(new_dir, exist_ok=True)
+        return new_dir
+
+    def add_species(self,
+                    spc: dict,
+                    level_of_theory: Optional[str] = None,
+                    identifier: Optional[str] = None):
+        """
+        Add or update the catalog entry of a species stored in the database.
+
+        Args:
+            spc (dict): The species info, which has at least ``directory`` and ``summary``.
+            level_of_theory (Optional[str]): The level of theory of the calculations.
+            identifier (Optional[str]): The identifier. Defaults to the database folder name.
+        """
+        directory = spc['directory']
+        relpath = os.path.relpath(directory, self.database_path)
+        default_identifier, index = os.path.split(relpath)
+        row = {'identifier': identifier or default_identifier,
+               'conformer_index': int(index) if index.isdigit() else 0,
+               'label': spc.get('label', ''),
+               'level_of_theory': level_of_theory or spc.get('level_of_theory'),
+               'directory': directory,
+               'summary': spc.get('summary', ''),
+               **parse_summary(spc.get('summary', ''))}
+        with self.connection:
+            self.connection.execute(
+                f'INSERT INTO species ({", ".join(_COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(_COLUMNS))}) '
+                f'ON CONFLICT (directory) DO UPDATE SET '
+                # Keep the known label and level of theory if not given, e.g., when rebuilding
+                + ', '.join(f'{col} = COALESCE(NULLIF(excluded.{col}, \'\'), {col})'
+                            if col in ('label', 'level_of_theory') else f'{col} = excluded.{col}'
+                            for col in _COLUMNS if col != 'directory'),
+                [row[col] for col in _COLUMNS])
+
+    def find(self,
+             identifier: str,
+             success: Optional[bool] = None,
+             level_of_theory: Optional[str] = None,
+             ) -> list:
+        """
+        Find the entries of a species.
+
+        Args:
+            identifier (str): The identifier of the species.
+            success (Optional[bool]): Only the (un)successful entries if assigned.
+            level_of_theory (Optional[str]): Only the entries at this level of theory if assigned.
+
+        Returns:
+            list: The entries as dicts.
+        """
+        # Reserved entries without a summary are not completed yet
+        query = 'SELECT * FROM species WHERE identifier = ? AND summary IS NOT NULL'
+        args = [identifier]
+        if success is not None:
+            query += ' AND success = ?'
+            args.append(int(success))
+        if level_of_theory:
+            query += ' AND level_of_theory = ?'
+            args.append(level_of_theory)
+        return [dict(row) for row in self.connection.execute(query, args)]
+
+    def get_all_species(self, success: Optional[bool] = None) -> dict:
+        """
+        Get the species info of all of the cataloged species, in the same format (and with the
+        same labels) as ``find_all_species_from_database``. Reserved entries not completed
+        yet are excluded.
+
+        Args:
+            success (Optional[bool]): Only the (un)successful entries if assigned.
+
+        Returns:
+            dict: The species info.
+        """
+        query, args = 'SELECT directory FROM species WHERE summary IS NOT NULL', []
+        if success is not None:
+            query += ' AND success = ?'
+            args.append(int(success))
+        spc_info = {}
+        for row in self.connection.execute(query, args):
+            label = row['directory'].replace(self.database_path, '')
+            spc_info[label] = {'label': label, 'directory': row['directory'], 'ts': False}
+        return spc_info
+
+    def species_to_calculate(self,
+                             spc_info: dict,
+                             level_of_theory: Optional[str] = None,
+                             ) -> dict:
+        """
+        Get the species that still need calculations, i.e., not successfully calculated
+        in the database. It can be used to deduplicate the species of ARC inputs against
+        the database.
+
+        Args:
+            spc_info (dict): The species info, e.g., ``{spc['label']: spc}`` of an ARC input.
+            level_of_theory (Optional[str]): Only count the entries at this level of theory if assigned.
+
+        Returns:
+            dict: The species info of the species need calculations.
+        """
+        query = 'SELECT DISTINCT identifier FROM species WHERE success = 1'
+        args = []
+        if level_of_theory:
+            query += ' AND level_of_theory = ?'
+            args.append(level_of_theory)
+        done = {row[0] for row in self.connection.execute(query, args)}
+        return {label: spc for label, spc in spc_info.items()
+                if get_identifier(spc) not in done}
+
+    def rebuild(self):
+        """
+        Rebuild the catalog by walking through the database tree once. Existing entries are
+        updated, and the entries whose directories no longer exist or have no ``info.txt``
+        (reserved but never completed) are removed.
+        """
+        directories = set()
+        for root, dirs, files in walk_dir(self.database_path):
+            if 'info.txt' not in files:
+                continue
+            dirs.clear()
+            with open(os.path.join(root, 'info.txt')) as f:
+                summary = f.read()
+            self.add_species({'directory': root, 'summary': summary})
+            directories.add(root)
+        with self.connection:
+            for row in self.connection.execute('SELECT directory FROM species').fetchall():
+                if row[0] not in directories:
+                    self.connection.execute('DELETE FROM species WHERE directory = ?', (row[0],))
@@ -5,49 +5,18 @@ import datetime
 import json
 import logging
 import os
-import shutil
-import yaml
 
-import numpy as np
-import matplotlib.pyplot as plt
-
-from arc.common import (determine_symmetry,
-                        is_same_pivot)
-
-from arc.job.trsh import (scan_quality_check,
-                          trsh_scan_job)
+from easy_rmg_model.common import (COMPRESSION_SUFFIXES,
+                                   decompressed_path,
+                                   get_compressed_path,
+                                   keep_decompressed,
+                                   transfer_files,
+                                   walk_dir)
 from easy_rmg_model.job.trsh import determine_convergence
-
-from arc.parser import (parse_1d_scan_energies,
-                        parse_scan_args,
-                        parse_trajectory,
-                        parse_xyz_from_file)
 from easy_rmg_model.parser import (parse_charge_and_mult,
                                    parse_species_in_arc_input,
                                    parse_termination_time)
-
-from arc.plotter import plot_1d_rotor_scan
-
-from arc.species.converter import (compare_confs,
-                                   molecules_from_xyz,
-                                   xyz_to_xyz_file_format)
-from easy_rmg_model.species.converter import (xyz_to_mol,
-                                              xyz_to_rotors_dict,
-                                              xyz_to_xyz_file)
-
-from arc.species.species import ARCSpecies, determine_rotor_symmetry, enumerate_bonds
-
-from easy_rmg_model.template_writer.input import ArkaneSpecies, GaussianInput
-
-from arkane.statmech import is_linear
-
-from rdmc.mol import RDKitMol
-try:
-    # openbabel 3
-    from openbabel import pybel
-except:
-    # openbabel 2
-    import pybel
+from easy_rmg_model.species.database import get_identifier
 
 
 def find_all_species_from_calcs_path(calc_path):
@@ -64,27 +33,33 @@ def find_all_species_from_calcs_path(calc_path):
     return spc_info
 
 
-def find_all_species_from_database(db_path):
+def find_all_species_from_database(db_path, catalog=None):
     """
-    A function used to find all species in the calcs folder.
+    A function used to find all species in the database folder. The species are
+    looked up from the catalog if it is given, otherwise the folder is walked through.
     """
+    if catalog is not None:
+        return catalog.get_all_species()
     spc_info = {}
-    for root, _, files in os.walk(db_path):
+    for root, dirs, files in walk_dir(db_path):
         if 'info.txt' in files:
             label = root.replace(db_path, '')
             spc_info[label] = {'label': label, 'directory': root, 'ts': False}
+            # Job folders of a species don't contain other species
+            dirs.clear()
     return spc_info
 
 
-def find_all_species_in_arc_project(project_path):
+def find_all_species_in_arc_project(project_path, as_records=False):
     """
-    A function used to find all species in the project.
+    A function used to find all species in the project. Species are returned as
+    ``SpeciesRecord`` with lazily created ``ARCSpecies`` if ``as_records`` is ``True``.
     """
     calc_path = os.path.join(project_path, 'calcs')
     input_path = os.path.join(project_path, 'input.yml')
 
     spc_info = dict()
-    spc_info.update(parse_species_in_arc_input(input_path))
+    spc_info.update(parse_species_in_arc_input(input_path, as_records=as_records))
     calc_spc_info = find_all_species_from_calcs_path(calc_path)
 
     for spc, info in spc_info.items():
@@ -106,12 +81,16 @@ def classify_jobs(spc,
 
     new_info = {job_type: [] for job_type in job_types}
 
-    for root, _, files in os.walk(spc['directory']):
-        if not output_file_name in files:
+    # The outputs may be compressed in the database
+    file_names = [output_file_name] + [output_file_name + suffix
+                                       for suffix in COMPRESSION_SUFFIXES.values()]
+    for root, _, files in walk_dir(spc['directory']):
+        file_name = next((name for name in file_names if name in files), None)
+        if not file_name:
             continue
         for job_type in job_types:
             if job_type in root:
-                new_info[job_type].append(os.path.join(root, output_file_name))
+                new_info[job_type].append(os.path.join(root, file_name))
                 break
 
     spc.update(new_info)
@@ -136,15 +115,20 @@ def find_latest_terminated_job(spc, job_types=['composite', 'freq']):
     return spc
 
 
+@keep_decompressed()
 def check_converge_and_geom_consist(spc,
                                     job_types=['composite', 'freq'],
                                     basis_job='composite'):
+    from arc.parser import parse_xyz_from_file
+    from arc.species.converter import compare_confs, molecules_from_xyz
+    from easy_rmg_model.species.converter import xyz_to_mol
 
     basis_xyz = None
     done = determine_convergence(spc[basis_job], basis_job, spc['ts'])
     if done:
         try:
-            basis_xyz = parse_xyz_from_file(spc[basis_job])
+            with decompressed_path(spc[basis_job]) as path:
+                basis_xyz = parse_xyz_from_file(path)
         except:
             pass
         else:
@@ -160,7 +144,7 @@ def check_converge_and_geom_consist(spc,
     spc['checkfile'] = ''
     spc['charge'], spc['multiplicity'] = parse_charge_and_mult(spc[basis_job])
     try:
-        spc['smiles'] = xyz_to_mol(spc['geom']).to_smiles()
+        spc['smiles'] = xyz_to_mol(spc['geom'], copy=False).to_smiles()
     except:
         try:
             spc['smiles'] = molecules_from_xyz(spc['geom'],
@@ -184,7 +168,8 @@ def check_converge_and_geom_consist(spc,
         done = determine_convergence(spc[job_type], job_type, spc['ts'])
         if done:
             try:
-                xyz_to_compare = parse_xyz_from_file(spc[job_type])
+                with decompressed_path(spc[job_type]) as path:
+                    xyz_to_compare = parse_xyz_from_file(path)
             except:
                 pass
 
@@ -200,6 +185,8 @@ def find_rotors_from_xyz(spc):
     """
     A function used to generate rotors dict from xyz.
     """
+    from easy_rmg_model.species.converter import xyz_to_rotors_dict
+
     rotors_dict = xyz_to_rotors_dict(spc['geom'])
     if rotors_dict is None:
         return
@@ -209,10 +196,15 @@ def find_rotors_from_xyz(spc):
     return spc
 
 
+@keep_decompressed()
 def filter_scans(spc, scan_filter='latest'):
     """
     A function used to filter and keep 'non_frozen' or 'latest' scans.
     """
+    from arc.common import is_same_pivot
+    from arc.parser import parse_scan_args, parse_trajectory
+    from arc.species.converter import compare_confs
+
     good_scans = []
 
     for rotor_dict in spc['rotors_dict'].values():
@@ -222,22 +214,23 @@ def filter_scans(spc, scan_filter='latest'):
 
         done = determine_convergence(scan_path, 'scan')
 
-        # Check if the scan is finished and its initial geom is consistent
-        # with the basis xyz
-        if done:
+        with decompressed_path(scan_path) as path:
+            # Check if the scan is finished and its initial geom is consistent
+            # with the basis xyz
+            if done:
+                try:
+                    init_xyz = parse_trajectory(path)[0]
+                except:
+                    continue
+                else:
+                    if not compare_confs(init_xyz, spc['geom']):
+                        continue
+
+            # Parse the scan arguments
             try:
-                init_xyz = parse_trajectory(scan_path)[0]
+                scan_args = parse_scan_args(path)
             except:
                 continue
-            else:
-                if not compare_confs(init_xyz, spc['geom']):
-                    continue
-
-        # Parse the scan arguments
-        try:
-            scan_args = parse_scan_args(scan_path)
-        except:
-            continue
 
         for rotor in spc['rotors_dict'].values():
             # Find the rotor shares same pivots
@@ -262,20 +255,25 @@ def filter_scans(spc, scan_filter='latest'):
     return spc
 
 
+@keep_decompressed()
 def check_scan_quality(spc):
     """
     A helper function used to get the status of rotor scans
     """
+    from arc.job.trsh import scan_quality_check, trsh_scan_job
+    from arc.parser import parse_1d_scan_energies, parse_scan_args
+    from arc.species.converter import xyz_to_xyz_file_format
+    from arc.species.species import determine_rotor_symmetry
 
     for rotor in spc['rotors_dict'].values():
 
-        path = rotor['scan_path']
-        if path:
-            scan_args = parse_scan_args(path)
-            energies, _ = parse_1d_scan_energies(path)
-            invalid, reason, _, actions = scan_quality_check(spc['label'], pivots=rotor['scan'][1:-1],
-                                                             energies=energies, scan_res=scan_args['step_size'],
-                                                             log_file=path)
+        if rotor['scan_path']:
+            with decompressed_path(rotor['scan_path']) as path:
+                scan_args = parse_scan_args(path)
+                energies, _ = parse_1d_scan_energies(path)
+                invalid, reason, _, actions = scan_quality_check(spc['label'], pivots=rotor['scan'][1:-1],
+                                                                 energies=energies, scan_res=scan_args['step_size'],
+                                                                 log_file=path)
         else:
             rotor['success'] = False
             rotor['invalidation_reason'] = 'Unknown'
@@ -306,7 +304,7 @@ def check_scan_quality(spc):
                                             rotor['scan'],
                                             species_scan_lists,
                                             actions,
-                                            path)
+                                            rotor['scan_path'])
         rotor['trsh_methods'] = [
             {'scan_trsh': scan_trsh, 'scan_res': scan_res}]
         rotor['archived'].append(rotor['scan_path'])
@@ -338,6 +336,13 @@ def generate_summary(spc):
 
 
 def generate_geom_info(spc, xyz_file=None):
+    import numpy as np
+    from arc.common import determine_symmetry
+    from arc.parser import parse_xyz_from_file
+    from arc.species.species import enumerate_bonds
+    from arkane.statmech import is_linear
+    from easy_rmg_model.species.converter import xyz_to_mol
+
     if not 'geom' in spc:
         xyz_file = xyz_file or os.path.join(spc['directory'], 'xyz.txt')
         try:
@@ -345,7 +350,7 @@ def generate_geom_info(spc, xyz_file=None):
         except:
             return
     try:
-        mol = xyz_to_mol(spc['geom'])
+        mol = xyz_to_mol(spc['geom'], copy=False)
     except:
         return
 
@@ -363,6 +368,7 @@ def generate_arkane_input(spc,
                           arkane_spec,
                           save_dir=None,
                           template_file=None):
+    from easy_rmg_model.template_writer.input import ArkaneSpecies
 
     save_dir = save_dir or spc['directory']
 
@@ -379,6 +385,8 @@ def generate_arkane_input(spc,
 
 
 def generate_gaussian_input(spc, gaussian_spec, scan_spec=None):
+    from easy_rmg_model.template_writer.input import GaussianInput
+
     if not ('save_path' in gaussian_spec and gaussian_spec['save_path']):
         save_dir, file_name = '', 'input.gjf'
 
@@ -402,15 +410,33 @@ def generate_gaussian_input(spc, gaussian_spec, scan_spec=None):
     gaussian.save()
 
 
-def transfer_species_jobs(spc, new_dir, output_file_name='output.out'):
+def transfer_species_jobs(spc, new_dir, output_file_name='output.out',
+                          transfer_mode='copy', max_workers=1,
+                          compress=False, compress_archived=False):
+    """
+    Transfer the job files of a species to a new directory. The files are transferred
+    by ``transfer_files``, so that they can be hard linked or reflinked instead of copied.
+
+    Args:
+        spc (dict): The species info.
+        new_dir (str): The new directory.
+        output_file_name (str): The name of the transferred output files.
+        transfer_mode (str): ``'copy'``, ``'hardlink'``, ``'reflink'`` or ``'auto'``.
+        max_workers (int): The number of threads to transfer files.
+        compress (Union[bool, str]): Save the job outputs compressed, ``'gzip'`` (or ``True``) or ``'zstd'``.
+        compress_archived (Union[bool, str]): Save the archived scans compressed.
+
+    Returns:
+        dict: Keys are the methods used, values are the numbers of files.
+    """
+    transfers = []
     for job_type in ['composite', 'sp', 'opt', 'freq']:
         if job_type in spc:
             os.makedirs(os.path.join(new_dir, job_type), exist_ok=True)
             if spc[job_type]:
-                shutil.copy(spc[job_type], os.path.join(
-                    new_dir, job_type, output_file_name))
-                spc[job_type] = os.path.join(
-                    new_dir, job_type, output_file_name)
+                new_path = os.path.join(new_dir, job_type, output_file_name)
+                transfers.append((spc[job_type], new_path, compress))
+                spc[job_type] = get_compressed_path(new_path, compress)
 
     for rotor in spc['rotors_dict'].values():
         new_rotor_dir = os.path.join(new_dir, f'scan_{str(rotor["scan"])}')
@@ -418,7 +444,8 @@ def transfer_species_jobs(spc, new_dir, output_file_name='output.out'):
         if rotor['success'] or \
             (not rotor['success'] and 'barrier' in rotor['invalidation_reason']):
             new_rotor_path = os.path.join(new_rotor_dir, output_file_name)
-            shutil.copy(rotor['scan_path'], new_rotor_path,)
+            transfers.append((rotor['scan_path'], new_rotor_path, compress))
+            new_rotor_path = get_compressed_path(new_rotor_path, compress)
             spc['scan'].remove(rotor['scan_path'])
             spc['scan'].append(new_rotor_path)
             rotor['scan_path'] = new_rotor_path
@@ -426,37 +453,62 @@ def transfer_species_jobs(spc, new_dir, output_file_name='output.out'):
             with open(os.path.join(new_rotor_dir, 'trsh.txt'), 'w') as trsh_f:
                 trsh_f.write(json.dumps(rotor['trsh_methods']))
         for file_index, archived in enumerate(rotor['archived']):
-            shutil.copy(archived, os.path.join(
-                new_rotor_dir, str(file_index), output_file_name))
+            transfers.append((archived,
+                              os.path.join(new_rotor_dir, str(file_index), output_file_name),
+                              compress_archived))
+
+    return transfer_files(transfers, mode=transfer_mode, max_workers=max_workers)
 
 
-def transfer_to_database(spc, database_path, output_file_name='output.out'):
+@keep_decompressed()
+def transfer_to_database(spc, database_path, output_file_name='output.out',
+                         catalog=None, level_of_theory=None,
+                         transfer_mode='copy', max_workers=1,
+                         compress=False, compress_archived=False):
+    from arc.parser import parse_1d_scan_energies
+    from arc.plotter import plot_1d_rotor_scan
+    from easy_rmg_model.species.converter import xyz_to_mol, xyz_to_xyz_file
 
     # Create a new folder to store
     if 'smiles' not in spc:
-        spc['smiles'] = xyz_to_mol(spc['geom']).to_smiles()
-
-    for i in range(100):
-        new_dir = os.path.join(database_path, spc['smiles'], str(i))
-        try:
-            os.makedirs(new_dir, exist_ok=False)
-        except:
-            continue
-        else:
-            break
+        spc['smiles'] = xyz_to_mol(spc['geom'], copy=False).to_smiles()
+    # The folder is named by the canonical identifier used by the catalog lookups
+    identifier = get_identifier(spc) or spc['smiles']
+
+    if catalog is not None:
+        if os.path.abspath(catalog.database_path) != os.path.abspath(database_path):
+            raise ValueError(f'The catalog ({catalog.database_path}) does not belong to '
+                             f'the database ({database_path}).')
+        new_dir = catalog.reserve_directory(identifier, label=spc.get('label', ''))
+    else:
+        for i in range(100):
+            new_dir = os.path.join(database_path, identifier, str(i))
+            try:
+                os.makedirs(new_dir, exist_ok=False)
+            except:
+                continue
+            else:
+                break
 
     # make sure it is the updated summary
     generate_summary(spc)
     with open(os.path.join(new_dir, 'info.txt'), 'w') as info:
         info.write(spc['summary'])
 
-    transfer_species_jobs(spc, new_dir, output_file_name)
+    transfer_species_jobs(spc, new_dir, output_file_name,
+                          transfer_mode=transfer_mode,
+                          max_workers=max_workers,
+                          compress=compress,
+                          compress_archived=compress_archived)
 
     spc['directory'] = new_dir
+    if catalog is not None:
+        catalog.add_species(spc, level_of_theory=level_of_theory, identifier=identifier)
     xyz_to_xyz_file(spc)
     for rotor in spc['rotors_dict'].values():
         try:
-            energies, angles = parse_1d_scan_energies(rotor['scan_path'])
+            with decompressed_path(rotor['scan_path']) as path:
+                energies, angles = parse_1d_scan_energies(path)
             plot_1d_rotor_scan(angles=angles,
                                energies=energies,
                                path=os.path.dirname(rotor['scan_path']),
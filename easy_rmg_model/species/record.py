@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+The toolbox for the compact species records. A ``SpeciesRecord`` stores the identifiers
+of a species (label, SMILES, adjacency list, xyz, ...) in slots and only creates the RMG
+``Species`` and the ``ARCSpecies`` at the first access. It also behaves as the species
+info dicts used across the package, so the functions taking species info dicts accept
+records as well.
+"""
+
+from collections.abc import MutableMapping
+from typing import Optional
+
+# Marks the ``'species'`` key deleted from a record
+_DELETED = object()
+
+
+class SpeciesRecord(MutableMapping):
+    """
+    A compact species record.
+
+    Args:
+        label (str): The label of the species.
+        smiles (Optional[str]): The SMILES.
+        adjlist (Optional[str]): The adjacency list.
+        xyz (Optional[dict]): The geometry.
+        multiplicity (Optional[int]): The spin multiplicity.
+        charge (Optional[int]): The charge.
+        ts (Optional[bool]): Whether it is a TS.
+        directory (Optional[str]): The directory of the calculations.
+        kwargs: Other species info, stored in an extra dict.
+    """
+    _FIELDS = ('label', 'smiles', 'adjlist', 'xyz', 'multiplicity', 'charge', 'ts', 'directory')
+    __slots__ = _FIELDS + ('_extra', '_species', '_arc_species', '_species_item')
+
+    def __init__(self,
+                 label: str,
+                 smiles: Optional[str] = None,
+                 adjlist: Optional[str] = None,
+                 xyz: Optional[dict] = None,
+                 multiplicity: Optional[int] = None,
+                 charge: Optional[int] = None,
+                 ts: Optional[bool] = None,
+                 directory: Optional[str] = None,
+                 **kwargs):
+        self.label = label
+        self.smiles = smiles
+        self.adjlist = adjlist
+        self.xyz = xyz
+        self.multiplicity = multiplicity
+        self.charge = charge
+        self.ts = ts
+        self.directory = directory
+        self._species = None
+        self._arc_species = None
+        # The value assigned to the ``'species'`` key, if any
+        self._species_item = None
+        # Only create the extra dict if needed
+        self._extra = None
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __repr__(self):
+        identifier = self.smiles or ('adjlist' if self.adjlist else 'xyz' if self.xyz else '')
+        return f'SpeciesRecord({self.label!r}, {identifier!r})'
+
+    @property
+    def species(self):
+        """
+        The RMG ``Species``, generated at the first access. ``None`` if the record has no geom info.
+        """
+        if self._species is None:
+            from easy_rmg_model.rmg2arc.species_dict import species_from_spc_info
+            self._species = species_from_spc_info(self.to_dict())
+        return self._species
+
+    @species.setter
+    def species(self, species):
+        self._species = species
+
+    @property
+    def arc_species(self):
+        """
+        The ``ARCSpecies``, generated at the first access. ``None`` if the record has no geom info.
+        """
+        if self._arc_species is None:
+            from arc.species.species import ARCSpecies
+            kwargs = {key: getattr(self, key) for key in ['multiplicity', 'charge']
+                      if getattr(self, key) is not None}
+            if self.smiles:
+                kwargs['smiles'] = self.smiles
+            elif self.adjlist:
+                kwargs['adjlist'] = self.adjlist
+            elif self.xyz:
+                from easy_rmg_model.species.converter import xyz_to_mol
+                kwargs['smiles'] = xyz_to_mol(self.xyz, copy=False).to_smiles()
+            else:
+                return
+            self._arc_species = ARCSpecies(label=self.label, **kwargs)
+        return self._arc_species
+
+    @arc_species.setter
+    def arc_species(self, arc_species):
+        self._arc_species = arc_species
+
+    def release(self):
+        """
+        Release the ``Species`` and ``ARCSpecies`` to save memory. They are
+        generated again at the next access. A species assigned to the ``'species'`` key is kept.
+        """
+        self._species = None
+        self._arc_species = None
+
+    # The dict interface. The ``'species'`` key is the ``ARCSpecies`` created lazily, the same
+    # as in the species info generated by ``parse_species_in_arc_input``, unless another
+    # species is assigned to it or it is deleted.
+    def __getitem__(self, key):
+        if key == 'species':
+            if self._species_item is _DELETED:
+                raise KeyError(key)
+            value = self._species_item if self._species_item is not None else self.arc_species
+        elif key in self._FIELDS:
+            value = getattr(self, key)
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        else:
+            raise KeyError(key)
+        # Unassigned fields are regarded as missing keys
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDS:
+            setattr(self, key, value)
+        elif key == 'species':
+            # Species info may store either kind of species, which is returned as is
+            self._species_item = value
+            if type(value).__name__ == 'ARCSpecies':
+                self._arc_species = value
+            elif type(value).__name__ == 'Species':
+                self._species = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._FIELDS:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif key == 'species':
+            if key not in self:
+                raise KeyError(key)
+            self._species_item = _DELETED
+            self._arc_species = None
+        else:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+
+    def __iter__(self):
+        for key in self._FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        # The species is not created by iterating over the keys
+        if 'species' in self:
+            yield 'species'
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key == 'species':
+            if self._species_item is _DELETED:
+                return False
+            # Can be created if having geom info
+            return self._species_item is not None or self._arc_species is not None \
+                or bool(self.smiles or self.adjlist or self.xyz)
+        if key in self._FIELDS:
+            return getattr(self, key) is not None
+        return bool(self._extra) and key in self._extra
+
+    def __getstate__(self):
+        # Heavy objects are not pickled, they will be generated again
+        state = {key: getattr(self, key) for key in self._FIELDS + ('_extra',)}
+        state['species_deleted'] = self._species_item is _DELETED
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        self._species_item = _DELETED if state.pop('species_deleted', False) else None
+        for key, value in state.items():
+            setattr(self, key, value)
+        self._species = None
+        self._arc_species = None
+
+    @classmethod
+    def from_dict(cls, spc: dict) -> 'SpeciesRecord':
+        """
+        Create a record from a species info dict.
+
+        Args:
+            spc (dict): The species info, which has at least ``label``.
+
+        Returns:
+            SpeciesRecord: The record.
+        """
+        if isinstance(spc, cls):
+            return spc
+        if 'label' not in spc:
+            raise ValueError('Invalid species info which should at least have label info.')
+        record = cls(label=spc['label'])
+        for key, value in spc.items():
+            if key != 'label':
+                record[key] = value
+        return record
+
+    def to_dict(self, include_species: bool = False) -> dict:
+        """
+        Convert the record to a species info dict.
+
+        Args:
+            include_species (bool): Whether to include the ``'species'`` item, by default the
+                                    ``ARCSpecies``. It is generated if not yet.
+
+        Returns:
+            dict: The species info.
+        """
+        spc = {key: getattr(self, key) for key in self._FIELDS
+               if getattr(self, key) is not None}
+        if self._extra:
+            spc.update(self._extra)
+        if include_species and self.get('species') is not None:
+            spc['species'] = self['species']
+        return spc
+
+
+def records_from_spc_info(spc_info: dict) -> dict:
+    """
+    Convert species info dicts to records.
+
+    Args:
+        spc_info (dict): Keys are labels, values are species info dicts.
+
+    Returns:
+        dict: Keys are labels, values are ``SpeciesRecord``.
+    """
+    return {label: SpeciesRecord.from_dict(spc) for label, spc in spc_info.items()}
+
+
+def spc_info_from_records(records: dict,
+                          include_species: bool = False) -> dict:
+    """
+    Convert records to species info dicts.
+
+    Args:
+        records (dict): Keys are labels, values are ``SpeciesRecord``.
+        include_species (bool): Whether to include the ``ARCSpecies`` as ``'species'``.
+
+    Returns:
+        dict: Keys are labels, values are species info dicts.
+    """
+    return {label: record.to_dict(include_species=include_species)
+            for label, record in records.items()}
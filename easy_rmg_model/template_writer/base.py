@@ -6,6 +6,38 @@ import os.path
 
 from jinja2 import Environment, FileSystemLoader, Template
 
+# Compiled templates shared by all template writers in the process
+_TEMPLATE_CACHE = {}
+
+
+def get_compiled_template(template_file: str = None,
+                          template_string: str = '') -> Template:
+    """
+    Get the compiled jinja2 template. Templates are compiled once and cached,
+    template files are recompiled if they are modified.
+
+    Args:
+        template_file (str): The path to the template file.
+        template_string (str): The template used if ``template_file`` is not assigned.
+
+    Returns:
+        Template: The compiled template.
+    """
+    if template_file:
+        template_path = os.path.abspath(template_file)
+        key = ('file', template_path, os.path.getmtime(template_path))
+    else:
+        key = ('string', template_string)
+    if key not in _TEMPLATE_CACHE:
+        if template_file:
+            template_dir, file_name = os.path.split(template_path)
+            env = Environment(loader=FileSystemLoader(template_dir),
+                              autoescape=True)
+            _TEMPLATE_CACHE[key] = env.get_template(file_name)
+        else:
+            _TEMPLATE_CACHE[key] = Template(template_string, autoescape=True)
+    return _TEMPLATE_CACHE[key]
+
 
 class BaseTemplateWriter(object):
     """
@@ -27,14 +59,7 @@ class BaseTemplateWriter(object):
     
     @property
     def template(self):
-        if self.template_file:
-            template_dir, template_file = os.path.split(self.template_path)
-            env = Environment(loader=FileSystemLoader(template_dir),
-                              autoescape=True)
-            template = env.get_template(template_file)
-        else:
-            template = Template(self.default_template, autoescape=True)
-        return template
+        return get_compiled_template(self.template_file, self.default_template)
 
     @property
     def rendered_template(self):
@@ -1,6 +1,26 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
-from easy_rmg_model.template_writer.input.gaussian_input import GaussianInput
-from easy_rmg_model.template_writer.input.arkane_input import ArkaneSpecies, ArkaneThermo
-from easy_rmg_model.template_writer.input.rmg_simulate_input import RMGSimulateInput
+import importlib
+
+# Writers are imported at first access, so that e.g. using RMGSimulateInput
+# doesn't import Arkane through ArkaneSpecies
+_WRITERS = {
+    'GaussianInput': 'easy_rmg_model.template_writer.input.gaussian_input',
+    'ArkaneSpecies': 'easy_rmg_model.template_writer.input.arkane_input',
+    'ArkaneThermo': 'easy_rmg_model.template_writer.input.arkane_input',
+    'RMGSimulateInput': 'easy_rmg_model.template_writer.input.rmg_simulate_input',
+    'SpeciesDictionaryHandle': 'easy_rmg_model.template_writer.input.rmg_simulate_input',
+}
+
+__all__ = list(_WRITERS)
+
+
+def __getattr__(name):
+    if name in _WRITERS:
+        return getattr(importlib.import_module(_WRITERS[name]), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,14 +1,38 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
-import json
+from __future__ import annotations
 
-from arkane.encorr.corr import assign_frequency_scale_factor
-from arkane.input import process_model_chemistry
-from arkane.modelchem import LOT
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from easy_rmg_model.template_writer import BaseTemplateWriter
 
+# Arkane is imported at first use, since it is slow to import
+if TYPE_CHECKING:
+    from arkane.modelchem import LOT
+
+
+@lru_cache(maxsize=None)
+def get_model_chemistry(model_chemistry: str) -> LOT:
+    """
+    Get the parsed model chemistry. The result is shared by all instances
+    using the same model chemistry string.
+    """
+    from arkane.input import process_model_chemistry
+    return process_model_chemistry(model_chemistry)
+
+
+@lru_cache(maxsize=None)
+def get_freq_scale_factor(model_chemistry: LOT) -> float:
+    """
+    Get the frequency scale factor of a model chemistry. The result is shared
+    by all instances using the same model chemistry.
+    """
+    from arkane.encorr.corr import assign_frequency_scale_factor
+    return assign_frequency_scale_factor(model_chemistry)
+
 
 class ArkaneSpecies(BaseTemplateWriter):
 
@@ -80,17 +104,18 @@ rotors = [
 
     @model_chemistry.setter
     def model_chemistry(self, value):
+        from arkane.modelchem import LOT
         if isinstance(value, str):
-            self._model_chemistry = process_model_chemistry(value)
+            self._model_chemistry = get_model_chemistry(value)
         elif isinstance(value, LOT):
-            self._model_chemsitry = value
+            self._model_chemistry = value
 
     @property
     def freq_scale_factor(self):
-        if not self._freq_scale_factor:
-            self._freq_scale_factor = assign_frequency_scale_factor(
-                self._model_chemistry)
-        return self._freq_scale_factor
+        if self._freq_scale_factor:
+            return self._freq_scale_factor
+        # Not stored, so that it follows the changes of model chemistry
+        return get_freq_scale_factor(self._model_chemistry)
 
     @freq_scale_factor.setter
     def freq_scale_factor(self, value):
@@ -243,17 +268,18 @@ thermo("{{ species_label }}",
 
     @model_chemistry.setter
     def model_chemistry(self, value):
+        from arkane.modelchem import LOT
         if isinstance(value, str):
-            self._model_chemistry = process_model_chemistry(value)
+            self._model_chemistry = get_model_chemistry(value)
         elif isinstance(value, LOT):
-            self._model_chemsitry = value
+            self._model_chemistry = value
 
     @property
     def freq_scale_factor(self):
-        if not self._freq_scale_factor:
-            self._freq_scale_factor = assign_frequency_scale_factor(
-                self._model_chemistry)
-        return self._freq_scale_factor
+        if self._freq_scale_factor:
+            return self._freq_scale_factor
+        # Not stored, so that it follows the changes of model chemistry
+        return get_freq_scale_factor(self._model_chemistry)
 
     @freq_scale_factor.setter
     def freq_scale_factor(self, value):
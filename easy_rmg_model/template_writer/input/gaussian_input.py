@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
+import json
 import os.path
 
-from arc.species.converter import  (xyz_file_format_to_xyz,
-                                    xyz_to_str)
-
 from easy_rmg_model.template_writer import BaseTemplateWriter
 
+# Route lines shared by GaussianInput with the same specifications
+_ROUTE_CACHE = {}
+
+
 class GaussianInput(BaseTemplateWriter):
     """
     A Input class used to create input file for quantum calculation using Gaussian.
@@ -130,8 +132,26 @@ name
     def other_args(self):
         return 'iop(2/9=2000)'
 
+    @property
+    def route_key(self):
+        """
+        The specifications that determine the route line. The route line is
+        looked up again whenever any of them changes. The class is part of the key,
+        since subclasses may override the ``*_args`` properties.
+        """
+        return (type(self),
+                json.dumps([self.fine, self.ts, self.job_type, self.level_of_theory,
+                            self.trsh, bool(self.checkfile)],
+                           sort_keys=True, default=str))
+
     @property
     def calculation_args(self):
+        key = self.route_key
+        if key not in _ROUTE_CACHE:
+            _ROUTE_CACHE[key] = self._generate_calculation_args()
+        return _ROUTE_CACHE[key]
+
+    def _generate_calculation_args(self):
         arg_list = ['opt', 'scf', 'integral', 'guess', 'freq', 'level_of_theory',
                     'other']
         if 'freq' not in self.job_type:
@@ -147,6 +167,8 @@ name
 
     @property
     def geometry_args(self):
+        from arc.species.converter import xyz_file_format_to_xyz, xyz_to_str
+
         if isinstance(self.geom, str):
             # TODO: check the xyz is valid
             return self.geom
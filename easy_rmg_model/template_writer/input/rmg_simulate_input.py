@@ -2,12 +2,136 @@
 # encoding: utf-8
 
 import os
-
-from rmgpy.chemkin import load_species_dictionary
-from rmgpy.molecule.molecule import Molecule
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
 
 from easy_rmg_model.template_writer import BaseTemplateWriter
 
+
+class SpeciesDictionaryHandle(object):
+    """
+    A species dictionary shared by many RMGSimulateInput. Handles are cached by
+    the dictionary path or by the ``dict`` instance, and the label / SMILES
+    resolutions are memoized, so that the dictionary is only parsed and searched once.
+    The cache is LRU-bounded, and a handle of a path is replaced once the file
+    is modified.
+    """
+
+    # LRU cache of handles. Paths map to (mtime, handle), dicts are keyed by their ids.
+    _handles = OrderedDict()
+    _max_handles = 8
+
+    def __init__(self, spc_dict: dict):
+        self.spc_dict = spc_dict
+        self._label_by_smiles = {}
+        self._smiles_by_label = {}
+        self._consistency = {}
+
+    @classmethod
+    def get(cls, spc_dict):
+        """
+        Get the shared handle of a species dictionary.
+
+        Args:
+            spc_dict (Union[str, dict, SpeciesDictionaryHandle]): The path to the species
+                dictionary, a loaded species dictionary or a handle.
+
+        Returns:
+            SpeciesDictionaryHandle: The shared handle.
+        """
+        if isinstance(spc_dict, cls):
+            return spc_dict
+        elif isinstance(spc_dict, dict):
+            key, version = ('dict', id(spc_dict)), None
+        elif isinstance(spc_dict, str) and os.path.isfile(spc_dict):
+            key, version = ('path', os.path.abspath(spc_dict)), os.path.getmtime(spc_dict)
+        else:
+            raise ValueError(f'Species dictionary ({spc_dict}) is invalid')
+
+        cached = cls._handles.get(key)
+        if cached is not None:
+            cached_version, handle = cached
+            # An id can be reused by another dict once the cached one is released
+            if cached_version == version and \
+                    (version is not None or handle.spc_dict is spc_dict):
+                cls._handles.move_to_end(key)
+                return handle
+
+        if isinstance(spc_dict, dict):
+            handle = cls(spc_dict)
+        else:
+            from rmgpy.chemkin import load_species_dictionary
+            handle = cls(load_species_dictionary(spc_dict))
+        # Replace the stale version of the same key
+        cls._handles[key] = (version, handle)
+        cls._handles.move_to_end(key)
+        while len(cls._handles) > cls._max_handles:
+            cls._handles.popitem(last=False)
+        return handle
+
+    @classmethod
+    def clear(cls):
+        """
+        Clear all of the cached handles.
+        """
+        cls._handles.clear()
+
+    def get_label(self, smiles: str) -> Optional[str]:
+        """
+        Get the label of the species in the dictionary isomorphic to the SMILES.
+        """
+        if smiles not in self._label_by_smiles:
+            from rmgpy.molecule.molecule import Molecule
+            mol = Molecule().from_smiles(smiles)
+            for label, spc in self.spc_dict.items():
+                if spc.is_isomorphic(mol):
+                    break
+            else:
+                label = None
+            self._label_by_smiles[smiles] = label
+        return self._label_by_smiles[smiles]
+
+    def get_smiles(self, label: str) -> Optional[str]:
+        """
+        Get the SMILES of the species with the label in the dictionary.
+        """
+        if label not in self._smiles_by_label:
+            spc = self.spc_dict.get(label)
+            self._smiles_by_label[label] = spc.molecules[0].to_smiles() if spc else None
+        return self._smiles_by_label[label]
+
+    def is_consistent(self, label: str, smiles: str) -> bool:
+        """
+        Check if the species with the label in the dictionary is isomorphic to the SMILES.
+        """
+        if (label, smiles) not in self._consistency:
+            from rmgpy.molecule.molecule import Molecule
+            self._consistency[(label, smiles)] = label in self.spc_dict \
+                and self.spc_dict[label].is_isomorphic(Molecule().from_smiles(smiles))
+        return self._consistency[(label, smiles)]
+
+
+@lru_cache(maxsize=None)
+def get_oxygen_to_fuel(smiles: str) -> float:
+    """
+    Get the stoichiometric oxygen-to-fuel ratio of a fuel given its SMILES.
+    """
+    from rmgpy.molecule.molecule import Molecule
+
+    mol = Molecule().from_smiles(smiles)
+    atom_dict = mol.get_element_count()
+    oxygen_to_fuel = 0
+    for element, counts in atom_dict.items():
+        if element == 'C':
+            oxygen_to_fuel += counts
+        elif element == 'H':
+            oxygen_to_fuel += counts / 4
+        elif element == 'O':
+            oxygen_to_fuel -= counts / 2
+    return oxygen_to_fuel
+
+
 class RMGSimulateInput(BaseTemplateWriter):
 
     default_settings = {
@@ -92,14 +216,12 @@ simulator(
 
     @property
     def spc_dict(self):
-        return self._spc_dict
+        return self._spc_handle.spc_dict
 
     @spc_dict.setter
     def spc_dict(self, value):
-        if not os.path.isfile(value):
-            raise ValueError(f'Species dictionary ({value}) is invalid')
-        else:
-            self._spc_dict = load_species_dictionary(value)
+        # Accept a path, a loaded dictionary or a SpeciesDictionaryHandle
+        self._spc_handle = SpeciesDictionaryHandle.get(value)
 
     @property
     def fuel(self):
@@ -121,17 +243,7 @@ simulator(
 
     @property
     def oxygen_to_fuel(self):
-        mol = Molecule().from_smiles(self.fuel['smiles'])
-        atom_dict = mol.get_element_count()
-        oxygen_to_fuel = 0
-        for element, counts in atom_dict.items():
-            if element == 'C':
-                oxygen_to_fuel += counts
-            elif element == 'H':
-                oxygen_to_fuel += counts / 4
-            elif element == 'O':
-                oxygen_to_fuel -= counts / 2
-        return oxygen_to_fuel
+        return get_oxygen_to_fuel(self.fuel['smiles'])
 
     @property
     def sensitivity(self):
@@ -139,28 +251,19 @@ simulator(
 
     def update_spc_info(self, value):
         if 'smiles' in value and 'label' not in value:
-            mol = Molecule().from_smiles(value['smiles'])
-            for label, spc in self.spc_dict.items():
-                if spc.is_isomorphic(mol):
-                    value['label'] = label
-                    break
-            else:
-                raise ValueError(f'Given SMILES ({value["smi"]}) invalid.')
+            label = self._spc_handle.get_label(value['smiles'])
+            if label is None:
+                raise ValueError(f'Given SMILES ({value["smiles"]}) invalid.')
+            value['label'] = label
         elif 'smiles' not in value and 'label' in value:
-            for label, spc in self.spc_dict.items():
-                if label == value['label']:
-                    value['smiles'] = spc.molecules[0].to_smiles()
-                    break
-            else:
+            smiles = self._spc_handle.get_smiles(value['label'])
+            if smiles is None:
                 raise ValueError(f'Given label ({value["label"]}) invalid.')
+            value['smiles'] = smiles
         elif 'smiles' in value and 'label' in value:
-            mol = Molecule().from_smiles(value['smiles'])
-            for label, spc in self.spc_dict.items():
-                if label == value['label'] and spc.is_isomorphic(mol):
-                    break
-            else:
+            if not self._spc_handle.is_consistent(value['label'], value['smiles']):
                 raise ValueError(
-                    f'Given label ({value["label"]}) and SMILES ({value["smi"]}) are invalid.')
+                    f'Given label ({value["label"]}) and SMILES ({value["smiles"]}) are invalid.')
         return value
 
     def to_dict(self):
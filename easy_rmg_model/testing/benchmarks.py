@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+The benchmarks of the key entry points, run on the fixtures generated by
+``easy_rmg_model.testing.fixtures.generate_fixtures``. Each benchmark is a function
+takes the fixtures and returns the callable to be timed, so that the setup
+(e.g., loading libraries) is not timed.
+"""
+
+import contextlib
+import io
+import os
+import time
+from typing import Callable, Optional
+
+
+def _prepare_combine_arc_species_inputs(fixtures: dict) -> Callable:
+    from easy_rmg_model.rmg2arc.arc_input import combine_arc_species_inputs
+    return lambda: combine_arc_species_inputs(*fixtures['arc_inputs'])
+
+
+def _prepare_find_species_from_spc_dict(fixtures: dict) -> Callable:
+    from easy_rmg_model.rmg2arc.species_dict import (find_species_from_spc_dict,
+                                                     load_spc_dict)
+    spc_dict = load_spc_dict(fixtures['species_dictionary'])
+    # Unknown labels and the species at the end of the dictionary are the worst cases
+    queries = [{'label': f'query_{i}', 'smiles': spc['smiles']}
+               for i, spc in enumerate(fixtures['species'][-20:])]
+
+    def run():
+        for query in queries:
+            find_species_from_spc_dict(query, spc_dict)
+    return run
+
+
+def _prepare_get_species_aliases(fixtures: dict) -> Callable:
+    from easy_rmg_model.rmg2arc.chemkin import get_species_aliases
+    return lambda: get_species_aliases(fixtures['chemkin'])
+
+
+def _prepare_get_spc_label_from_fluxdiagram(fixtures: dict) -> Callable:
+    import pydot  # Skip the benchmark if not installed
+    from easy_rmg_model.rmg2arc.fluxdiagram import get_spc_label_from_fluxdiagram
+    return lambda: get_spc_label_from_fluxdiagram(fixtures['flux_diagram'])
+
+
+def _prepare_get_spc_label_from_sensitivity(fixtures: dict) -> Callable:
+    import pandas  # Skip the benchmark if not installed
+    from easy_rmg_model.rmg2arc.sensitivity import get_spc_label_from_sensitivity
+    return lambda: get_spc_label_from_sensitivity(fixtures['sensitivity'])
+
+
+def _prepare_get_importance_scores(fixtures: dict) -> Callable:
+    import pandas, pydot  # Skip the benchmark if not installed
+    from easy_rmg_model.rmg2arc.importance import get_importance_scores, select_top_species
+
+    def run():
+        scores = get_importance_scores(sensitivity_files=[fixtures['sensitivity']],
+                                       flux_files=[fixtures['flux_diagram']])
+        select_top_species(scores, top_k=50)
+    return run
+
+
+def _prepare_merge_thermo_lib(fixtures: dict) -> Callable:
+    from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
+    from easy_rmg_model.rmg2arc.thermo_db import merge_thermo_lib
+
+    libs = []
+    for key in ['thermo_library_base', 'thermo_library_to_add']:
+        lib = ThermoLibrary()
+        lib.load(fixtures[key], ThermoDatabase().local_context, ThermoDatabase().global_context)
+        lib.label = key
+        libs.append(lib)
+    return lambda: merge_thermo_lib(libs[0], libs[1], ThermoLibrary())
+
+
+def _prepare_diff_thermo_libs(fixtures: dict) -> Callable:
+    import pandas  # Skip the benchmark if not installed
+    from easy_rmg_model.rmg2arc.thermo_db import diff_thermo_libs, load_thermo_libs
+
+    paths = [fixtures['thermo_library_base'], fixtures['thermo_library_to_compare']]
+    libs = load_thermo_libs(paths).libraries
+    return lambda: diff_thermo_libs(libs[paths[0]], libs[paths[1]])
+
+
+def _prepare_find_species_in_thermo_libraries(fixtures: dict) -> Callable:
+    from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
+    from easy_rmg_model.rmg2arc.thermo_db import (ThermoLibraryIndex,
+                                                  find_species_in_thermo_libraries)
+
+    lib = ThermoLibrary()
+    lib.load(fixtures['thermo_library_base'],
+             ThermoDatabase().local_context, ThermoDatabase().global_context)
+    lib.label = 'thermo_library_base'
+    index = ThermoLibraryIndex([lib])
+    spc_info = {spc['label']: spc for spc in fixtures['species']}
+    return lambda: find_species_in_thermo_libraries(spc_info, index)
+
+
+def _prepare_merge_kinetics_lib(fixtures: dict) -> Callable:
+    import numpy  # Skip the benchmark if not installed
+    from easy_rmg_model.rmg2arc.kinetics_db import load_kinetics_lib, merge_kinetics_lib
+
+    base_lib = load_kinetics_lib(fixtures['kinetics_library_base'])
+    lib_to_add = load_kinetics_lib(fixtures['kinetics_library_to_add'])
+    return lambda: merge_kinetics_lib(base_lib, lib_to_add, policy='faster')
+
+
+def _prepare_species_info_chain(fixtures: dict) -> Callable:
+    from easy_rmg_model.species.info import (classify_jobs,
+                                             find_all_species_in_arc_project,
+                                             find_latest_terminated_job)
+
+    def run():
+        spc_info = find_all_species_in_arc_project(fixtures['arc_project'])
+        for spc in spc_info.values():
+            classify_jobs(spc)
+            find_latest_terminated_job(spc)
+    return run
+
+
+def _prepare_classify_job_outputs(fixtures: dict) -> Callable:
+    from easy_rmg_model.common import find_files
+    from easy_rmg_model.job.trsh import classify_job_outputs
+
+    files = find_files(fixtures['arc_project'], r'^output\.out$')
+    # The job folders are named as <job type>_a<index>
+    jobs = [(file, os.path.basename(os.path.dirname(file)).split('_')[0]) for file in files]
+    return lambda: classify_job_outputs(jobs, max_workers=4)
+
+
+BENCHMARKS = {
+    'combine_arc_species_inputs': _prepare_combine_arc_species_inputs,
+    'find_species_from_spc_dict': _prepare_find_species_from_spc_dict,
+    'get_species_aliases': _prepare_get_species_aliases,
+    'get_spc_label_from_fluxdiagram': _prepare_get_spc_label_from_fluxdiagram,
+    'get_spc_label_from_sensitivity': _prepare_get_spc_label_from_sensitivity,
+    'get_importance_scores': _prepare_get_importance_scores,
+    'merge_thermo_lib': _prepare_merge_thermo_lib,
+    'find_species_in_thermo_libraries': _prepare_find_species_in_thermo_libraries,
+    'diff_thermo_libs': _prepare_diff_thermo_libs,
+    'merge_kinetics_lib': _prepare_merge_kinetics_lib,
+    'species_info_chain': _prepare_species_info_chain,
+    'classify_job_outputs': _prepare_classify_job_outputs,
+}
+
+
+def time_benchmark(prepare: Callable,
+                   fixtures: dict,
+                   repeat: int = 3) -> float:
+    """
+    Time a benchmark. The setup is done before each run, since some entry points
+    modify their inputs, and the messages printed are suppressed.
+
+    Args:
+        prepare (Callable): A function takes the fixtures and returns the callable to be timed.
+        fixtures (dict): The fixtures.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The fastest wall time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = prepare(fixtures)
+            t0 = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def run_benchmarks(fixtures: dict,
+                   names: Optional[list] = None,
+                   repeat: int = 3) -> dict:
+    """
+    Run the benchmarks. The benchmarks whose dependencies are not installed are skipped.
+
+    Args:
+        fixtures (dict): The fixtures.
+        names (Optional[list]): The names of the benchmarks. All benchmarks if not assigned.
+        repeat (int): The number of runs of each benchmark.
+
+    Returns:
+        dict: Keys are the benchmark names, values are the timings in seconds.
+              ``None`` if skipped.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError(f'Invalid benchmark ({name}), should be one of {list(BENCHMARKS)}.')
+        try:
+            results[name] = time_benchmark(BENCHMARKS[name], fixtures, repeat)
+        except ImportError as e:
+            print(f'Skip {name}: {e}')
+            results[name] = None
+    return results
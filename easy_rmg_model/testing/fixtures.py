@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+The toolbox for generating synthetic RMG/ARC fixtures at a configurable scale, e.g.,
+species dictionaries, annotated Chemkin files, flux diagrams, sensitivity results,
+thermo libraries, ARC inputs and fake ARC project trees with Gaussian logs.
+The fixtures are made of linear chains (alkanes, alcohols, hydroperoxides and their
+radicals), so that all species are distinct and no RMG installation is needed to
+generate them.
+"""
+
+import os
+import random
+from typing import Optional
+
+from easy_rmg_model.common import save_yaml_file
+
+VALENCES = {'C': 4, 'O': 2}
+LONE_PAIRS = {'C': 0, 'O': 2, 'H': 0}
+ATOMIC_NUMBERS = {'H': 1, 'C': 6, 'O': 8}
+
+
+def _iter_chain_species():
+    """
+    Iterate over the distinct linear chain species, as tuples of (number of carbons,
+    the substituent, the position of the substituent, the position of the radical).
+    Mirror images of a chain are only generated once.
+    """
+    n = 1
+    while True:
+        seen = set()
+        for group in [None, 'O', 'OO']:
+            for pos in ([None] if group is None else range(n)):
+                for rad in [None] + list(range(n)):
+                    key = (pos, rad)
+                    mirror = tuple(None if i is None else n - 1 - i for i in key)
+                    canonical = min([key, mirror], key=lambda k: [-1 if i is None else i for i in k])
+                    if (group, canonical) in seen:
+                        continue
+                    seen.add((group, canonical))
+                    yield n, group, pos, rad
+        n += 1
+
+
+def _build_chain(n: int,
+                 group: Optional[str],
+                 pos: Optional[int],
+                 rad: Optional[int]) -> dict:
+    """
+    Build the atoms, bonds, SMILES and geometry of a linear chain species.
+    """
+    symbols = ['C'] * n
+    bonds = [(i, i + 1) for i in range(n - 1)]
+    unpaired = [0] * n
+    if rad is not None:
+        unpaired[rad] = 1
+    if group:
+        previous = pos
+        for _ in group:
+            symbols.append('O')
+            unpaired.append(0)
+            bonds.append((previous, len(symbols) - 1))
+            previous = len(symbols) - 1
+    heavy_num = len(symbols)
+    degrees = [0] * heavy_num
+    for i, j in bonds:
+        degrees[i] += 1
+        degrees[j] += 1
+    num_hs = [VALENCES[symbol] - degrees[i] - unpaired[i] for i, symbol in enumerate(symbols)]
+    for i in range(heavy_num):
+        for _ in range(num_hs[i]):
+            symbols.append('H')
+            unpaired.append(0)
+            bonds.append((i, len(symbols) - 1))
+
+    # SMILES
+    smiles = ''
+    for i in range(n):
+        atom = 'C' if i != rad else (f'[CH{num_hs[i]}]' if num_hs[i] > 1 else
+                                     '[CH]' if num_hs[i] == 1 else '[C]')
+        if group and i == pos:
+            atom += f'({group})'
+        smiles += atom
+
+    # A rough zig-zag geometry, only good for parsing
+    coords = []
+    for i, symbol in enumerate(symbols[:heavy_num]):
+        if i < n:
+            coords.append((1.26 * i, 0.89 * (i % 2), 0.0))
+        else:
+            x, y, _ = coords[[b[0] for b in bonds if b[1] == i][0]]
+            coords.append((x, y + 1.43 if y <= 0.0 else y - 1.43, 0.0))
+    h_offsets = [(0.0, 0.0, 1.09), (0.0, 0.0, -1.09), (0.0, -1.09, 0.0), (0.0, 1.09, 0.0)]
+    h_counts = [0] * heavy_num
+    for i, j in bonds[len(bonds) - (len(symbols) - heavy_num):]:
+        dx, dy, dz = h_offsets[h_counts[i]]
+        h_counts[i] += 1
+        x, y, z = coords[i]
+        coords.append((x + dx, y + dy, z + dz))
+
+    counts = [('C', n), ('H', len(symbols) - heavy_num), ('O', len(group or ''))]
+    formula = ''.join(f'{element}{count if count > 1 else ""}'
+                      for element, count in counts if count)
+    return {'symbols': symbols, 'bonds': bonds, 'unpaired': unpaired,
+            'smiles': smiles, 'formula': formula,
+            'multiplicity': 1 + sum(unpaired),
+            'coords': coords}
+
+
+def _to_adjlist(chain: dict) -> str:
+    """
+    Convert the chain to an RMG adjacency list.
+    """
+    neighbors = [[] for _ in chain['symbols']]
+    for i, j in chain['bonds']:
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+    lines = [f'multiplicity {chain["multiplicity"]}'] if chain['multiplicity'] > 1 else []
+    for i, symbol in enumerate(chain['symbols']):
+        bonds = ' '.join(f'{{{j + 1},S}}' for j in sorted(neighbors[i]))
+        lines.append(f'{i + 1:<3d}{symbol} u{chain["unpaired"][i]} '
+                     f'p{LONE_PAIRS[symbol]} c0 {bonds}')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_species(num: int) -> list:
+    """
+    Generate distinct species.
+
+    Args:
+        num (int): The number of species.
+
+    Returns:
+        list: Species info with ``label``, ``chemkin_label``, ``smiles``,
+              ``adjlist``, ``multiplicity`` and ``xyz`` (ARC xyz dict).
+    """
+    species = []
+    for index, args in enumerate(_iter_chain_species(), start=1):
+        if len(species) == num:
+            break
+        chain = _build_chain(*args)
+        label = f'{chain["formula"]}({index})'
+        species.append({'label': label,
+                        # Chemkin names are limited to 16 characters
+                        'chemkin_label': label if len(label) <= 16 else f'S({index})',
+                        'smiles': chain['smiles'],
+                        'adjlist': _to_adjlist(chain),
+                        'multiplicity': chain['multiplicity'],
+                        'xyz': {'symbols': tuple(chain['symbols']),
+                                'isotopes': tuple({'H': 1, 'C': 12, 'O': 16}[symbol]
+                                                  for symbol in chain['symbols']),
+                                'coords': tuple(chain['coords'])}})
+    return species
+
+
+def generate_reactions(species: list,
+                       num: int,
+                       seed: int = 0) -> list:
+    """
+    Generate random bimolecular reactions among the species.
+
+    Args:
+        species (list): The species generated by ``generate_species``.
+        num (int): The number of reactions.
+        seed (int): The random seed.
+
+    Returns:
+        list: Reactions as tuples of (reactant labels, product labels, (A, n, Ea)).
+    """
+    rng = random.Random(seed)
+    labels = [spc['label'] for spc in species]
+    reactions = []
+    for _ in range(num):
+        reactants = rng.sample(labels, 2) if len(labels) > 1 else labels * 2
+        products = rng.sample(labels, 2) if len(labels) > 1 else labels * 2
+        reactions.append((reactants, products,
+                          (10 ** rng.uniform(8, 14), round(rng.uniform(-1, 3), 3),
+                           round(rng.uniform(0, 40), 3))))
+    return reactions
+
+
+def write_species_dictionary(path: str, species: list):
+    """
+    Write an RMG species dictionary.
+    """
+    with open(path, 'w') as f:
+        for spc in species:
+            f.write(f'{spc["label"]}\n{spc["adjlist"]}\n')
+
+
+def write_chemkin_file(path: str,
+                       species: list,
+                       reactions: list):
+    """
+    Write an annotated Chemkin file like RMG's ``chem_annotated.inp``.
+    """
+    aliases = {spc['label']: spc['chemkin_label'] for spc in species}
+    with open(path, 'w') as f:
+        f.write('ELEMENTS\n\tH\n\tC\n\tO\nEND\n\nSPECIES\n')
+        for spc in species:
+            f.write(f'    {spc["chemkin_label"]:<20s}! {spc["label"]}\n')
+        f.write('END\n\nREACTIONS    KCAL/MOLE   MOLES\n\n')
+        for index, (reactants, products, (A, n, Ea)) in enumerate(reactions, start=1):
+            equation = '+'.join(aliases[label] for label in reactants) + '=' \
+                + '+'.join(aliases[label] for label in products)
+            f.write(f'! Reaction index: Chemkin #{index}; RMG #{index + 100}\n'
+                    f'! Template reaction: H_Abstraction\n'
+                    f'{equation:<50s}{A:.3e} {n:.3f} {Ea:.3f}\n\n')
+        f.write('END\n')
+
+
+def write_flux_diagram(path: str,
+                       species: list,
+                       num_nodes: int = 50,
+                       seed: int = 0):
+    """
+    Write a flux diagram dot file like RMG's.
+    """
+    rng = random.Random(seed)
+    nodes = [spc['label'] for spc in rng.sample(species, min(num_nodes, len(species)))]
+    with open(path, 'w') as f:
+        f.write('digraph G {\nnode [fontname=Helvetica, fontsize=12];\n')
+        for label in nodes:
+            f.write(f'"{label}" [fontname=Helvetica, fontsize=12, image="species/{label}.png", '
+                    f'label="", shape=none];\n')
+        for label1, label2 in zip(nodes, nodes[1:]):
+            f.write(f'"{label1}" -> "{label2}" [arrowhead=normal, arrowsize=0.5, '
+                    f'color="0.66 1.0 1.0", penwidth="{rng.uniform(1, 10):.1f}"];\n')
+        f.write('}\n')
+
+
+def write_sensitivity_csv(path: str,
+                          species: list,
+                          reactions: list,
+                          observable: str,
+                          num_times: int = 100,
+                          seed: int = 0):
+    """
+    Write a sensitivity result csv like RMG's, with a reaction and a thermo column
+    for each reaction and species.
+    """
+    rng = random.Random(seed)
+    headers = ['Time (s)']
+    for index, (reactants, products, _) in enumerate(reactions, start=1):
+        headers.append(f'dln[{observable}]/dln[k{index}]: '
+                       f'{"+".join(reactants)}<=>{"+".join(products)}')
+    headers += [f'dln[{observable}]/dG[{spc["label"]}]' for spc in species]
+    scales = [10 ** rng.uniform(-6, 0) for _ in headers]
+    with open(path, 'w') as f:
+        f.write(','.join(f'"{header}"' if ',' in header else header for header in headers) + '\n')
+        for i in range(num_times):
+            time = 1e-6 * (i + 1)
+            f.write(','.join([f'{time:.6e}'] + [f'{rng.gauss(0, scale):.6e}'
+                                                for scale in scales[1:]]) + '\n')
+
+
+def write_thermo_library(path: str,
+                         species: list,
+                         name: str = 'benchmark',
+                         seed: int = 0):
+    """
+    Write an RMG thermo library with NASA polynomials.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        f.write(f'#!/usr/bin/env python\n# encoding: utf-8\n\nname = "{name}"\n'
+                f'shortDesc = ""\nlongDesc = """\n"""\n')
+        for index, spc in enumerate(species):
+            low = [3.5, 1e-3 * rng.uniform(0.5, 5), 1e-6, -1e-9, 1e-13,
+                   -1e4 * rng.uniform(0.5, 5), rng.uniform(1, 10)]
+            high = [5.0, 1e-2 * rng.uniform(0.5, 5), -1e-5, 4e-9, -4e-13,
+                    -1e4 * rng.uniform(0.5, 5), rng.uniform(1, 10)]
+            f.write(f'''
+entry(
+    index={index},
+    label="{spc['label']}",
+    molecule="""
+{spc['adjlist']}""",
+    thermo=NASA(
+        polynomials=[
+            NASAPolynomial(coeffs={low}, Tmin=(100, 'K'), Tmax=(1000, 'K')),
+            NASAPolynomial(coeffs={high}, Tmin=(1000, 'K'), Tmax=(3000, 'K')),
+        ],
+        Tmin=(100, 'K'),
+        Tmax=(3000, 'K'),
+    ),
+    shortDesc="""""",
+    longDesc="""""",
+)
+''')
+
+
+def write_kinetics_library(path: str,
+                           species: list,
+                           reactions: list,
+                           name: str = 'benchmark'):
+    """
+    Write an RMG kinetics library (``reactions.py`` and ``dictionary.txt``) in a directory.
+    """
+    os.makedirs(path, exist_ok=True)
+    labels = {label for reactants, products, _ in reactions for label in reactants + products}
+    write_species_dictionary(os.path.join(path, 'dictionary.txt'),
+                             [spc for spc in species if spc['label'] in labels])
+    with open(os.path.join(path, 'reactions.py'), 'w') as f:
+        f.write(f'#!/usr/bin/env python\n# encoding: utf-8\n\nname = "{name}"\n'
+                f'shortDesc = ""\nlongDesc = """\n"""\n')
+        for index, (reactants, products, (A, n, Ea)) in enumerate(reactions, start=1):
+            f.write(f'''
+entry(
+    index = {index},
+    label = "{' + '.join(reactants)} <=> {' + '.join(products)}",
+    degeneracy = 1,
+    kinetics = Arrhenius(A=({A:.6e}, 'cm^3/(mol*s)'), n={n}, Ea=({Ea}, 'kcal/mol'), T0=(1, 'K')),
+    shortDesc = """""",
+    longDesc = """""",
+)
+''')
+
+
+def write_arc_input(path: str, species: list):
+    """
+    Write an ARC input file with the species section.
+    """
+    save_yaml_file(path, {'project': os.path.basename(os.path.dirname(path)) or 'benchmark',
+                          'species': [{'label': spc['label'],
+                                       'smiles': spc['smiles'],
+                                       'multiplicity': spc['multiplicity']}
+                                      for spc in species]})
+
+
+# The messages and the failed links of the errors in the fake Gaussian logs
+GAUSSIAN_LOG_ERRORS = {'scf': ('Convergence failure -- run terminated.', 'l502.exe'),
+                       'opt': ('Number of steps exceeded,  NStep=  100', 'l9999.exe'),
+                       'input': ('End of file in ZSymb.', 'l101.exe')}
+
+
+def get_gaussian_log(spc: dict,
+                     job_type: str = 'composite',
+                     status: str = 'done',
+                     num_filler_lines: int = 500,
+                     termination_time: str = 'Mon Jan 11 12:34:56 2021',
+                     num_links: int = 1,
+                     error: str = 'scf') -> str:
+    """
+    Get the content of a fake Gaussian log.
+
+    Args:
+        spc (dict): The species generated by ``generate_species``.
+        job_type (str): ``'composite'``, ``'freq'``, ``'opt'`` or ``'scan'``.
+        status (str): ``'done'``, ``'errored'`` or ``'unfinished'``, the status of the last step.
+        num_filler_lines (int): The number of lines to pad the log.
+        termination_time (str): The termination time.
+        num_links (int): The number of (Link1) job steps. The steps before the last one
+                         terminate normally.
+        error (str): The error of an errored job, one of ``GAUSSIAN_LOG_ERRORS``.
+
+    Returns:
+        str: The log.
+    """
+    if num_links > 1:
+        previous = get_gaussian_log(spc, job_type, 'done', num_filler_lines,
+                                    termination_time, num_links - 1)
+        return previous + ' Link1:  Proceeding to internal job step number  ' \
+            f'{num_links:d}.\n' + get_gaussian_log(spc, job_type, status, num_filler_lines,
+                                                   termination_time, 1, error)
+
+    routes = {'composite': '#P cbs-qb3 IOp(2/9=2000)',
+              'freq': '#P freq b3lyp/cbsb7',
+              'opt': '#P opt b3lyp/cbsb7',
+              'scan': '#P opt=(modredundant) b3lyp/cbsb7'}
+    separator = ' ' + '-' * 69 + '\n'
+    orientation = ['                         Standard orientation:\n', separator,
+                   ' Center     Atomic      Atomic             Coordinates (Angstroms)\n',
+                   ' Number     Number       Type             X           Y           Z\n',
+                   separator]
+    for i, (symbol, (x, y, z)) in enumerate(zip(spc['xyz']['symbols'], spc['xyz']['coords']), start=1):
+        orientation.append(f'{i:7d}{ATOMIC_NUMBERS[symbol]:11d}{0:12d}    '
+                           f'{x:12.6f}{y:12.6f}{z:12.6f}\n')
+    orientation.append(separator)
+
+    lines = [' Entering Gaussian System, Link 0=g16\n',
+             ' Copyright (c) 1988-2017, Gaussian, Inc.  All Rights Reserved.\n',
+             f' {routes.get(job_type, routes["opt"])}\n',
+             f' Charge =  0 Multiplicity = {spc["multiplicity"]}\n']
+    if job_type == 'scan':
+        lines += [' The following ModRedundant input section has been read:\n',
+                  ' D       1       2       3       4 S  36 10.000\n']
+    lines += orientation
+    lines += [f' SCF Done:  E(RB3LYP) =  -{100 + i * 1e-4:.8f}     A.U. after   10 cycles\n'
+              for i in range(num_filler_lines)]
+    if status == 'unfinished':
+        return ''.join(lines)
+    if job_type in ['composite', 'freq']:
+        num_atoms = len(spc['xyz']['symbols'])
+        freqs = [100.0 + 30.0 * i for i in range(max(3 * num_atoms - 6, 0))]
+        lines.append(' Harmonic frequencies (cm**-1), IR intensities (KM/Mole)\n')
+        for i in range(0, len(freqs), 3):
+            lines.append(' Frequencies --' + ''.join(f'{freq:11.4f}' for freq in freqs[i:i + 3]) + '\n')
+    lines += orientation
+    if status == 'errored':
+        message, link = GAUSSIAN_LOG_ERRORS[error]
+        lines += [f' {message}\n',
+                  f' Error termination via Lnk1e in /opt/g16/{link} at '
+                  f'{termination_time}.\n']
+    else:
+        lines.append(f' Normal termination of Gaussian 16 at {termination_time}.\n')
+    return ''.join(lines)
+
+
+def write_arc_project(path: str,
+                      species: list,
+                      num_scans: int = 2,
+                      num_filler_lines: int = 500,
+                      error_rate: float = 0.1,
+                      seed: int = 0):
+    """
+    Write a fake ARC project with ``input.yml`` and Gaussian logs under
+    ``calcs/Species/<label>/<job type>_a<index>/output.out``.
+
+    Args:
+        path (str): The project directory.
+        species (list): The species generated by ``generate_species``.
+        num_scans (int): The number of scans of each species.
+        num_filler_lines (int): The number of lines to pad each log.
+        error_rate (float): The fraction of jobs errored or unfinished.
+        seed (int): The random seed.
+    """
+    rng = random.Random(seed)
+    write_arc_input(os.path.join(path, 'input.yml'), species)
+    job_index = 0
+    for spc in species:
+        spc_dir = os.path.join(path, 'calcs', 'Species', spc['label'])
+        for job_type in ['composite', 'freq'] + ['scan'] * num_scans:
+            job_index += 1
+            status = 'done' if rng.random() >= error_rate else rng.choice(['errored', 'unfinished'])
+            job_dir = os.path.join(spc_dir, f'{job_type}_a{job_index}')
+            os.makedirs(job_dir, exist_ok=True)
+            with open(os.path.join(job_dir, 'output.out'), 'w') as f:
+                f.write(get_gaussian_log(spc, job_type, status,
+                                         num_filler_lines=num_filler_lines,
+                                         termination_time=f'Jan {1 + job_index % 28} '
+                                                          f'12:34:56 2021',
+                                         # Frequency jobs follow an optimization by Link1
+                                         num_links=2 if job_type == 'freq' else 1,
+                                         error=rng.choice(sorted(GAUSSIAN_LOG_ERRORS))))
+
+
+def generate_fixtures(path: str,
+                      num_species: int = 100,
+                      num_reactions: Optional[int] = None,
+                      num_arc_species: Optional[int] = None,
+                      seed: int = 0) -> dict:
+    """
+    Generate a set of fixtures under a directory.
+
+    Args:
+        path (str): The directory to save the fixtures.
+        num_species (int): The number of species in the model.
+        num_reactions (Optional[int]): The number of reactions. Defaults to twice the species.
+        num_arc_species (Optional[int]): The number of species in the ARC project.
+                                         Defaults to a tenth of the species.
+        seed (int): The random seed.
+
+    Returns:
+        dict: The paths to the fixtures.
+    """
+    os.makedirs(path, exist_ok=True)
+    species = generate_species(num_species)
+    reactions = generate_reactions(species, num_reactions or 2 * num_species, seed=seed)
+    half = len(species) // 2
+    paths = {'species_dictionary': os.path.join(path, 'species_dictionary.txt'),
+             'chemkin': os.path.join(path, 'chem_annotated.inp'),
+             'flux_diagram': os.path.join(path, 'flux_diagram', 'flux_diagram.dot'),
+             'sensitivity': os.path.join(path, 'solver', 'sensitivity_1_SPC_1.csv'),
+             'thermo_library_base': os.path.join(path, 'thermo_base.py'),
+             'thermo_library_to_add': os.path.join(path, 'thermo_to_add.py'),
+             'thermo_library_to_compare': os.path.join(path, 'thermo_to_compare.py'),
+             'kinetics_library_base': os.path.join(path, 'kinetics_base', 'reactions.py'),
+             'kinetics_library_to_add': os.path.join(path, 'kinetics_to_add', 'reactions.py'),
+             'arc_inputs': [os.path.join(path, 'arc_input_1.yml'),
+                            os.path.join(path, 'arc_input_2.yml')],
+             'arc_project': os.path.join(path, 'arc_project'),
+             'species': species}
+    for key in ['flux_diagram', 'sensitivity']:
+        os.makedirs(os.path.dirname(paths[key]), exist_ok=True)
+
+    write_species_dictionary(paths['species_dictionary'], species)
+    write_chemkin_file(paths['chemkin'], species, reactions)
+    write_flux_diagram(paths['flux_diagram'], species, seed=seed)
+    write_sensitivity_csv(paths['sensitivity'], species, reactions,
+                          observable=species[0]['label'], seed=seed)
+    # Disjoint libraries, since merging duplicates asks for decisions
+    write_thermo_library(paths['thermo_library_base'], species[:half], seed=seed)
+    write_thermo_library(paths['thermo_library_to_add'], species[half:], seed=seed + 1)
+    # The same species as the base library with different thermo, for comparing
+    write_thermo_library(paths['thermo_library_to_compare'], species[:half], seed=seed + 2)
+    # Overlapping kinetics libraries, the shared reactions are partly reversed
+    # and partly with different kinetics
+    third = len(reactions) // 3
+    shared = [(products, reactants, kinetics) if i % 2 else
+              (reactants, products, (kinetics[0] * (1 + i % 3), kinetics[1], kinetics[2]))
+              for i, (reactants, products, kinetics) in enumerate(reactions[third:2 * third])]
+    write_kinetics_library(os.path.dirname(paths['kinetics_library_base']),
+                           species, reactions[:2 * third])
+    write_kinetics_library(os.path.dirname(paths['kinetics_library_to_add']),
+                           species, shared + reactions[2 * third:])
+    # Overlapping inputs, a quarter of the species are shared
+    quarter = len(species) // 4
+    write_arc_input(paths['arc_inputs'][0], species[:half + quarter])
+    write_arc_input(paths['arc_inputs'][1], species[half - quarter:])
+    write_arc_project(paths['arc_project'],
+                      species[:num_arc_species or max(1, num_species // 10)],
+                      seed=seed)
+    return paths
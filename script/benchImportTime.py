@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"Check that the scripts start without importing heavy dependencies"
+
+import argparse
+import os
+import subprocess
+import sys
+
+from easy_rmg_model.common import regularize_path
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The packages which should only be imported when they are actually used
+HEAVY_MODULES = ('rmgpy', 'arc', 'arkane', 'matplotlib', 'rdmc')
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('scripts', nargs='*',
+                        help='The scripts to be checked. All scripts in this '
+                             'folder if not assigned.')
+    parser.add_argument('-m', '--modules', nargs='+', default=HEAVY_MODULES,
+                        help='The top level packages that should not be imported by --help')
+
+    args = parser.parse_args()
+
+    if args.scripts:
+        scripts = [regularize_path(script) for script in args.scripts]
+    else:
+        scripts = sorted(os.path.join(SCRIPT_DIR, name) for name in os.listdir(SCRIPT_DIR)
+                         if name.endswith('.py') and name != os.path.basename(__file__))
+
+    return scripts, args.modules
+
+
+def get_imported_modules(script: str) -> tuple:
+    """
+    Get the modules imported by ``python -X importtime script --help`` in a fresh interpreter.
+
+    Args:
+        script (str): The path to the script.
+
+    Returns:
+        tuple: The names of the imported modules, the total import time in seconds and
+               the error message (``None`` if the script starts successfully).
+    """
+    env = dict(os.environ)
+    repo_path = os.path.dirname(SCRIPT_DIR)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [repo_path, env.get('PYTHONPATH')]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', script, '--help'],
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            env=env)
+    modules, total, errors = set(), 0., []
+    for line in result.stderr.splitlines():
+        # e.g., import time:       641 |       1454 | _frozen_importlib_external
+        if not line.startswith('import time:'):
+            errors.append(line)
+            continue
+        items = line[len('import time:'):].split('|')
+        if len(items) != 3 or not items[1].strip().isdigit():
+            continue
+        modules.add(items[2].strip())
+        # Nested imports are indented, and included in the cumulative time of the top level ones
+        if not items[2].startswith('  '):
+            total += int(items[1]) / 1e6
+    if result.returncode:
+        return modules, total, (errors or ['unknown error'])[-1]
+    return modules, total, None
+
+
+def main():
+
+    scripts, heavy_modules = parse_arguments()
+
+    failures = []
+    for script in scripts:
+        name = os.path.basename(script)
+        modules, total, error = get_imported_modules(script)
+        heavy = sorted({module.split('.')[0] for module in modules} & set(heavy_modules))
+        if error:
+            failures.append(name)
+            status = f'FAILED to start: {error}'
+        elif heavy:
+            failures.append(name)
+            status = f'IMPORTS {", ".join(heavy)}'
+        else:
+            status = 'ok'
+        print(f'{name:<32s}{total:8.3f} s  {status}')
+
+    if failures:
+        print(f'Failed: {", ".join(failures)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
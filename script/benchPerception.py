@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"Compare the throughput and the consistency of the xyz perception backends"
+
+import argparse
+import time
+
+from easy_rmg_model.common import iter_yaml_list, regularize_path
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('inputs', type=str, nargs='+',
+                        help='ARC input files whose species have xyz')
+    parser.add_argument('-n', '--n_workers', type=int, nargs='+', default=[1],
+                        help='The numbers of worker processes to benchmark')
+    parser.add_argument('-c', '--check', action='store_true',
+                        help='Check if the backends perceive the same molecules')
+
+    args = parser.parse_args()
+
+    inputs = [regularize_path(input_file) for input_file in args.inputs]
+    return inputs, args.n_workers, args.check
+
+
+def main():
+
+    inputs, n_workers_list, check = parse_arguments()
+
+    from easy_rmg_model.species.converter import (BACKENDS,
+                                                  check_backend_consistency,
+                                                  xyzs_to_mols)
+
+    xyzs = [spc['xyz'] for input_file in inputs
+            for spc in iter_yaml_list(input_file, 'species') if spc.get('xyz')]
+    print(f'Find {len(xyzs)} geometries.')
+    if not xyzs:
+        return
+
+    for backend in BACKENDS:
+        for n_workers in n_workers_list:
+            t0 = time.perf_counter()
+            mols = xyzs_to_mols(xyzs, backend=backend, n_workers=n_workers,
+                                copy=False, use_cache=False)
+            elapsed = time.perf_counter() - t0
+            failed = sum(mol is None for mol in mols)
+            print(f'{backend:<10s} workers: {n_workers:<3d} {elapsed:8.3f} s  '
+                  f'{len(xyzs) / elapsed:10.1f} geom/s  failed: {failed}')
+
+    if check:
+        inconsistent = check_backend_consistency(xyzs, n_workers=max(n_workers_list))
+        print(f'{len(inconsistent)} out of {len(xyzs)} geometries are perceived differently.')
+        for index, ob_smiles, rd_smiles in inconsistent:
+            print(f'{index}: openbabel {ob_smiles}, rdkit {rd_smiles}')
+
+
+if __name__ == '__main__':
+    main()
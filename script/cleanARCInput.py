@@ -6,19 +6,21 @@
 import argparse
 import os
 
+from easy_rmg_model import instrumentation
 from easy_rmg_model.common import (read_yaml_file,
                                    regularize_path,
                                    save_yaml_file)
+from easy_rmg_model.instrumentation import gauge, timer
 from easy_rmg_model.rmg2arc.arc_input import (combine_arc_species_inputs,
                                               combine_spc_info,
                                               find_species_from_spc_dict,)
-from easy_rmg_model.rmg2arc.species_dict import (load_spc_dict,
-                                                 species_from_spc_info)
-from easy_rmg_model.rmg2arc.thermo_db import (load_thermo_database,
-                                              load_thermo_lib_by_path)
+from easy_rmg_model.rmg2arc.species_dict import SpeciesIndex, load_spc_dict
+from easy_rmg_model.rmg2arc.thermo_db import (ThermoLibraryIndex,
+                                              find_species_in_thermo_libraries,
+                                              load_thermo_database,
+                                              load_thermo_libs)
 from easy_rmg_model.rmg2arc.kinetics_db import (load_kinetics_database,
                                               load_kinetics_lib_by_path)
-from rmgpy.molecule.molecule import Molecule
 
 def parse_arguments():
     parser = argparse.ArgumentParser()
@@ -33,6 +35,15 @@ def parse_arguments():
                         help='A file contains the species to be filtered.')
     parser.add_argument('-o', '--output', type=str, nargs='?',
                         help='The dir path to save results.')
+    parser.add_argument('-n', '--n_workers', type=int, default=1,
+                        help='The number of processes used to load the external thermo libraries '
+                             'and to look up species in the thermo libraries.')
+    parser.add_argument('-c', '--cache_dir', type=str, nargs='?',
+                        help='The directory to cache the parsed external thermo libraries.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the timings and counters of the stages.')
+    parser.add_argument('--trace', type=str, nargs='?',
+                        help='The path to save the Chrome trace (JSON) of the stages.')
 
     args = parser.parse_args()
 
@@ -42,26 +53,49 @@ def parse_arguments():
     filter_spc_dict = regularize_path(args.filter_species) \
                       if args.filter_species else ''
     output = regularize_path(args.output) if args.output else ''
+    trace = regularize_path(args.trace) if args.trace else ''
+    cache_dir = regularize_path(args.cache_dir) if args.cache_dir else ''
 
-    return input_file, libraries, filter_spc_dict, output
+    return (input_file, libraries, filter_spc_dict, output, args.n_workers, cache_dir,
+            args.profile, trace)
 
 
 def main():
 
-    input_file, libraries_path, filter_spc_dict, output = parse_arguments()
+    input_file, libraries_path, filter_spc_dict, output, n_workers, cache_dir, profile, trace \
+        = parse_arguments()
+
+    if profile or trace:
+        instrumentation.enable(trace=bool(trace))
+
+    with timer('clean.total'):
+        clean_arc_input(input_file, libraries_path, filter_spc_dict, output, n_workers, cache_dir)
+
+    if profile:
+        print(instrumentation.summary())
+    if trace:
+        instrumentation.save_chrome_trace(trace)
+        print(f'The trace is saved to {trace}.')
+
+
+def clean_arc_input(input_file, libraries_path, filter_spc_dict, output,
+                    n_workers=1, cache_dir=''):
 
     # Get species info in the input file
     arc_input_species = read_yaml_file(input_file)['species']
     spc_info = {spc['label']: spc for spc in arc_input_species}
     print(f'Starting with {len(spc_info)} species...')
+    gauge('species.remaining', len(spc_info))
 
     if filter_spc_dict:
         # Load filtered species dictionary
-        filter_spc_dict = load_spc_dict(filter_spc_dict)
+        with timer('clean.load_spc_dict'):
+            filter_spc_dict = load_spc_dict(filter_spc_dict)
         # Clean work
         clean = []
         for label, spc in spc_info.items():
-            dict_label, _ = find_species_from_spc_dict(spc, filter_spc_dict)
+            with timer('clean.filter_by_spc_dict'):
+                dict_label, _ = find_species_from_spc_dict(spc, filter_spc_dict)
             if not dict_label:  # cannot find species
                 clean.append(label)
             else:
@@ -69,16 +103,24 @@ def main():
                       f'to filtered species dictionary')
         spc_info = {label: spc for label, spc in spc_info.items()
                     if label in clean}
+        gauge('species.remaining', len(spc_info))
 
     if libraries_path:
+        from rmgpy.molecule.molecule import Molecule
+
         # Load thermo libraries
         libraries = read_yaml_file(libraries_path)
-        thermo_db = load_thermo_database(libraries=libraries['built-in_thermo_libs'])
-        for t_lib in libraries['external_thermo_libs']:
-            load_thermo_lib_by_path(t_lib, thermo_db)
-        kinetics_db = load_kinetics_database(libraries=libraries['built-in_kinetics_libs'])
-        for k_lib in libraries['external_kinetics_libs']:
-            load_kinetics_lib_by_path(k_lib, kinetics_db)
+        with timer('clean.load_thermo_libraries'):
+            thermo_db = load_thermo_database(libraries=libraries['built-in_thermo_libs'])
+            external_thermo_libs = load_thermo_libs(libraries['external_thermo_libs'],
+                                                    n_workers=n_workers,
+                                                    cache_dir=cache_dir)
+            external_thermo_libs.add_to_thermo_db(thermo_db)
+            thermo_index = ThermoLibraryIndex.from_thermo_db(thermo_db)
+        with timer('clean.load_kinetics_libraries'):
+            kinetics_db = load_kinetics_database(libraries=libraries['built-in_kinetics_libs'])
+            for k_lib in libraries['external_kinetics_libs']:
+                load_kinetics_lib_by_path(k_lib, kinetics_db)
         # Clean work
         clean = []
         for label, spc in spc_info.items():
@@ -91,35 +133,41 @@ def main():
                     reactants.append(Molecule().from_smiles(smiles.strip()))
                 for smiles in prod.strip().split("+"):
                     products.append(Molecule().from_smiles(smiles.strip()))
-                reactions = kinetics_db.generate_reactions_from_libraries(reactants=reactants,products=products) + kinetics_db.generate_reactions_from_libraries(reactants=products,products=reactants) 
+                with timer('kinetics.library_lookup'):
+                    reactions = kinetics_db.generate_reactions_from_libraries(reactants=reactants,products=products) + kinetics_db.generate_reactions_from_libraries(reactants=products,products=reactants) 
                 if reactions:
                     print(f'Warning: ts {label} is cleaned out due to existing '
                         f'in kinetics libraries')
                 else:
                     clean.append(label)
+        # Check the species against the library index in a batch, without estimating thermo
+        stable_spc_info = {label: spc for label, spc in spc_info.items()
+                           if not spc.get("is_ts", False)}
+        found = find_species_in_thermo_libraries(stable_spc_info,
+                                                 thermo_index,
+                                                 n_workers=n_workers)
+        for label, found_libraries in found.items():
+            if found_libraries is None:
+                print(f'Warning: Cannot generate species for {label}.')
+            elif not found_libraries:
+                clean.append(label)
             else:
-                try:
-                    thermo_data = thermo_db.get_all_thermo_data(
-                        species_from_spc_info(spc))
-                except:
-                    print(f'Warning: Cannot generate thermo for {label}.')
-                    continue
-                if len(thermo_data) <= 1:  # Only GAV availabel
-                    clean.append(label)
-                else:
-                    print(f'Warning: species {label} is cleaned out due to existing '
-                        f'in thermo libraries')
+                print(f'Warning: species {label} is cleaned out due to existing '
+                    f'in thermo libraries')
         spc_info = {label: spc for label, spc in spc_info.items()
                     if label in clean}
+        gauge('species.remaining', len(spc_info))
 
     # Make sure there is no duplicates in the spc_info
     # Iteratively using combine function can help filter out duplicates
     cleaned_info = {}
-    cleaned_spc_dict = {}
-    for label, spc in spc_info.items():
-        cleaned_info = combine_spc_info(spc_info1=cleaned_info,
-                                        spc_info2={label: spc},
-                                        spc_dict=cleaned_spc_dict)
+    cleaned_spc_dict = SpeciesIndex()
+    with timer('clean.deduplicate'):
+        for label, spc in spc_info.items():
+            cleaned_info = combine_spc_info(spc_info1=cleaned_info,
+                                            spc_info2={label: spc},
+                                            spc_dict=cleaned_spc_dict)
+    gauge('species.remaining', len(cleaned_info))
 
     # Remove not desirable symbol from species label
     replace_list = [s for s in "()#"]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"Compare the thermo of the species shared by two thermo libraries"
+
+import argparse
+import os
+
+from easy_rmg_model.common import regularize_path
+from easy_rmg_model.rmg2arc.thermo_db import (diff_thermo_libs,
+                                              load_thermo_libs,
+                                              plot_thermo_diffs)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('base_lib', type=str,
+                        help='The path to the base thermo library')
+    parser.add_argument('lib_to_compare', type=str,
+                        help='The path to the thermo library to be compared')
+    parser.add_argument('-s', '--sort_by', type=str, default='dG_max',
+                        help='The column to sort the table, e.g., dH298, dS298, dCp_max, dG_max')
+    parser.add_argument('-k', '--top_k', type=int, default=0,
+                        help='The number of the most different species to be plotted')
+    parser.add_argument('-n', '--n_workers', type=int, default=2,
+                        help='The number of processes used to plot figures')
+    parser.add_argument('--non_resonance', action='store_true',
+                        help='Do not use resonance structures to match species')
+    parser.add_argument('-o', '--output', type=str,
+                        help='The dir path to save results')
+
+    args = parser.parse_args()
+
+    base_lib = regularize_path(args.base_lib)
+    lib_to_compare = regularize_path(args.lib_to_compare)
+    output = regularize_path(args.output) if args.output else os.curdir
+
+    return (base_lib, lib_to_compare, args.sort_by, args.top_k,
+            args.n_workers, not args.non_resonance, output)
+
+
+def main():
+
+    base_lib_path, lib_to_compare_path, sort_by, top_k, n_workers, resonance, output \
+        = parse_arguments()
+
+    libs = load_thermo_libs([base_lib_path, lib_to_compare_path]).libraries
+    if len(libs) < 2:
+        raise ValueError('Both thermo libraries need to be valid and different.')
+    base_lib, lib_to_compare = libs[base_lib_path], libs[lib_to_compare_path]
+
+    table = diff_thermo_libs(base_lib, lib_to_compare, resonance=resonance, sort_by=sort_by)
+    print(f'{len(table)} species are found in both libraries.')
+
+    os.makedirs(output, exist_ok=True)
+    futures = []
+    if top_k:
+        futures = plot_thermo_diffs(table, base_lib, lib_to_compare,
+                                    fig_dir=os.path.join(output, 'figures'),
+                                    top_k=top_k, n_workers=n_workers, wait=False)
+    # Write the table while the figures are being plotted
+    table_path = os.path.join(output, 'thermo_diff.csv')
+    table.to_csv(table_path, index=False)
+    print(table.head(20).to_string(index=False))
+    print(f'Saved the table to {table_path}.')
+    for future in futures:
+        print(f'Saved the figure to {future.result()}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"Merge kinetics libraries into one"
+
+import argparse
+import os
+
+from easy_rmg_model.common import regularize_path, save_yaml_file
+from easy_rmg_model.rmg2arc.kinetics_db import MERGE_POLICIES, merge_kinetics_libs
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('libraries', type=str, nargs='+',
+                        help='The paths to the kinetics libraries (reactions.py). '
+                             'The first one is used as the base.')
+    parser.add_argument('-p', '--policy', type=str, default='keep', choices=MERGE_POLICIES,
+                        help='How to resolve the reactions with different kinetics')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.1,
+                        help='The allowed difference of log10(k) for duplicates')
+    parser.add_argument('-o', '--output', type=str,
+                        help='The dir path to save the merged library')
+
+    args = parser.parse_args()
+
+    libraries = [regularize_path(path) for path in args.libraries]
+    output = regularize_path(args.output) if args.output \
+        else os.path.join(os.path.abspath(os.curdir), 'merged')
+
+    return libraries, args.policy, args.tolerance, output
+
+
+def main():
+
+    libraries, policy, tolerance, output = parse_arguments()
+
+    report = merge_kinetics_libs(libraries, output, policy=policy, tolerance=tolerance)
+
+    # Only the reactions not simply added need attention
+    report = [item for item in report if item['action'] != 'added']
+    report_path = save_yaml_file(os.path.join(output, 'merge_report.yml'), report)
+    print(f'The report of duplicates is saved to {report_path}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"Benchmark the key entry points on synthetic fixtures and check for regressions"
+
+import argparse
+import os
+import sys
+import tempfile
+
+from easy_rmg_model.common import read_yaml_file, regularize_path, save_yaml_file
+from easy_rmg_model.testing.benchmarks import BENCHMARKS, run_benchmarks
+from easy_rmg_model.testing.fixtures import generate_fixtures
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, 'benchmark_baseline.yml')
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-k', '--benchmarks', type=str, nargs='+', choices=list(BENCHMARKS),
+                        help='The benchmarks to run. All benchmarks if not assigned.')
+    parser.add_argument('-s', '--scales', type=int, nargs='+', default=[100, 1000],
+                        help='The numbers of species in the fixtures')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='The number of runs of each benchmark, the fastest one is used')
+    parser.add_argument('-d', '--fixture_dir', type=str,
+                        help='The directory to keep the fixtures. A temporary directory '
+                             'is used if not assigned.')
+    parser.add_argument('-b', '--baseline', type=str, default=DEFAULT_BASELINE,
+                        help='The yaml file of the baseline timings')
+    parser.add_argument('-o', '--output', type=str,
+                        help='The yaml file to save the timings')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.2,
+                        help='The allowed relative slowdown compared to the baseline')
+    parser.add_argument('-u', '--update', action='store_true',
+                        help='Save the timings as the new baseline')
+
+    args = parser.parse_args()
+
+    fixture_dir = regularize_path(args.fixture_dir) if args.fixture_dir else None
+    baseline = regularize_path(args.baseline)
+    output = regularize_path(args.output) if args.output else None
+
+    return (args.benchmarks, args.scales, args.repeat, fixture_dir,
+            baseline, output, args.tolerance, args.update)
+
+
+def main():
+
+    names, scales, repeat, fixture_dir, baseline_path, output, tolerance, update \
+        = parse_arguments()
+
+    baseline = read_yaml_file(baseline_path) if os.path.isfile(baseline_path) else {}
+    timings, regressions = {}, []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            path = os.path.join(fixture_dir or tmp_dir, f'fixtures_{scale}')
+            print(f'Generating fixtures with {scale} species at {path}...')
+            fixtures = generate_fixtures(path, num_species=scale)
+            for name, timing in run_benchmarks(fixtures, names, repeat).items():
+                key = f'{name}[{scale}]'
+                timings[key] = timing
+                if timing is None:
+                    continue
+                reference = baseline.get(key)
+                status = ''
+                if reference is not None:
+                    # A small absolute slack avoids failing on noise of fast benchmarks
+                    if timing > reference * (1 + tolerance) + 0.01:
+                        regressions.append(key)
+                        status = f'REGRESSED (baseline {reference:.4f} s)'
+                    else:
+                        status = f'ok (baseline {reference:.4f} s)'
+                print(f'{key:<48s}{timing:10.4f} s  {status}')
+
+    timings = {key: round(timing, 6) for key, timing in timings.items() if timing is not None}
+    if output:
+        save_yaml_file(output, timings)
+        print(f'Timings saved to {output}.')
+    if update:
+        baseline.update(timings)
+        save_yaml_file(baseline_path, baseline)
+        print(f'Baseline saved to {baseline_path}.')
+    elif regressions:
+        print(f'Benchmarks regressed: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
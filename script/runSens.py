@@ -10,10 +10,6 @@ import sqlite3
 import subprocess
 import time
 
-import pandas as pd
-from rmgpy.molecule.molecule import Molecule
-from rmgpy.chemkin import load_species_dictionary
-
 from easy_rmg_model.common import regularize_path
 from easy_rmg_model.settings import (CONDA_ENV,
                                      PHIS_POST_PROCESS,
@@ -23,7 +19,6 @@ from easy_rmg_model.settings import (CONDA_ENV,
                                      QUEUE_SPEC_POST_PROCESS,
                                      RMG_PATH,
                                      TS_POST_PROCESS)
-from easy_rmg_model.template_writer.input import RMGSimulateInput
 from easy_rmg_model.template_writer.submit import SLURMSubmitScript
 
 
@@ -41,6 +36,9 @@ def parse_arguments():
                         help='Fue-to-air equivalence ratio')
     parser.add_argument('--pool_size', nargs='?', type=int,
                         help='The size of the job pool')
+    parser.add_argument('-c', '--conditions', nargs='+',
+                        help='Only run these conditions (folder names formatted as T_P_phi), '
+                             'instead of all of the combinations of T, P and phi')
 
     args = parser.parse_args()
 
@@ -50,8 +48,10 @@ def parse_arguments():
     Ps = [float(P) for P in args.pressure] if args.pressure else PS_POST_PROCESS
     phis = [float(phi) for phi in args.phi] if args.phi else PHIS_POST_PROCESS
     pool_size = POOL_SIZE_POST_PROCESS if not args.pool_size else args.pool_size
+    conditions = {tuple(float(item) for item in condition.split('_'))
+                  for condition in args.conditions} if args.conditions else None
 
-    return model_path, sens_path, Ts, Ps, phis, pool_size
+    return model_path, sens_path, Ts, Ps, phis, pool_size, conditions
 
 
 def pooling_jobs(pool):
@@ -77,7 +77,7 @@ def pooling_jobs(pool):
 
 def main():
 
-    model_path, sens_path, Ts, Ps, phis, pool_size = parse_arguments()
+    model_path, sens_path, Ts, Ps, phis, pool_size, conditions = parse_arguments()
 
     print(f'Using RMG model from {model_path}...')
     chemkin_path = os.path.join(model_path, 'chem_annotated.inp')
@@ -97,7 +97,10 @@ def main():
                 T, P, phi = [float(item) for item in job.split('_')]
             except ValueError:
                 continue
-            if not (T in Ts and P in Ps and phi in phis):
+            if conditions is not None:
+                if (T, P, phi) not in conditions:
+                    continue
+            elif not (T in Ts and P in Ps and phi in phis):
                 continue
 
             print(f'Running sensitivity T: {T}, P: {P}, phi: {phi}')
@@ -9,11 +9,10 @@ import shutil
 import subprocess
 import time
 
-import pandas as pd
-from rmgpy.molecule.molecule import Molecule
-from rmgpy.chemkin import load_species_dictionary
-
 from easy_rmg_model.common import regularize_path
+from easy_rmg_model.rmg2arc.fluxdiagram import (find_flux_diagrams,
+                                                get_spc_label_from_fluxdiagram)
+from easy_rmg_model.rmg2arc.sweep import adaptive_condition_sweep
 from easy_rmg_model.settings import (IDT_SPECIES,
                                      PHIS_POST_PROCESS,
                                      POOL_SIZE_POST_PROCESS,
@@ -23,7 +22,7 @@ from easy_rmg_model.settings import (IDT_SPECIES,
                                      SIM_TIME_FINAL_POST_PROCESS,
                                      SIM_TIME_OUT_POST_PROCESS,
                                      TS_POST_PROCESS)
-from easy_rmg_model.template_writer.input import RMGSimulateInput
+from easy_rmg_model.template_writer.input import RMGSimulateInput, SpeciesDictionaryHandle
 from easy_rmg_model.template_writer.submit import SLURMSubmitScript
 
 
@@ -48,6 +47,15 @@ def parse_arguments():
                         help='Path to save flux diagram results')
     parser.add_argument('--pool_size', nargs='?', type=int,
                         help='The size of the job pool')
+    parser.add_argument('-a', '--adaptive', action='store_true',
+                        help='Start from a coarse grid and only add conditions where '
+                             'the species in the flux diagrams change')
+    parser.add_argument('--coarse_points', type=int, default=3,
+                        help='The number of T/P/phi values in the initial grid of '
+                             'the adaptive sweep')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='The overlap of species below which neighboring conditions '
+                             'are refined in the adaptive sweep')
 
     args = parser.parse_args()
 
@@ -62,12 +70,16 @@ def parse_arguments():
         job_path = getattr(args, f'{job_type}_path')
         outputs[job_type] = regularize_path(job_path[0]) if job_path else \
             os.path.join(os.path.dirname(model_path), job_type)
-    pool_size = POOL_SIZE_POST_PROCESS if not args.pool_size else args.pool_size[0]
+    pool_size = POOL_SIZE_POST_PROCESS if not args.pool_size else args.pool_size
+    adaptive = {'num_coarse': args.coarse_points,
+                'threshold': args.threshold} if args.adaptive else None
 
-    return model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size
+    return model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size, adaptive
 
 
 def find_molecule(molecule, spc_dict):
+    from rmgpy.molecule.molecule import Molecule
+
     # Find the molecule according to the smiles or the label information
     if molecule in spc_dict:
         return {'label': molecule, 'smiles': spc_dict[molecule].molecule[0].to_smiles()}
@@ -117,12 +129,15 @@ def generate_flux_diagram(input_path, chemkin_path, spc_dict_path, work_dir='.')
         return True
 
 
-def run_sensitivity(model_path, sens_path, Ts, Ps, phis, pool_size):
+def run_sensitivity(model_path, sens_path, Ts, Ps, phis, pool_size, conditions=None):
     cmd = ['python', os.path.join(os.path.dirname(__file__), 'runSens.py')]
     cmd += [model_path, sens_path, ]
     cmd += ['-T'] + [str(T) for T in Ts]
     cmd += ['-P'] + [str(P) for P in Ps]
     cmd += ['-p'] + [str(phi) for phi in phis]
+    if conditions is not None:
+        # Only the conditions evaluated, not all of the combinations of Ts, Ps and phis
+        cmd += ['-c'] + [f'{T}_{P}_{phi}' for T, P, phi in conditions]
     cmd += ['--pool_size', str(pool_size)]
     try:
         output = subprocess.check_output(cmd,
@@ -148,77 +163,107 @@ def generate_rmg_input_file(spec: dict, save_path: str):
     rmg_sim_input.save()
 
 
+def run_condition(condition, fuel, tf, outputs, chemkin_path,
+                  spc_dict_path, spc_num, idt_species):
+    """
+    Run the simulation and the flux diagram, and create the sensitivity input of a condition.
+
+    Args:
+        condition (tuple): The temperature, pressure and phi of the condition.
+
+    Returns:
+        list: The species labels in the flux diagram of the condition.
+    """
+    import pandas as pd
+
+    T, P, phi = condition
+    print(f'Running simulation T: {T}, P: {P}, phi:{phi}')
+
+    folder_name = f'{T}_{P}_{phi}'
+    spec = {
+        'species_dictionary': spc_dict_path,
+        'fuel': fuel,
+        'temp': T,
+        'pressure': P,
+        'phi': phi,
+        'tf': tf,
+    }
+
+    # Create folder and input file
+    work_dir = os.path.join(outputs['simulate'], folder_name,)
+    os.makedirs(work_dir, exist_ok=True)
+    input_path = os.path.join(work_dir, 'input.py')
+    generate_rmg_input_file(spec, save_path=input_path)
+
+    done = run_simulation(input_path, chemkin_path,
+                          spc_dict_path, work_dir)
+
+    # Get ignition delay
+    if done:
+        try:
+            df = pd.read_csv(os.path.join(work_dir, 'solver',
+                                          f'simulation_1_{spc_num}.csv'))
+            df = df.set_index('Time (s)')
+            idt = df[idt_species["label"]].idxmax()
+        except:
+            print(f'Cannot get ignition delay time. Use default time ({tf} seconds).')
+            idt = tf
+    else:
+        idt = tf
+
+    # Generate flux diagram
+    print(f'Generating flux diagram T: {T}, P: {P}, phi: {phi}')
+    flux_dir = os.path.join(outputs['flux_diagram'], folder_name,)
+    os.makedirs(flux_dir, exist_ok=True)
+    input_path = os.path.join(flux_dir, 'input.py')
+    spec.update({'tf': min(idt * 10, tf)})
+    generate_rmg_input_file(spec, save_path=input_path)
+
+    generate_flux_diagram(input_path, chemkin_path,
+                          spc_dict_path, flux_dir)
+
+    # Create sens input
+    work_dir = os.path.join(outputs['sensitivity'], folder_name,)
+    os.makedirs(work_dir, exist_ok=True)
+    input_path = os.path.join(work_dir, 'input.py')
+    spec.update({'sens_spc': SENS_SPECIES,
+                 'tf': idt})
+    generate_rmg_input_file(spec, save_path=input_path)
+
+    labels = []
+    for flux_diagram in find_flux_diagrams(flux_dir):
+        labels += get_spc_label_from_fluxdiagram(flux_diagram)
+    return labels
+
+
 def main():
 
-    model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size = parse_arguments()
+    model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size, adaptive = parse_arguments()
 
     chemkin_path = os.path.join(model_path, 'chem_annotated.inp')
     spc_dict_path = os.path.join(model_path, 'species_dictionary.txt')
 
-    spc_dict = load_species_dictionary(spc_dict_path)
+    # The handle is shared by all of the RMGSimulateInput created later
+    spc_dict = SpeciesDictionaryHandle.get(spc_dict_path).spc_dict
     spc_num = len(spc_dict)
 
     fuel = find_molecule(fuel, spc_dict)
     idt_species = find_molecule(IDT_SPECIES["smiles"], spc_dict)
 
-    for T, P, phi in itertools.product(Ts, Ps, phis):
-
-        print(f'Running simulation T: {T}, P: {P}, phi:{phi}')
-
-        folder_name = f'{T}_{P}_{phi}'
-        spec = {
-            'species_dictionary': spc_dict_path,
-            'fuel': fuel,
-            'temp': T,
-            'pressure': P,
-            'phi': phi,
-            'tf': tf,
-        }
-
-        # Create folder and input file
-        work_dir = os.path.join(outputs['simulate'], folder_name,)
-        os.makedirs(work_dir, exist_ok=True)
-        input_path = os.path.join(work_dir, 'input.py')
-        generate_rmg_input_file(spec, save_path=input_path)
-
-        done = run_simulation(input_path, chemkin_path,
-                              spc_dict_path, work_dir)
-
-        # Get ignition delay
-        if done:
-            try:
-                df = pd.read_csv(os.path.join(work_dir, 'solver',
-                                              f'simulation_1_{spc_num}.csv'))
-                df = df.set_index('Time (s)')
-                idt = df[idt_species["label"]].idxmax()
-            except:
-                print(f'Cannot get ignition delay time. Use default time ({tf} seconds).')
-                idt = tf
-        else:
-            idt = tf
+    def evaluate(conditions):
+        return [run_condition(condition, fuel, tf, outputs, chemkin_path,
+                              spc_dict_path, spc_num, idt_species)
+                for condition in conditions]
 
-        # Generate flux diagram
-        print(f'Generating flux diagram T: {T}, P: {P}, phi: {phi}')
-        work_dir = os.path.join(outputs['flux_diagram'], folder_name,)
-        os.makedirs(work_dir, exist_ok=True)
-        input_path = os.path.join(work_dir, 'input.py')
-        spec.update({'tf': min(idt * 10, tf)})
-        generate_rmg_input_file(spec, save_path=input_path)
-
-        generate_flux_diagram(input_path, chemkin_path,
-                              spc_dict_path, work_dir)
-
-        # Create sens input
-        work_dir = os.path.join(outputs['sensitivity'], folder_name,)
-        os.makedirs(work_dir, exist_ok=True)
-        input_path = os.path.join(work_dir, 'input.py')
-        spec.update({'sens_spc': SENS_SPECIES,
-                     'tf': idt})
-        generate_rmg_input_file(spec, save_path=input_path)
+    conditions = None
+    if adaptive:
+        conditions = list(adaptive_condition_sweep(Ts, Ps, phis, evaluate, **adaptive))
+    else:
+        evaluate(list(itertools.product(Ts, Ps, phis)))
 
     # Sensitivity usually takes longer, use queue software
     run_sensitivity(
-        model_path, outputs['sensitivity'], Ts, Ps, phis, pool_size)
+        model_path, outputs['sensitivity'], Ts, Ps, phis, pool_size, conditions)
 
 
 if __name__ == '__main__':
@@ -10,11 +10,10 @@ import subprocess
 import time
 from multiprocessing import Pool
 
-import pandas as pd
-from rmgpy.molecule.molecule import Molecule
-from rmgpy.chemkin import load_species_dictionary
-
 from easy_rmg_model.common import regularize_path
+from easy_rmg_model.rmg2arc.fluxdiagram import (find_flux_diagrams,
+                                                get_spc_label_from_fluxdiagram)
+from easy_rmg_model.rmg2arc.sweep import adaptive_condition_sweep
 from easy_rmg_model.settings import (IDT_SPECIES,
                                      PHIS_POST_PROCESS,
                                      POOL_SIZE_POST_PROCESS,
@@ -24,7 +23,7 @@ from easy_rmg_model.settings import (IDT_SPECIES,
                                      SIM_TIME_FINAL_POST_PROCESS,
                                      SIM_TIME_OUT_POST_PROCESS,
                                      TS_POST_PROCESS)
-from easy_rmg_model.template_writer.input import RMGSimulateInput
+from easy_rmg_model.template_writer.input import RMGSimulateInput, SpeciesDictionaryHandle
 from easy_rmg_model.template_writer.submit import SLURMSubmitScript
 
 
@@ -49,6 +48,15 @@ def parse_arguments():
                         help='Path to save flux diagram results')
     parser.add_argument('--pool_size', nargs='?', type=int,
                         help='The size of the job pool')
+    parser.add_argument('-a', '--adaptive', action='store_true',
+                        help='Start from a coarse grid and only add conditions where '
+                             'the species in the flux diagrams change')
+    parser.add_argument('--coarse_points', type=int, default=3,
+                        help='The number of T/P/phi values in the initial grid of '
+                             'the adaptive sweep')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='The overlap of species below which neighboring conditions '
+                             'are refined in the adaptive sweep')
 
     args = parser.parse_args()
 
@@ -64,11 +72,15 @@ def parse_arguments():
         outputs[job_type] = regularize_path(job_path[0]) if job_path else \
             os.path.join(os.path.dirname(model_path), job_type)
     pool_size = POOL_SIZE_POST_PROCESS if not args.pool_size else args.pool_size
+    adaptive = {'num_coarse': args.coarse_points,
+                'threshold': args.threshold} if args.adaptive else None
 
-    return model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size
+    return model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size, adaptive
 
 
 def find_molecule(molecule, spc_dict):
+    from rmgpy.molecule.molecule import Molecule
+
     # Find the molecule according to the smiles or the label information
     if molecule in spc_dict:
         return {'label': molecule, 'smiles': spc_dict[molecule].molecule[0].to_smiles()}
@@ -118,12 +130,15 @@ def generate_flux_diagram(input_path, chemkin_path, spc_dict_path, work_dir='.')
         return True
 
 
-def run_sensitivity(model_path, sens_path, Ts, Ps, phis, pool_size):
+def run_sensitivity(model_path, sens_path, Ts, Ps, phis, pool_size, conditions=None):
     cmd = ['python', os.path.join(os.path.dirname(__file__), 'runSens.py')]
     cmd += [model_path, sens_path, ]
     cmd += ['-T'] + [str(T) for T in Ts]
     cmd += ['-P'] + [str(P) for P in Ps]
     cmd += ['-p'] + [str(phi) for phi in phis]
+    if conditions is not None:
+        # Only the conditions evaluated, not all of the combinations of Ts, Ps and phis
+        cmd += ['-c'] + [f'{T}_{P}_{phi}' for T, P, phi in conditions]
     cmd += ['--pool_size', str(pool_size)]
     try:
         output = subprocess.check_output(cmd,
@@ -152,14 +167,15 @@ def generate_rmg_input_file(spec: dict, save_path: str):
 def main():
 
     global model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size
-    model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size = parse_arguments()
+    model_path, fuel, Ts, Ps, phis, tf, outputs, pool_size, adaptive = parse_arguments()
 
     global chemkin_path, spc_dict_path
     chemkin_path = os.path.join(model_path, 'chem_annotated.inp')
     spc_dict_path = os.path.join(model_path, 'species_dictionary.txt')
 
     global spc_dict, spc_num
-    spc_dict = load_species_dictionary(spc_dict_path)
+    # The handle is shared by all of the RMGSimulateInput created later
+    spc_dict = SpeciesDictionaryHandle.get(spc_dict_path).spc_dict
     spc_num = len(spc_dict)
 
     global  idt_species
@@ -168,15 +184,23 @@ def main():
     #trying to run parallel
     #for T, P, phi in itertools.product(Ts, Ps, phis):
     print('Running in parallel with {pool} processors'.format(pool=pool_size))
+    conditions = None
     with Pool(pool_size) as p:
+        if adaptive:
+            conditions = list(adaptive_condition_sweep(Ts, Ps, phis,
+                                                       lambda conds: p.map(running_similation, conds),
+                                                       **adaptive))
+        else:
             p.map(running_similation, itertools.product(Ts, Ps, phis))
     p.close()
     p.join()
     # Sensitivity usually takes longer, use queue software
     run_sensitivity(
-        model_path, outputs['sensitivity'], Ts, Ps, phis, pool_size)
+        model_path, outputs['sensitivity'], Ts, Ps, phis, pool_size, conditions)
 
 def running_similation(TPPhi):
+    import pandas as pd
+
     T, P, phi = TPPhi
     print(f'Running simulation T: {T}, P: {P}, phi:{phi}')
 
@@ -214,14 +238,14 @@ def running_similation(TPPhi):
 
     # Generate flux diagram
     print(f'Generating flux diagram T: {T}, P: {P}, phi: {phi}')
-    work_dir = os.path.join(outputs['flux_diagram'], folder_name,)
-    os.makedirs(work_dir, exist_ok=True)
-    input_path = os.path.join(work_dir, 'input.py')
+    flux_dir = os.path.join(outputs['flux_diagram'], folder_name,)
+    os.makedirs(flux_dir, exist_ok=True)
+    input_path = os.path.join(flux_dir, 'input.py')
     spec.update({'tf': min(idt * 10, tf)})
     generate_rmg_input_file(spec, save_path=input_path)
 
     generate_flux_diagram(input_path, chemkin_path,
-                          spc_dict_path, work_dir)
+                          spc_dict_path, flux_dir)
 
     # Create sens input
     work_dir = os.path.join(outputs['sensitivity'], folder_name,)
@@ -231,6 +255,12 @@ def running_similation(TPPhi):
                  'tf': idt})
     generate_rmg_input_file(spec, save_path=input_path)
 
+    # Species in the flux diagram, used by the adaptive sweep
+    labels = []
+    for flux_diagram in find_flux_diagrams(flux_dir):
+        labels += get_spc_label_from_fluxdiagram(flux_diagram)
+    return labels
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"Get the most important species across conditions from sensitivity analyses and flux diagrams"
+
+import argparse
+import os
+
+from easy_rmg_model.common import read_yaml_file, regularize_path, save_yaml_file
+from easy_rmg_model.rmg2arc.chemkin import get_reaction_indices, get_species_aliases
+from easy_rmg_model.rmg2arc.fluxdiagram import find_flux_diagrams
+from easy_rmg_model.rmg2arc.importance import (AGGREGATIONS,
+                                               CONDITION_PATTERN,
+                                               get_condition_from_path,
+                                               get_importance_scores,
+                                               get_reaction_scores,
+                                               load_sensitivity_matrices,
+                                               select_top_species)
+from easy_rmg_model.rmg2arc.sensitivity import find_sensitivity_results
+from easy_rmg_model.rmg2arc.species_dict import expand_spc_info_by_spc_dict
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('model_path', metavar='MODELPATH', type=str,
+                        help='The folder path to RMG model')
+    parser.add_argument('-S', '--sensitivity_path', type=str,
+                        help='The folder path to sensitivity results')
+    parser.add_argument('-F', '--flux_path', type=str,
+                        help='The folder path to flux diagrams')
+    parser.add_argument('-k', '--top_k', type=int, default=50,
+                        help='The number of species to be selected')
+    parser.add_argument('-a', '--aggregation', type=str, default='max', choices=AGGREGATIONS,
+                        help='The method to aggregate the scores over conditions')
+    parser.add_argument('-w', '--sensitivity_weight', type=float, default=0.5,
+                        help='The weight of the sensitivity in the combined score (0 to 1)')
+    parser.add_argument('-c', '--condition_weights', type=str,
+                        help='A yaml file of the weights of the conditions for the weighted '
+                             'aggregation, keyed by the condition folder names, e.g., 1000.0_10.0_1.0')
+    parser.add_argument('-r', '--top_reactions', type=int, default=0,
+                        help='The number of the most sensitive reactions saved as TS candidates')
+    parser.add_argument('-o', '--output', type=str, help='The dir path to save results')
+
+    args = parser.parse_args()
+
+    model_path = regularize_path(args.model_path)
+    sens_path = regularize_path(args.sensitivity_path) if args.sensitivity_path else None
+    flux_path = regularize_path(args.flux_path) if args.flux_path else None
+    if not sens_path and not flux_path:
+        raise ValueError('At least one of the sensitivity path and the flux path is required.')
+    if not 0 <= args.sensitivity_weight <= 1:
+        raise ValueError(f'Invalid sensitivity weight ({args.sensitivity_weight}).')
+    condition_weights = None
+    if args.condition_weights:
+        condition_weights = {}
+        for name, weight in read_yaml_file(regularize_path(args.condition_weights)).items():
+            name = str(name)
+            condition = get_condition_from_path(name) if CONDITION_PATTERN.match(name) else name
+            condition_weights[condition] = float(weight)
+    elif args.aggregation == 'weighted':
+        raise ValueError('The condition weights are required by the weighted aggregation.')
+    output = regularize_path(args.output) if args.output else os.curdir
+
+    return (model_path, sens_path, flux_path, args.top_k, args.top_reactions, args.aggregation,
+            args.sensitivity_weight, condition_weights, output)
+
+
+def main():
+
+    model_path, sens_path, flux_path, top_k, top_reactions, aggregation, sensitivity_weight, \
+        condition_weights, output = parse_arguments()
+
+    chemkin_path = os.path.join(model_path, 'chem_annotated.inp')
+    spc_dict_path = os.path.join(model_path, 'species_dictionary.txt')
+
+    sensitivities = find_sensitivity_results(sens_path) if sens_path else []
+    # The flux of each time frame differs, so all frames are loaded and combined by the maximum
+    flux_diagrams = find_flux_diagrams(flux_path, avoid_repeats=False) if flux_path else []
+    print(f'Find {len(sensitivities)} sensitivities and {len(flux_diagrams)} flux diagrams.')
+
+    # Sensitivity analyses use Chemkin labels, while flux diagrams use RMG labels.
+    # The species and the reaction sensitivities are loaded in one pass.
+    spc_sensitivity, rxn_sensitivity, equations = None, None, {}
+    if sensitivities:
+        spc_sensitivity, rxn_sensitivity, equations = load_sensitivity_matrices(
+            sensitivities, aliases=get_species_aliases(chemkin_path, key='chemkin'))
+    scores = get_importance_scores(flux_files=flux_diagrams,
+                                   aggregation=aggregation,
+                                   condition_weights=condition_weights,
+                                   sensitivity_weight=sensitivity_weight,
+                                   sensitivity_scores=spc_sensitivity)
+    labels = select_top_species(scores, top_k=top_k)
+    print(f'Selected {len(labels)} out of {len(scores)} species.')
+
+    # The species dictionary uses Chemkin labels, while the scores use RMG labels
+    rmg_aliases = get_species_aliases(chemkin_path, key='rmg')
+    spc_info = expand_spc_info_by_spc_dict({label: {'label': label} for label in labels},
+                                           spc_dict_path,
+                                           {label: rmg_aliases.get(label, label) for label in labels})
+
+    # Generate ARC input, from the most important species
+    arc_input = {'species': [spc_info[label] for label in labels]}
+    os.makedirs(output, exist_ok=True)
+    save_yaml_file(os.path.join(output, 'importance_scores.yml'), scores)
+    actual_output_path = save_yaml_file(os.path.join(output, 'input_scores.yml'),
+                                        arc_input, overwrite=False)
+    print(f'Saved to {actual_output_path}.')
+
+    if top_reactions and rxn_sensitivity:
+        rxn_scores = get_reaction_scores(rxn_sensitivity,
+                                         aggregation=aggregation,
+                                         condition_weights=condition_weights)
+        reactions = get_reaction_indices(chemkin_path)
+        ts_candidates = [{'chemkin_index': index,
+                          'rmg_index': reactions.get(index, {}).get('rmg_index'),
+                          'equation': reactions.get(index, {}).get('equation') or equations.get(index),
+                          'score': score}
+                         for index, score in list(rxn_scores.items())[:top_reactions]]
+        actual_output_path = save_yaml_file(os.path.join(output, 'ts_candidates.yml'),
+                                            ts_candidates, overwrite=False)
+        print(f'Saved {len(ts_candidates)} TS candidates to {actual_output_path}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,8 +7,6 @@ import argparse
 import os
 from typing import Union
 
-from rmgpy.molecule.molecule import Molecule
-
 from easy_rmg_model.common import regularize_path, save_yaml_file
 from easy_rmg_model.rmg2arc.chemkin import get_species_aliases
 from easy_rmg_model.rmg2arc.sensitivity import (find_sensitivity_results,
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+Unit tests for easy_rmg_model.rmg2arc.importance
+"""
+
+import pytest
+
+from easy_rmg_model.rmg2arc.fluxdiagram import find_flux_diagrams
+
+# Two time frames of a flux diagram, with the same species but different pen widths
+FLUX_FRAMES = {'flux_diagram_0001.dot': {('A', 'B'): 1.0, ('B', 'C'): 2.0},
+               'flux_diagram_0002.dot': {('A', 'B'): 6.0, ('B', 'C'): 1.0}}
+
+
+@pytest.fixture
+def flux_path(tmp_path):
+    """
+    A flux diagram folder of one condition with two time frames.
+    """
+    condition_dir = tmp_path / '1000.0_10.0_1.0'
+    condition_dir.mkdir()
+    for name, edges in FLUX_FRAMES.items():
+        lines = ['digraph G {'] + [f'    "{label}";' for label in 'ABC']
+        lines += [f'    "{source}" -> "{target}" [penwidth={width}];'
+                  for (source, target), width in edges.items()]
+        (condition_dir / name).write_text('\n'.join(lines + ['}']) + '\n')
+    return str(tmp_path)
+
+
+def test_find_flux_diagrams_frames(flux_path):
+    assert len(find_flux_diagrams(flux_path)) == 1
+    assert len(find_flux_diagrams(flux_path, avoid_repeats=False)) == 2
+
+
+def test_load_flux_scores_frames(flux_path):
+    pytest.importorskip('numpy')
+    pytest.importorskip('pydot')
+    from easy_rmg_model.rmg2arc.importance import load_flux_scores
+
+    labels, conditions, matrix = load_flux_scores(find_flux_diagrams(flux_path, avoid_repeats=False))
+    # The frames of the same condition are combined by the maximum
+    assert conditions == [(1000.0, 10.0, 1.0)]
+    scores = dict(zip(labels, matrix[0]))
+    assert scores == {'A': 6.0, 'B': 6.0, 'C': 2.0}
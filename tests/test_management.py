@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+Unit tests for easy_rmg_model.arc.management, run against a local stand-in of the server.
+"""
+
+import os
+
+import pytest
+
+from easy_rmg_model.arc.management import (LocalCommandClient,
+                                           batch_remove_remote_calc_files,
+                                           get_remote_calc_paths,
+                                           get_remote_dir_size)
+from easy_rmg_model.common import save_yaml_file
+
+PROJECT = 'test_project'
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    A local ARC project and a fake remote home with the calculation dirs.
+    """
+    local_path, remote_root = tmp_path / 'local', tmp_path / 'remote'
+    local_path.mkdir()
+    output = {'spc_0': {'convergence': True},
+              'spc(1)': {'convergence': True},
+              'spc_2': {'convergence': False},
+              'spc_missing': {'convergence': True}}
+    save_yaml_file(str(local_path / 'restart.yml'),
+                   {'project': PROJECT, 'output': output})
+    for label, size in [('spc_0', 100), ('spc_1_', 200), ('spc_2', 300)]:
+        job_dir = remote_root / 'runs' / 'ARC_Projects' / PROJECT / label / 'opt_a1'
+        job_dir.mkdir(parents=True)
+        (job_dir / 'output.out').write_bytes(b'x' * size)
+        (job_dir.parent / 'submit.sh').write_bytes(b'x' * 10)
+    return str(local_path), str(remote_root)
+
+
+def _get_remote_dir(remote_root, label):
+    return os.path.join(remote_root, 'runs', 'ARC_Projects', PROJECT, label)
+
+
+def _get_disk_usage(path):
+    """
+    The apparent size of a directory as ``du -sb``, including the directories themselves.
+    """
+    size = os.lstat(path).st_size
+    for root, dirs, files in os.walk(path):
+        size += sum(os.lstat(os.path.join(root, name)).st_size for name in dirs + files)
+    return size
+
+
+class CountingClient(LocalCommandClient):
+    """
+    A local client records the commands sent to the server.
+    """
+
+    commands = []
+
+    def _send_command_to_server(self, command, remote_path=''):
+        self.commands.append(command)
+        return super()._send_command_to_server(command, remote_path)
+
+
+def test_get_remote_calc_paths(project):
+    local_path, _ = project
+    paths = get_remote_calc_paths(local_path)
+    assert set(paths) == {'spc_0', 'spc(1)', 'spc_missing'}
+    assert paths['spc(1)'] == os.path.join('runs', 'ARC_Projects', PROJECT, 'spc_1_')
+    assert len(get_remote_calc_paths(local_path, only_converged=False)) == 4
+
+
+def test_get_remote_dir_size(project):
+    _, remote_root = project
+    client = LocalCommandClient(remote_root)
+    path = os.path.join('runs', 'ARC_Projects', PROJECT, 'spc_0')
+    assert get_remote_dir_size(client, path) == _get_disk_usage(_get_remote_dir(remote_root, 'spc_0'))
+    assert get_remote_dir_size(client, 'not_exist') == 0
+
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_batch_remove_remote_calc_files(project, max_workers):
+    local_path, remote_root = project
+    expected = sum(_get_disk_usage(_get_remote_dir(remote_root, label)) for label in ['spc_0', 'spc_1_'])
+    freed = batch_remove_remote_calc_files('local', local_path,
+                                           max_workers=max_workers,
+                                           client_factory=lambda _: LocalCommandClient(remote_root))
+    assert freed == expected
+    assert not os.path.exists(_get_remote_dir(remote_root, 'spc_0'))
+    assert not os.path.exists(_get_remote_dir(remote_root, 'spc_1_'))
+    # Not converged
+    assert os.path.isdir(_get_remote_dir(remote_root, 'spc_2'))
+
+
+def test_batch_remove_remote_calc_files_without_size(project):
+    local_path, remote_root = project
+    freed = batch_remove_remote_calc_files('local', local_path,
+                                           only_converged=False,
+                                           measure_size=False,
+                                           client_factory=lambda _: LocalCommandClient(remote_root))
+    assert freed == 0
+    assert not os.listdir(os.path.join(remote_root, 'runs', 'ARC_Projects', PROJECT))
+
+
+@pytest.mark.parametrize('measure_size', [True, False])
+def test_batch_remove_remote_calc_files_commands(project, measure_size):
+    local_path, remote_root = project
+    CountingClient.commands = []
+    batch_remove_remote_calc_files('local', local_path,
+                                   only_converged=False,
+                                   max_workers=2,
+                                   measure_size=measure_size,
+                                   client_factory=lambda _: CountingClient(remote_root))
+    # One du (if measured) and one rm per session, regardless of the number of dirs
+    commands = sorted(command.split()[0] for command in CountingClient.commands)
+    assert commands == (['du', 'du'] if measure_size else []) + ['rm', 'rm']
+    assert sum(len(command.split()) - 2 for command in CountingClient.commands
+               if command.startswith('rm')) == 4
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+Unit tests for easy_rmg_model.rmg2arc.sweep
+"""
+
+from easy_rmg_model.rmg2arc.sweep import (adaptive_condition_sweep,
+                                          get_coarse_indices,
+                                          is_ranking_changed,
+                                          refine_condition_grid)
+
+
+def test_get_coarse_indices():
+    assert get_coarse_indices(9, 3) == [0, 4, 8]
+    assert get_coarse_indices(10, 4) == [0, 3, 6, 9]
+    assert get_coarse_indices(2, 3) == [0, 1]
+    # Both ends are always included
+    assert get_coarse_indices(5, 1) == [0, 4]
+
+
+def test_is_ranking_changed():
+    assert not is_ranking_changed(['A', 'B', 'C'], ['C', 'B', 'A'])
+    assert is_ranking_changed(['A', 'B', 'C'], ['A', 'D', 'E'])
+    assert not is_ranking_changed(['A', 'B', 'C'], ['A', 'B', 'D'], top_n=2)
+    assert not is_ranking_changed([], [])
+
+
+def test_refine_condition_grid():
+    rankings = {(0, 0): ['A'], (4, 0): ['A'], (8, 0): ['B'],
+                (0, 4): ['B'], (4, 4): ['A'], (8, 4): ['B']}
+    # Midpoints between the changed neighbors along each axis
+    assert refine_condition_grid(rankings, [9, 5]) == {(6, 0), (0, 2), (2, 4), (6, 4)}
+    # Adjacent grid points have nothing in between
+    assert refine_condition_grid({(0,): ['A'], (1,): ['B']}, [2]) == set()
+    # The evaluated grid points are not returned again
+    rankings[(6, 0)] = ['A']
+    assert (6, 0) not in refine_condition_grid(rankings, [9, 5])
+
+
+def test_adaptive_condition_sweep():
+    Ts = [float(T) for T in range(300, 1200, 100)]
+    rounds = []
+
+    def evaluate(conditions):
+        rounds.append(conditions)
+        # The ranking changes between 800 K and 900 K
+        return [['A', 'B'] if T < 850 else ['C', 'D'] for T, _, _ in conditions]
+
+    results = adaptive_condition_sweep(Ts, [1.], [1.], evaluate)
+
+    assert rounds == [[(300., 1., 1.), (700., 1., 1.), (1100., 1., 1.)],
+                      [(900., 1., 1.)],
+                      [(800., 1., 1.)]]
+    # Nothing is evaluated twice
+    evaluated = [condition for conditions in rounds for condition in conditions]
+    assert len(evaluated) == len(set(evaluated))
+    assert set(results) == set(evaluated)
+    assert results[(800., 1., 1.)] == ['A', 'B']
+    assert results[(900., 1., 1.)] == ['C', 'D']
+
+
+def test_adaptive_condition_sweep_max_rounds():
+    rounds = []
+
+    def evaluate(conditions):
+        rounds.append(conditions)
+        return [[str(T)] for T, _, _ in conditions]
+
+    results = adaptive_condition_sweep(list(range(17)), [1.], [1.], evaluate, max_rounds=1)
+    assert len(rounds) == 2
+    assert len(results) == sum(len(conditions) for conditions in rounds)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+Unit tests for easy_rmg_model.job.trsh, on the fake Gaussian logs of the fixtures and
+on real Gaussian outputs in tests/data/gaussian.
+"""
+
+import gzip
+import os
+
+import pytest
+
+from easy_rmg_model.job.trsh import (_parse_status_by_arc,
+                                     classify_job_output,
+                                     classify_job_outputs,
+                                     parse_gaussian_status)
+from easy_rmg_model.testing.fixtures import generate_species, get_gaussian_log
+
+SPC = generate_species(3)[2]
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gaussian')
+
+# The real Gaussian outputs: job type, the number of imaginary frequencies and
+# the number of (Link1) steps
+GAUSSIAN_SAMPLES = {'methane.log.gz': ('optfreq', 0, 2),  # opt+freq, Gaussian 16
+                    'ethane_spc.log.gz': ('composite', 0, 3),  # opt+freq and a single point by Link1
+                    'HCN_triplet.log.gz': ('freq', 1, 2),  # one imaginary frequency as a TS
+                    'Al_298K.log.gz': ('optfreq', None, 2)}  # single atom without frequencies
+
+
+def _get_lines(**kwargs):
+    return get_gaussian_log(SPC, num_filler_lines=10, **kwargs).splitlines(keepends=True)
+
+
+@pytest.mark.parametrize('num_links', [1, 3])
+def test_parse_gaussian_status_done(num_links):
+    result = parse_gaussian_status(_get_lines(job_type='freq', num_links=num_links))
+    assert result['status'] == 'done'
+    assert result['keywords'] == [] and result['error'] == ''
+    assert result['n_imag_freqs'] == 0
+
+
+@pytest.mark.parametrize('num_links', [1, 2, 3])
+def test_parse_gaussian_status_unfinished(num_links):
+    # The previous steps terminate normally, but the last one is still running
+    result = parse_gaussian_status(_get_lines(status='unfinished', num_links=num_links))
+    assert result['status'] == 'unfinished'
+
+
+@pytest.mark.parametrize('error, keywords', [('scf', ['SCF', 'GL502']),
+                                             ('opt', ['MaxOptCycles', 'Unconverged', 'GL9999']),
+                                             ('input', ['InputError', 'GL101'])])
+@pytest.mark.parametrize('num_links', [1, 2])
+def test_parse_gaussian_status_errored(error, keywords, num_links):
+    result = parse_gaussian_status(_get_lines(status='errored', error=error, num_links=num_links))
+    assert result['status'] == 'errored'
+    assert result['keywords'] == keywords
+    assert 'Error termination' in result['error']
+
+
+def test_classify_job_output(tmp_path):
+    jobs = []
+    for status, num_links in [('done', 2), ('unfinished', 2), ('errored', 1)]:
+        path = tmp_path / f'{status}_{num_links}.out.gz'
+        with gzip.open(path, 'wt') as f:
+            f.write(get_gaussian_log(SPC, 'freq', status, num_filler_lines=10, num_links=num_links))
+        jobs.append((str(path)[:-len('.gz')], 'freq'))
+    results = classify_job_outputs(jobs, max_workers=2)
+    assert [result['status'] for result in results] == ['done', 'unfinished', 'errored']
+    assert [result['converged'] for result in results] == [True, False, False]
+    assert all(result['software'] == 'gaussian' for result in results)
+    assert results[1]['error'] == 'The job is unfinished.'
+
+
+def test_classify_job_output_unreadable(tmp_path):
+    path = tmp_path / 'output.out'
+    path.write_text('Not an ESS output\n')
+    result = classify_job_output(str(path), 'opt')
+    assert result['status'] == 'unreadable'
+    assert not result['converged']
+
+
+def _read_sample(name):
+    with gzip.open(os.path.join(DATA_DIR, name), 'rt') as f:
+        return f.readlines()
+
+
+@pytest.mark.parametrize('name', list(GAUSSIAN_SAMPLES))
+def test_parse_gaussian_status_samples(name):
+    _, n_imag_freqs, num_links = GAUSSIAN_SAMPLES[name]
+    lines = _read_sample(name)
+    result = parse_gaussian_status(lines)
+    assert result['status'] == 'done'
+    assert result['keywords'] == [] and result['error'] == ''
+    assert result['n_imag_freqs'] == n_imag_freqs
+
+    # Cut shortly after each step but the last one terminates
+    ends = [i for i, line in enumerate(lines) if 'Normal termination' in line]
+    assert len(ends) == num_links
+    for end in ends[:-1]:
+        assert parse_gaussian_status(lines[:end + 20])['status'] == 'unfinished'
+
+
+@pytest.mark.parametrize('name', list(GAUSSIAN_SAMPLES))
+def test_classify_job_output_samples(name):
+    job_type, n_imag_freqs, _ = GAUSSIAN_SAMPLES[name]
+    result = classify_job_output(os.path.join(DATA_DIR, name[:-len('.gz')]), job_type,
+                                 ts=n_imag_freqs == 1)
+    assert result['software'] == 'gaussian'
+    assert result['status'] == 'done' and result['converged']
+    assert result['n_imag_freqs'] == n_imag_freqs
+
+
+@pytest.mark.parametrize('name', list(GAUSSIAN_SAMPLES))
+def test_parse_gaussian_status_as_arc(name):
+    pytest.importorskip('arc')
+    job_type, _, _ = GAUSSIAN_SAMPLES[name]
+    native = parse_gaussian_status(_read_sample(name))
+    by_arc = _parse_status_by_arc(os.path.join(DATA_DIR, name), job_type, 'gaussian')
+    assert native['status'] == by_arc['status']
+    assert native['keywords'] == by_arc['keywords']
+    assert native['n_imag_freqs'] == by_arc['n_imag_freqs']